@@ -0,0 +1,141 @@
+"""
+actuator.py
+Asynchronous, coalescing action executor.
+A single worker thread applies system actions (volume changes, arbitrary calls) in
+submission order, off the UI thread. Volume deltas submitted while an earlier one is
+still queued are merged into that pending entry, so a burst of gestures or voice
+commands becomes one final adjustment. Every submission returns a Future.
+The worker attaches itself to the volume controller (its own COM apartment and endpoint on Windows).
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+logger = logging.getLogger("aura.actuator")
+
+
+class _VolumeEntry:
+    __slots__ = ("delta", "futures")
+
+    def __init__(self, delta: float, future: Future):
+        self.delta = delta
+        self.futures = [future]
+
+
+class _CallEntry:
+    __slots__ = ("fn", "args", "kwargs", "future")
+
+    def __init__(self, fn, args, kwargs, future: Future):
+        self.fn, self.args, self.kwargs, self.future = fn, args, kwargs, future
+
+
+class Actuator:
+    """
+    Serializes actions on one worker thread.
+    volume(delta) -> Future[bool]; submit(fn, *args, **kwargs) -> Future.
+    """
+
+    def __init__(self, vol_ctrl=None):
+        self.vol_ctrl = vol_ctrl
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._pending_volume = None  # queued, not yet started volume entry
+        self._running = False
+        self._thread = None
+        self.applied = 0
+        self.coalesced = 0
+
+    def start(self) -> "Actuator":
+        if not self._running:
+            self._running = True
+            self._thread = threading.Thread(target=self._loop, name="actuator", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Finish queued work, then stop the worker."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def volume(self, delta: float) -> Future:
+        """Queue a volume change, merging it into a still-pending one if there is any."""
+        fut = Future()
+        with self._cond:
+            if self._pending_volume is not None:
+                self._pending_volume.delta += delta
+                self._pending_volume.futures.append(fut)
+                self.coalesced += 1
+            else:
+                self._pending_volume = _VolumeEntry(delta, fut)
+                self._queue.append(self._pending_volume)
+                self._cond.notify()
+        return fut
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Queue an arbitrary call to run on the actuator thread."""
+        fut = Future()
+        with self._cond:
+            self._queue.append(_CallEntry(fn, args, kwargs, fut))
+            self._cond.notify()
+        return fut
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def _loop(self) -> None:
+        attach = getattr(self.vol_ctrl, "attach_thread", None)
+        if attach is not None:
+            attach()
+        try:
+            self._serve()
+        finally:
+            if attach is not None:
+                self.vol_ctrl.detach_thread()
+
+    def _serve(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                entry = self._queue.popleft()
+                if entry is self._pending_volume:
+                    self._pending_volume = None
+            if isinstance(entry, _VolumeEntry):
+                self._apply_volume(entry)
+            else:
+                self._apply_call(entry)
+
+    def _apply_volume(self, entry: _VolumeEntry) -> None:
+        ok = True
+        # a burst that cancels out (up then down) needs no system call at all
+        if abs(entry.delta) > 1e-6:
+            try:
+                ok = bool(self.vol_ctrl.change(entry.delta)) if self.vol_ctrl is not None else False
+            except Exception as e:
+                logger.exception("volume action error: %s", e)
+                ok = False
+            self.applied += 1
+        for fut in entry.futures:
+            if not fut.cancelled():
+                fut.set_result(ok)
+
+    def _apply_call(self, entry: _CallEntry) -> None:
+        if not entry.future.set_running_or_notify_cancel():
+            return
+        try:
+            entry.future.set_result(entry.fn(*entry.args, **entry.kwargs))
+        except Exception as e:
+            logger.exception("actuator call error: %s", e)
+            entry.future.set_exception(e)
+        self.applied += 1
+
+    def stats(self) -> dict:
+        return {"pending": len(self._queue), "applied": self.applied, "coalesced": self.coalesced}
@@ -0,0 +1,148 @@
+"""
+bench_detector.py
+Offline benchmark for GestureDetector.process.
+Replays a video file or image directory headlessly through the detector and reports
+per-frame latency percentiles, throughput, peak RSS and the detected action sequence.
+
+Usage:
+    python -m benchmarks.bench_detector clip.mp4 --json results/clip.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+import cv2
+import numpy as np
+
+from capture import open_source
+from gestures.detector import GestureDetector
+from gestures.scheduler import InferenceScheduler
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB (0.0 if unavailable)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, KiB elsewhere
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil  # type: ignore
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except Exception:
+        return 0.0
+
+
+def summarize_latencies(latencies_ms) -> dict:
+    if not latencies_ms:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    arr = np.asarray(latencies_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99),
+            "mean": float(arr.mean()), "max": float(arr.max())}
+
+
+def run(source_spec: str, max_frames: int = 0, warmup: int = 5, mirror: bool = False,
+        max_hands: int = 1, roi_tracking: bool = False, search_scale: float = 1.0,
+        budget_ms: float = 0.0) -> dict:
+    """Replay source_spec through a fresh GestureDetector and return the result dict."""
+    detector = GestureDetector(max_num_hands=max_hands, roi_tracking=roi_tracking, search_scale=search_scale)
+    pipeline = InferenceScheduler(detector, budget_ms=budget_ms) if budget_ms > 0 else detector
+    latencies = []
+    actions = []
+    frames = 0
+
+    with open_source(source_spec) as src:
+        fps_nominal = src.fps
+        t_start = None
+        for img in src:
+            if mirror:
+                img = cv2.flip(img, 1)
+            t0 = time.perf_counter()
+            _, action, _ = pipeline.process(img)
+            dt = time.perf_counter() - t0
+            frames += 1
+            if frames == warmup + 1:
+                t_start = t0
+            if frames > warmup:
+                latencies.append(dt * 1000.0)
+            if action:
+                actions.append({"frame": frames - 1, "action": action})
+            if max_frames and frames >= max_frames:
+                break
+        t_end = time.perf_counter()
+
+    measured = len(latencies)
+    wall = (t_end - t_start) if t_start is not None else 0.0
+    return {
+        "source": source_spec,
+        "source_fps": fps_nominal,
+        "frames": frames,
+        "measured_frames": measured,
+        "warmup_frames": min(warmup, frames),
+        "detector_enabled": detector.enabled,
+        "max_hands": max_hands,
+        "roi_tracking": roi_tracking,
+        "search_scale": search_scale,
+        "roi": detector.roi_stats(),
+        "budget_ms": budget_ms,
+        "scheduler": pipeline.stats() if pipeline is not detector else None,
+        "latency_ms": summarize_latencies(latencies),
+        "throughput_fps": (measured / wall) if wall > 0 else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "actions": actions,
+        "env": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Replay a clip through GestureDetector.process")
+    p.add_argument("source", help="video file or image directory")
+    p.add_argument("--max-frames", type=int, default=0, help="stop after N frames (0 = whole clip)")
+    p.add_argument("--warmup", type=int, default=5, help="frames excluded from timing")
+    p.add_argument("--mirror", action="store_true", help="mirror frames like the live pipeline does")
+    p.add_argument("--max-hands", type=int, default=1, help="GestureDetector max_num_hands")
+    p.add_argument("--roi-tracking", action="store_true", help="enable crop-around-last-hand inference")
+    p.add_argument("--search-scale", type=float, default=1.0, help="downscale for full-frame hand search")
+    p.add_argument("--budget-ms", type=float, default=0.0, help="run through the adaptive scheduler")
+    p.add_argument("--json", dest="json_path", default=None, help="write results to this JSON file")
+    args = p.parse_args(argv)
+
+    result = run(args.source, max_frames=args.max_frames, warmup=args.warmup, mirror=args.mirror,
+                 max_hands=args.max_hands, roi_tracking=args.roi_tracking, search_scale=args.search_scale,
+                 budget_ms=args.budget_ms)
+
+    lat = result["latency_ms"]
+    print(f"[BENCH] {result['source']}: {result['frames']} frames, detector_enabled={result['detector_enabled']}")
+    print(f"[BENCH] latency ms p50={lat['p50']:.2f} p95={lat['p95']:.2f} p99={lat['p99']:.2f} "
+          f"max={lat['max']:.2f}")
+    print(f"[BENCH] throughput {result['throughput_fps']:.1f} FPS | peak RSS {result['peak_rss_mb']:.1f} MiB")
+    if result["roi_tracking"]:
+        roi = result["roi"]
+        print(f"[BENCH] ROI hit rate {roi['hit_rate']:.1%} | pixels inferred {roi['pixel_fraction']:.1%}")
+    print(f"[BENCH] actions: {[a['action'] for a in result['actions']]}")
+
+    if args.json_path:
+        folder = os.path.dirname(args.json_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"[BENCH] wrote {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+bench_gestures.py
+Per-frame cost of the gesture engine as the gesture table grows.
+Builds tables of increasing size (the default rows plus synthetic static and dynamic
+rows that rarely match), drives GestureClassifier with a synthetic stream of moving,
+posing hands, and reports microseconds per frame. Next to it, the same dynamic rows
+are checked one by one in Python (the if/elif style) on the same features, which
+grows linearly with the table; the engine should stay flat.
+
+Usage:
+    python -m benchmarks.bench_gestures --frames 5000 --hands 2 --sizes 10,40,160,240 --json results/gestures.json
+"""
+
+import json
+import time
+import random
+import argparse
+
+import numpy as np
+
+from gestures.engine import BITS, DEFAULT_TABLE, FEATURES, GestureClassifier
+
+
+def make_table(size: int, seed: int = 0) -> list:
+    """DEFAULT_TABLE padded to `size` rows with synthetic rows (half static, half dynamic)."""
+    rng = random.Random(seed)
+    rows = list(DEFAULT_TABLE)
+    bits = list(BITS)
+    i = 0
+    while len(rows) < size:
+        if i % 2:
+            req = rng.sample(bits, 3)
+            rows.append({"name": f"pose_{i}", "kind": "static", "require": req,
+                         "forbid": rng.sample([b for b in bits if b not in req], 2)})
+        else:
+            feat = rng.choice(("dx", "dy", "dist", "hold_s"))
+            lo = rng.uniform(5.0, 50.0)
+            rows.append({"name": f"motion_{i}", "kind": "dynamic",
+                         "when": {feat: [lo, lo + rng.uniform(0.5, 5.0)], "span_s": [0.1, None]}})
+        i += 1
+    return rows
+
+
+def make_stream(frames: int, hands: int, seed: int = 0):
+    """(frames, hands, 21, 2) int32 landmarks: hands drifting, swiping and changing pose."""
+    rng = np.random.default_rng(seed)
+    base = rng.integers(150, 350, size=(hands, 21, 2)).astype(np.float32)
+    base[:, 0, 1] = 420  # wrist below the fingers
+    t = np.arange(frames, dtype=np.float32)[:, None, None, None]
+    sway = np.concatenate([80 * np.sin(t / 20.0), 30 * np.cos(t / 33.0)], axis=-1)
+    jitter = rng.normal(0, 6, size=(frames, hands, 21, 2))
+    return (base[None] + sway + jitter + 40 * np.arange(hands)[None, :, None, None]).astype(np.int32)
+
+
+def _python_rules(clf: GestureClassifier, rows, stream, fps: float = 30.0) -> float:
+    """Seconds per frame for evaluating each dynamic row in a Python loop over the engine's features."""
+    dynamic = [r for r in rows if r.get("kind") == "dynamic"]
+    col = {name: i for i, name in enumerate(FEATURES)}
+    hist = clf.history
+    t0 = time.perf_counter()
+    now = 0.0
+    for pts in stream:
+        ids = clf.tracker.update(pts)
+        slots = hist.slots_for(ids, clf.tracker.active_ids)
+        hist.push(slots, pts, np.zeros(len(pts), dtype=np.int64), now)
+        feats = hist.features(slots, now).tolist()
+        for f in feats:
+            # every row is tested, as the engine does, so both pay for the whole table
+            matched = []
+            for r in dynamic:
+                ok = True
+                for feat, (lo, hi) in r["when"].items():
+                    v = f[col[feat]]
+                    if (lo is not None and v < lo) or (hi is not None and v > hi):
+                        ok = False
+                        break
+                matched.append(ok)
+        now += 1.0 / fps
+    return (time.perf_counter() - t0) / len(stream)
+
+
+def run(frames: int = 5000, hands: int = 2, sizes=(10, 40, 160, 240), fps: float = 30.0) -> dict:
+    stream = make_stream(frames, hands)
+    steps = []
+    for size in sizes:
+        rows = make_table(size)
+        clf = GestureClassifier(table=rows)
+        events = 0
+        t0 = time.perf_counter()
+        now = 0.0
+        for pts in stream:
+            events += len(clf.update(pts, now)[2])
+            now += 1.0 / fps
+        engine_s = (time.perf_counter() - t0) / frames
+        loop_s = _python_rules(GestureClassifier(table=rows), rows, stream, fps)
+        steps.append({"rows": len(rows), "engine_us_per_frame": engine_s * 1e6,
+                      "python_rules_us_per_frame": loop_s * 1e6, "events": events})
+    base = steps[0]
+    for s in steps:
+        s["engine_growth"] = s["engine_us_per_frame"] / base["engine_us_per_frame"]
+        s["python_rules_growth"] = s["python_rules_us_per_frame"] / base["python_rules_us_per_frame"]
+    return {"frames": frames, "hands": hands, "steps": steps}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark gesture-engine cost against table size")
+    p.add_argument("--frames", type=int, default=5000)
+    p.add_argument("--hands", type=int, default=2)
+    p.add_argument("--sizes", default="10,40,160,240", help="comma-separated table sizes (rows)")
+    p.add_argument("--json", dest="json_path", default=None)
+    args = p.parse_args(argv)
+
+    res = run(args.frames, args.hands, [int(x) for x in args.sizes.split(",") if x])
+    for s in res["steps"]:
+        print(f"[BENCH] {s['rows']:4d} rows: engine {s['engine_us_per_frame']:7.1f} us/frame "
+              f"(x{s['engine_growth']:.2f}) "
+              f"| python rules {s['python_rules_us_per_frame']:8.1f} us/frame (x{s['python_rules_growth']:.2f}), "
+              f"{s['events']} events")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(res, f, indent=2)
+        print(f"[BENCH] wrote {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+bench_intents.py
+Micro-benchmark for voice-intent routing.
+Routes a large synthetic corpus of utterances through IntentRouter and reports
+routes/second, both for AURA's default intents and with extra synthetic intents
+registered, next to a linear substring-chain baseline (the old if/elif style).
+
+Usage:
+    python -m benchmarks.bench_intents --utterances 100000 --extra-intents 200 --json results/intents.json
+"""
+
+import json
+import time
+import random
+import argparse
+
+from intents import Intent, default_router
+
+_TEMPLATES = [
+    "open {app}", "take a screenshot", "what time is it", "system status please", "give me a quote",
+    "volume up", "volume down", "remind me in {n} minutes to {task}", "remind me in {n} seconds to {task}",
+    "list reminders", "cancel reminders", "tell me something about {task}", "hello aura how are you",
+]
+_APPS = ["youtube", "spotify", "vscode", "notepad", "calculator", "chrome", "the weather"]
+_TASKS = ["drink water", "stretch", "call mom", "check the oven", "push the branch", "take a break"]
+
+
+def make_corpus(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [rng.choice(_TEMPLATES).format(app=rng.choice(_APPS), n=rng.randint(1, 90), task=rng.choice(_TASKS))
+            for _ in range(n)]
+
+
+def add_synthetic_intents(router, n: int, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    for i in range(n):
+        word = "".join(rng.choice("bcdfghjklmnpqrstvwxz") for _ in range(6))
+        router.register(Intent(f"synthetic_{i}", (f"{word} {i}",), lambda m, s: None))
+
+
+def linear_baseline(router):
+    """Old style: check every keyword of every intent in order with substring `in`."""
+    table = [(intent.name, intent.keywords) for intent in router.intents]
+
+    def route(text):
+        txt = text.lower().strip()
+        for name, keywords in table:
+            for kw in keywords:
+                if kw in txt:
+                    return name
+        return "fallback"
+    return route
+
+
+def time_routes(fn, corpus) -> float:
+    t0 = time.perf_counter()
+    for text in corpus:
+        fn(text)
+    return len(corpus) / (time.perf_counter() - t0)
+
+
+def run(utterances: int = 100000, extra_intents: int = 200) -> dict:
+    corpus = make_corpus(utterances)
+    results = {"utterances": utterances}
+    for label, extra in (("default", 0), ("extended", extra_intents)):
+        router = default_router()
+        add_synthetic_intents(router, extra)
+        router.compile()
+        results[label] = {
+            "intents": len(router.intents),
+            "router_routes_per_s": time_routes(router.route, corpus),
+            "linear_routes_per_s": time_routes(linear_baseline(router), corpus),
+        }
+    d, e = results["default"], results["extended"]
+    results["router_slowdown"] = d["router_routes_per_s"] / e["router_routes_per_s"]
+    results["linear_slowdown"] = d["linear_routes_per_s"] / e["linear_routes_per_s"]
+    return results
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark voice-intent routing throughput")
+    p.add_argument("--utterances", type=int, default=100000)
+    p.add_argument("--extra-intents", type=int, default=200)
+    p.add_argument("--json", dest="json_path", default=None)
+    args = p.parse_args(argv)
+
+    res = run(args.utterances, args.extra_intents)
+    for label in ("default", "extended"):
+        r = res[label]
+        print(f"[BENCH] {label:<8} {r['intents']:4d} intents: router {r['router_routes_per_s']:10.0f}/s "
+              f"| linear {r['linear_routes_per_s']:10.0f}/s")
+    print(f"[BENCH] slowdown with extra intents: router x{res['router_slowdown']:.2f}, "
+          f"linear x{res['linear_slowdown']:.2f}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(res, f, indent=2)
+        print(f"[BENCH] wrote {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
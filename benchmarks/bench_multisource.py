@@ -0,0 +1,85 @@
+"""
+bench_multisource.py
+Scaling report for multi-source detection.
+Replays the same video file or image directory as 1..N independent sources (each with
+its own detector) through MultiSourceRunner, unpaced, for a fixed duration per step,
+in thread and/or process mode. Reports aggregate and per-source throughput and the
+scaling efficiency against the single-source run, next to the host's core count.
+
+Usage:
+    python -m benchmarks.bench_multisource clip.mp4 --max-sources 4 --modes thread,process --json results/multi.json
+"""
+
+import os
+import json
+import time
+import argparse
+import platform
+
+from multisource import MODES, MultiSourceRunner
+
+
+def run_step(source_spec: str, n: int, mode: str, duration: float, workers=None, max_hands: int = 1) -> dict:
+    runner = MultiSourceRunner([source_spec] * n, {"max_num_hands": max_hands}, mode=mode, workers=workers,
+                               pace=False, loop=True, label_hands=False)
+    if runner.start() != n:
+        runner.stop()
+        raise RuntimeError(f"only {len(runner.stations)} of {n} sources started")
+    # skip model warm-up, then measure a clean window
+    time.sleep(min(1.0, duration / 4))
+    before = {s.name: s.processed for s in runner.stations}
+    t0 = time.perf_counter()
+    time.sleep(duration)
+    elapsed = time.perf_counter() - t0
+    per_source = [(s.processed - before[s.name]) / elapsed for s in runner.stations]
+    busy = [s.stats()["busy_ms_per_frame"] for s in runner.stations]
+    events = sum(s.events for s in runner.stations)
+    enabled = all(getattr(s.pipeline, "enabled", False) for s in runner.stations)
+    runner.stop()
+    return {"sources": n, "mode": mode, "workers": workers or n, "total_fps": sum(per_source),
+            "per_source_fps": per_source, "busy_ms_per_frame": sum(busy) / len(busy), "events": events,
+            "detection_enabled": enabled}
+
+
+def run(source_spec: str, max_sources: int = 4, modes=("thread",), duration: float = 5.0, workers=None,
+        max_hands: int = 1) -> dict:
+    steps = []
+    for mode in modes:
+        base = None
+        for n in range(1, max_sources + 1):
+            step = run_step(source_spec, n, mode, duration, workers, max_hands)
+            base = base or step["total_fps"]
+            step["speedup"] = step["total_fps"] / base if base else 0.0
+            step["efficiency"] = step["speedup"] / n
+            steps.append(step)
+            print(f"[BENCH] {mode:<7} sources={n} workers={step['workers']}: {step['total_fps']:7.1f} fps total, "
+                  f"{step['total_fps'] / n:6.1f}/source, speedup x{step['speedup']:.2f} "
+                  f"({step['efficiency']:.0%} efficiency), {step['busy_ms_per_frame']:.1f} ms/frame")
+    return {"source": source_spec, "steps": steps,
+            "env": {"cpu_count": os.cpu_count(), "platform": platform.platform(), "python": platform.python_version()}}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark how detection throughput scales with sources and cores")
+    p.add_argument("source", help="video file or image directory replayed as every source")
+    p.add_argument("--max-sources", type=int, default=4)
+    p.add_argument("--modes", default="thread", help=f"comma-separated subset of {','.join(MODES)}")
+    p.add_argument("--duration", type=float, default=5.0, help="measured seconds per step")
+    p.add_argument("--workers", type=int, default=None, help="thread-mode pool size (default: one per source)")
+    p.add_argument("--max-hands", type=int, default=1)
+    p.add_argument("--json", dest="json_path", default=None)
+    args = p.parse_args(argv)
+
+    print(f"[BENCH] {os.cpu_count()} logical cores")
+    res = run(args.source, args.max_sources, [m for m in args.modes.split(",") if m], args.duration,
+              args.workers, args.max_hands)
+    if not all(s["detection_enabled"] for s in res["steps"]):
+        print("[BENCH] warning: MediaPipe unavailable, numbers cover capture and scheduling only")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(res, f, indent=2)
+        print(f"[BENCH] wrote {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
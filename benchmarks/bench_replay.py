@@ -0,0 +1,90 @@
+"""
+bench_replay.py
+Regression and throughput check for the gesture classifier on recorded landmarks.
+Replays every recording (main.py --record-landmarks) through GestureClassifier with
+the recorded timestamps, without MediaPipe or a camera, and compares the replayed
+gestures, hand IDs and fired actions with the recorded ones. Also times the
+stateless rules alone (one vectorized call per recording). With --check the exit
+status is non-zero on any mismatch, so it can run in CI after a rule change.
+
+Usage:
+    python -m benchmarks.bench_replay recordings/ --repeat 10 --check --json results/replay.json
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+
+from gestures.recording import Recording, classify_all, replay
+
+
+def find_recordings(paths):
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files.extend(sorted(glob.glob(os.path.join(p, "**", "*.lmk"), recursive=True)))
+        else:
+            files.extend(sorted(glob.glob(p)))
+    return files
+
+
+def run(files, repeat: int = 1) -> dict:
+    recs = [Recording(f) for f in files]
+    frames = sum(len(r) for r in recs) * repeat
+    hands = sum(r.header["hands"] for r in recs) * repeat
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for r in recs:
+            classify_all(r)
+    rules_s = time.perf_counter() - t0
+
+    mismatches = {}
+    t0 = time.perf_counter()
+    for i in range(repeat):
+        for f, r in zip(files, recs):
+            res = replay(r)
+            if i == 0:
+                diff = res.mismatches(r)
+                if any(diff.values()):
+                    mismatches[f] = diff
+    replay_s = time.perf_counter() - t0
+    return {"recordings": len(recs), "repeat": repeat, "frames": frames, "hands": hands,
+            "rules_hands_per_s": hands / rules_s if rules_s > 0 else 0.0,
+            "replay_frames_per_s": frames / replay_s if replay_s > 0 else 0.0,
+            "sessions_per_s": len(recs) * repeat / replay_s if replay_s > 0 else 0.0,
+            "mismatches": mismatches}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Replay landmark recordings through the gesture classifier")
+    p.add_argument("paths", nargs="+", help="recording files, globs or directories (*.lmk)")
+    p.add_argument("--repeat", type=int, default=1, help="replay every recording this many times")
+    p.add_argument("--check", action="store_true", help="exit non-zero if any replay differs from the recording")
+    p.add_argument("--json", dest="json_path", default=None)
+    args = p.parse_args(argv)
+
+    files = find_recordings(args.paths)
+    if not files:
+        print("[BENCH] no recordings found")
+        return 1
+    res = run(files, args.repeat)
+    print(f"[BENCH] {res['recordings']} recording(s) x{res['repeat']}: {res['frames']} frames, {res['hands']} hands")
+    print(f"[BENCH] rules only: {res['rules_hands_per_s']:12.0f} hands/s")
+    print(f"[BENCH] full replay: {res['replay_frames_per_s']:11.0f} frames/s ({res['sessions_per_s']:.1f} sessions/s)")
+    for f, diff in res["mismatches"].items():
+        print(f"[BENCH] MISMATCH {f}: {diff}")
+    if not res["mismatches"]:
+        print("[BENCH] replay matches every recording")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(res, f, indent=2)
+        print(f"[BENCH] wrote {args.json_path}")
+    return 1 if args.check and res["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
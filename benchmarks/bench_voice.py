@@ -0,0 +1,133 @@
+"""
+bench_voice.py
+Voice segmentation and time-to-command benchmark, no microphone needed.
+Segments a WAV file (or a synthetic one with speech-like bursts over background noise
+at known positions) with VadSegmenter and reports segment boundaries, endpointing delay
+(end of speech -> segment closed) and segmentation speed. With --recognizer the file is
+replayed in real time through VoiceListener to measure end-of-speech -> text latency.
+
+Usage:
+    python -m benchmarks.bench_voice
+    python -m benchmarks.bench_voice --wav command.wav --recognizer vosk --vosk-model models/vosk --json results/voice.json
+"""
+
+import os
+import json
+import time
+import wave
+import argparse
+import tempfile
+
+import numpy as np
+
+from voice import SAMPLE_RATE, FRAME_MS, VadSegmenter, VoiceListener, WavSource, make_recognizer
+
+# (start, end) seconds of the synthetic bursts
+_SYNTH_SPEECH = [(1.0, 1.8), (2.6, 3.1), (4.0, 5.6), (6.2, 6.25)]
+
+
+def synth_wav(path: str, duration: float = 7.5, noise_db: float = -50.0, speech_db: float = -20.0, seed: int = 0):
+    """Write a 16 kHz mono WAV: white noise plus syllable-modulated harmonic bursts. Returns the burst times."""
+    rng = np.random.default_rng(seed)
+    n = int(duration * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    x = rng.normal(0.0, 10 ** (noise_db / 20.0), n)
+    for start, end in _SYNTH_SPEECH:
+        m = (t >= start) & (t < end)
+        tt = t[m] - start
+        voice = sum(np.sin(2 * np.pi * f * tt) / k for k, f in enumerate((140, 280, 420, 700), 1))
+        envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4.0 * tt)  # ~4 syllables per second
+        x[m] += 10 ** (speech_db / 20.0) * voice * envelope / 1.5
+    pcm = (np.clip(x, -1.0, 1.0) * 32767).astype(np.int16)
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(pcm.tobytes())
+    return list(_SYNTH_SPEECH)
+
+
+def run_segmentation(path: str, **segmenter_kwargs) -> dict:
+    src = WavSource(path, FRAME_MS)
+    seg = VadSegmenter(src.sample_rate, FRAME_MS, **segmenter_kwargs)
+    utts = []
+    n_frames = 0
+    t0 = time.perf_counter()
+    for frame in src.frames():
+        n_frames += 1
+        utt = seg.feed(frame)
+        if utt is not None:
+            utts.append(utt)
+    tail = seg.flush()
+    if tail is not None:
+        utts.append(tail)
+    elapsed = time.perf_counter() - t0
+    audio_s = n_frames * FRAME_MS / 1000.0
+    return {
+        "audio_s": audio_s,
+        "segments": [(round(u.start, 3), round(u.end, 3)) for u in utts],
+        "endpoint_ms": [round((u.closed - u.end) * 1000.0, 1) for u in utts],
+        "dropped_short": seg.dropped,
+        "noise_floor_db": seg.floor,
+        "realtime_factor": audio_s / elapsed if elapsed > 0 else None,
+        "us_per_frame": elapsed / max(1, n_frames) * 1e6,
+    }
+
+
+def run_time_to_command(path: str, recognizer_name: str, **recognizer_kwargs) -> dict:
+    recognizer = make_recognizer(recognizer_name, **recognizer_kwargs)
+    texts = []
+    listener = VoiceListener(WavSource(path, FRAME_MS, realtime=True), recognizer, texts.append)
+    listener.start()
+    for t in listener._threads:
+        t.join()
+    stats = listener.stats()
+    stats["texts"] = texts
+    return stats
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark VAD segmentation and voice time-to-command")
+    p.add_argument("--wav", default=None, help="16-bit PCM WAV to segment (default: synthetic)")
+    p.add_argument("--hangover-ms", type=int, default=300)
+    p.add_argument("--start-db", type=float, default=10.0)
+    p.add_argument("--recognizer", default=None, choices=["google", "sphinx", "vosk"],
+                   help="also replay in real time through this recognizer")
+    p.add_argument("--vosk-model", default="models/vosk")
+    p.add_argument("--json", dest="json_path", default=None)
+    args = p.parse_args(argv)
+
+    tmp = None
+    truth = None
+    path = args.wav
+    if path is None:
+        fd, tmp = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        path = tmp
+        truth = synth_wav(path)
+    try:
+        res = {"wav": args.wav or "synthetic", "truth": truth}
+        res["segmentation"] = run_segmentation(path, hangover_ms=args.hangover_ms, start_db=args.start_db)
+        s = res["segmentation"]
+        print(f"[BENCH] {s['audio_s']:.1f}s audio, noise floor {s['noise_floor_db']:.1f} dBFS, "
+              f"{s['us_per_frame']:.0f} us/frame ({s['realtime_factor']:.0f}x real time)")
+        for (start, end), ep in zip(s["segments"], s["endpoint_ms"]):
+            print(f"[BENCH] segment {start:6.2f}-{end:6.2f}s  endpointed {ep:.0f} ms after speech end")
+        if truth:
+            print(f"[BENCH] expected {[(a, b) for a, b in truth if b - a >= 0.15]}, "
+                  f"dropped as too short: {s['dropped_short']}")
+        if args.recognizer:
+            kwargs = {"model_path": args.vosk_model} if args.recognizer == "vosk" else {}
+            res["time_to_command"] = run_time_to_command(path, args.recognizer, **kwargs)
+            print(f"[BENCH] {args.recognizer}: {res['time_to_command']}")
+        if args.json_path:
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump(res, f, indent=2)
+            print(f"[BENCH] wrote {args.json_path}")
+    finally:
+        if tmp:
+            os.remove(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+check_startup.py
+Checks that importing AURA's modules does no heavy work.
+Each module is imported in a fresh interpreter; the import must not start threads or
+load heavy optional subsystems (MediaPipe, TTS, audio, psutil, COM...). Those are
+loaded on first use. Prints the import time of each module and exits non-zero on any
+violation, so it can run in CI.
+
+Usage:
+    python -m benchmarks.check_startup
+    python -m benchmarks.check_startup --json results/startup.json
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+MODULES = (
+    "metrics", "startup", "framectx", "capture", "idle", "hud", "actuator", "screenshots", "reminders", "tts", "sysmon",
+    "voice", "intents", "events", "utils", "multisource", "preview", "vision.yolo_detector", "gestures.tracking",
+    "gestures.engine", "gestures.detector", "gestures.scheduler", "gestures.remote", "gestures.recording", "main",
+)
+
+# loaded lazily by the subsystem that needs them, never by an import
+HEAVY = ("mediapipe", "pyttsx3", "psutil", "speech_recognition", "pyaudio", "vosk", "comtypes", "pycaw",
+         "pyautogui", "webbrowser", "onnxruntime")
+
+_PROBE = r"""
+import sys, json, time, threading
+before = set(sys.modules)
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{
+    "import_ms": elapsed * 1000.0,
+    "threads": [t.name for t in threading.enumerate() if t is not threading.main_thread()],
+    "heavy": sorted(m for m in set(sys.modules) - before if m.split(".")[0] in {heavy!r}),
+}}))
+"""
+
+
+def probe(module: str, root: str) -> dict:
+    code = _PROBE.format(module=module, heavy=set(HEAVY))
+    proc = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, timeout=120)
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Verify that module imports stay lightweight")
+    p.add_argument("--json", dest="json_path", default=None)
+    args = p.parse_args(argv)
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    failures = 0
+    for module in MODULES:
+        r = results[module] = probe(module, root)
+        problems = []
+        if "error" in r:
+            problems.append(r["error"])
+        else:
+            if r["threads"]:
+                problems.append(f"started threads {r['threads']}")
+            heavy = sorted({m.split(".")[0] for m in r["heavy"]})
+            if heavy:
+                problems.append(f"loaded {heavy}")
+        failures += bool(problems)
+        took = f"{r['import_ms']:8.1f} ms" if "import_ms" in r else "       -   "
+        print(f"[CHECK] {module:<20} {took}  {'FAIL: ' + '; '.join(problems) if problems else 'ok'}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"[CHECK] wrote {args.json_path}")
+    print(f"[CHECK] {failures} module(s) with heavy imports" if failures else "[CHECK] all imports are lightweight")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+stress_events.py
+Stress test for the event bus.
+Several producer threads publish thousands of mixed events (gestures handled inline,
+voice commands awaited as coroutines, action results handled on the bounded executor,
+plus a timer ticking every 10 ms) as fast as they can. When the bus is full a producer
+backs off and retries. Reports throughput, handler latency, peak in-flight events and
+the peak thread count, next to a thread-per-event baseline (the old daemon-thread
+style) for the same blocking work. With --check the exit status is non-zero if an
+accepted event was lost, a handler failed, the backlog bound was exceeded or the
+thread count grew past the bus's fixed budget.
+
+Usage:
+    python -m benchmarks.stress_events --events 20000 --producers 8 --workers 4 --check --json results/events.json
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+
+from events import ActionResult, EventBus, Tick, VoiceCommand
+from multisource import GestureEvent
+
+
+class _Monitor:
+    """Samples the process thread count (and the bus backlog) every millisecond."""
+
+    def __init__(self, bus=None):
+        self.bus = bus
+        self.peak_threads = threading.active_count()
+        self.peak_pending = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="stress-monitor", daemon=True)
+
+    def _loop(self):
+        while not self._stop.wait(0.001):
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+            if self.bus is not None:
+                self.peak_pending = max(self.peak_pending, self.bus.pending())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _make_event(i: int):
+    kind = i % 4
+    if kind == 3:
+        return ActionResult("volume", ok=bool(i % 2))
+    if kind == 2:
+        return VoiceCommand(f"command {i}")
+    return GestureEvent("cam", i % 3, "thumbs_up", time.time(), i)
+
+
+def run_bus(events: int, producers: int, workers: int, backlog: int, blocking_ms: float) -> dict:
+    baseline_threads = threading.active_count()
+    bus = EventBus(workers=workers, max_pending=backlog).start()
+    latencies = []  # appended on the loop thread and by executor threads (list.append is atomic)
+    counts = {"gesture": 0, "voice": 0, "action": 0, "tick": 0}
+    lock = threading.Lock()
+
+    def on_gesture(e):
+        counts["gesture"] += 1
+        latencies.append(time.time() - e.ts)
+
+    async def on_voice(e):
+        await asyncio.sleep(0)
+        counts["voice"] += 1
+        latencies.append(time.time() - e.ts)
+
+    def on_action(e):
+        time.sleep(blocking_ms / 1000.0)
+        with lock:  # executor threads
+            counts["action"] += 1
+        latencies.append(time.time() - e.ts)
+
+    def on_tick(e):
+        counts["tick"] += 1
+
+    bus.subscribe(GestureEvent, on_gesture)
+    bus.subscribe(VoiceCommand, on_voice)
+    bus.subscribe(ActionResult, on_action, blocking=True)
+    bus.subscribe(Tick, on_tick)
+    timer = bus.every(0.01, lambda: Tick("stress"))
+    retries = [0] * producers
+
+    def produce(k):
+        for i in range(k, events, producers):
+            event = _make_event(i)
+            while not bus.publish(event):
+                retries[k] += 1
+                time.sleep(0.0005)
+
+    threads = [threading.Thread(target=produce, args=(k,), name=f"producer-{k}") for k in range(producers)]
+    with _Monitor(bus) as mon:
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        drained = bus.drain(30.0)
+        elapsed = time.perf_counter() - t0
+    timer.cancel()
+    stats = bus.stats()
+    bus.stop()
+    # loop thread + executor workers + producers + monitor on top of what was running before
+    budget = baseline_threads + 1 + workers + producers + 1
+    return {"events": events, "producers": producers, "workers": workers, "backlog": backlog,
+            "elapsed_s": elapsed, "events_per_s": events / elapsed if elapsed > 0 else 0.0,
+            "latency_p50_ms": _percentile(latencies, 0.50) * 1000.0,
+            "latency_p99_ms": _percentile(latencies, 0.99) * 1000.0,
+            "peak_pending": mon.peak_pending, "peak_threads": mon.peak_threads, "thread_budget": budget,
+            "publish_retries": sum(retries), "drained": drained, "counts": counts, "bus": stats}
+
+
+def run_thread_per_event(events: int, blocking_ms: float) -> dict:
+    """The same blocking work with one daemon thread per event."""
+    with _Monitor() as mon:
+        t0 = time.perf_counter()
+        threads = []
+        for i in range(events):
+            t = threading.Thread(target=time.sleep, args=(blocking_ms / 1000.0,), daemon=True)
+            t.start()
+            threads.append(t)
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - t0
+    return {"events": events, "elapsed_s": elapsed, "events_per_s": events / elapsed if elapsed > 0 else 0.0,
+            "peak_threads": mon.peak_threads}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Stress the event bus with thousands of events")
+    p.add_argument("--events", type=int, default=20000)
+    p.add_argument("--producers", type=int, default=8, help="threads publishing concurrently")
+    p.add_argument("--workers", type=int, default=4, help="bus executor threads")
+    p.add_argument("--backlog", type=int, default=1024, help="max events in flight")
+    p.add_argument("--blocking-ms", type=float, default=1.0, help="work done by each blocking handler")
+    p.add_argument("--check", action="store_true", help="exit non-zero if an invariant is violated")
+    p.add_argument("--json", dest="json_path", default=None)
+    args = p.parse_args(argv)
+
+    res = run_bus(args.events, args.producers, args.workers, args.backlog, args.blocking_ms)
+    base = run_thread_per_event(res["counts"]["action"], args.blocking_ms)
+    bus = res["bus"]
+    print(f"[BENCH] bus: {res['events']} events from {res['producers']} producers in {res['elapsed_s']:.2f} s "
+          f"({res['events_per_s']:.0f}/s), {res['publish_retries']} publish retries")
+    print(f"[BENCH] bus: latency p50 {res['latency_p50_ms']:.2f} ms, p99 {res['latency_p99_ms']:.2f} ms; "
+          f"peak in flight {res['peak_pending']}/{res['backlog']}")
+    print(f"[BENCH] bus: peak threads {res['peak_threads']} (budget {res['thread_budget']}), "
+          f"handled {bus['handled']}/{bus['published']}, errors {bus['errors']}, ticks {res['counts']['tick']}")
+    print(f"[BENCH] thread per event: {base['events']} blocking events, peak threads {base['peak_threads']}, "
+          f"{base['events_per_s']:.0f}/s")
+
+    failures = []
+    if not res["drained"] or bus["handled"] != bus["published"]:
+        failures.append("events lost or stuck")
+    if res["counts"]["gesture"] + res["counts"]["voice"] + res["counts"]["action"] != res["events"]:
+        failures.append("handler counts do not add up")
+    if bus["errors"]:
+        failures.append("handler errors")
+    if res["peak_pending"] > res["backlog"]:
+        failures.append("backlog exceeded")
+    if res["peak_threads"] > res["thread_budget"]:
+        failures.append("thread budget exceeded")
+    for f in failures:
+        print(f"[BENCH] FAIL: {f}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"bus": res, "thread_per_event": base, "failures": failures}, f, indent=2)
+        print(f"[BENCH] wrote {args.json_path}")
+    return 1 if args.check and failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,418 @@
+"""
+capture.py
+Frame sources (live camera, video file, image directory) and threaded low-latency capture.
+A background thread reads the source as fast as it delivers frames and
+always overwrites a single "latest frame" slot, so the processing loop never
+works on stale, buffered frames. Frames that are overwritten before being
+consumed are counted as dropped.
+"""
+
+import os
+import time
+import logging
+import platform
+import threading
+from typing import Optional
+
+import cv2
+
+import metrics
+
+logger = logging.getLogger("aura.capture")
+logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+# name -> OpenCV backend id ("auto" picks a sensible default per platform)
+BACKENDS = {
+    "any": cv2.CAP_ANY,
+    "dshow": cv2.CAP_DSHOW,
+    "msmf": cv2.CAP_MSMF,
+    "v4l2": cv2.CAP_V4L2,
+    "avfoundation": cv2.CAP_AVFOUNDATION,
+    "gstreamer": cv2.CAP_GSTREAMER,
+    "ffmpeg": cv2.CAP_FFMPEG,
+}
+
+
+def resolve_backend(name: str = "auto") -> int:
+    """Map a backend name to an OpenCV CAP_* id."""
+    n = (name or "auto").lower()
+    if n == "auto":
+        system = platform.system()
+        if system == "Windows":
+            return cv2.CAP_DSHOW
+        if system == "Darwin":
+            return cv2.CAP_AVFOUNDATION
+        return cv2.CAP_ANY
+    if n not in BACKENDS:
+        raise ValueError(f"Unknown capture backend {name!r}; choose from auto, {', '.join(BACKENDS)}")
+    return BACKENDS[n]
+
+
+class Frame:
+    """A captured frame with its sequence number and capture timestamp (time.perf_counter())."""
+
+    __slots__ = ("seq", "timestamp", "image")
+
+    def __init__(self, seq: int, timestamp: float, image):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.image = image
+
+    @property
+    def age(self) -> float:
+        """Seconds elapsed since the frame was captured."""
+        return time.perf_counter() - self.timestamp
+
+
+class FrameSource:
+    """
+    Base class for anything that yields BGR frames.
+    open() -> bool, read() -> (ok, image), release().
+    exhausted is True once a finite source (file, directory) has no more frames.
+    """
+
+    name = "source"
+
+    def __init__(self):
+        self.exhausted = False
+
+    @property
+    def fps(self) -> Optional[float]:
+        """Nominal frame rate of the source, or None if unknown."""
+        return None
+
+    def open(self) -> bool:
+        return True
+
+    def configure(self, size=None, fps: Optional[float] = None) -> bool:
+        """Ask the device for size (w, h) and fps; None restores what open() negotiated. False if unsupported."""
+        return False
+
+    def read(self):
+        raise NotImplementedError
+
+    def release(self) -> None:
+        pass
+
+    def __iter__(self):
+        while True:
+            ok, img = self.read()
+            if not ok:
+                if self.exhausted:
+                    return
+                continue
+            yield img
+
+    def __enter__(self):
+        if not self.open():
+            raise IOError(f"Could not open frame source {self.name}")
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class CameraSource(FrameSource):
+    """Live camera through cv2.VideoCapture. width/height/fps/buffer_size of None keep the driver default."""
+
+    def __init__(self, index: int = 0, backend: str = "auto", width: Optional[int] = None,
+                 height: Optional[int] = None, fps: Optional[float] = None,
+                 buffer_size: Optional[int] = 1):
+        super().__init__()
+        self.index = index
+        self.backend = backend
+        self.width = width
+        self.height = height
+        self.requested_fps = fps
+        self.buffer_size = buffer_size
+        self.name = f"camera:{index}"
+        self._cap = None
+        self._opened = None  # (width, height, fps) negotiated by open()
+
+    @property
+    def fps(self) -> Optional[float]:
+        if self._cap is None:
+            return self.requested_fps
+        return self._cap.get(cv2.CAP_PROP_FPS) or None
+
+    def open(self) -> bool:
+        cap = cv2.VideoCapture(self.index, resolve_backend(self.backend))
+        if not cap.isOpened():
+            cap.release()
+            return False
+        if self.buffer_size is not None:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, int(self.buffer_size))
+        if self.width:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, int(self.width))
+        if self.height:
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, int(self.height))
+        if self.requested_fps:
+            cap.set(cv2.CAP_PROP_FPS, float(self.requested_fps))
+        self._opened = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                        cap.get(cv2.CAP_PROP_FPS))
+        logger.info("Camera %s opened: %dx%d @ %.1f fps (backend=%s)", self.index, *self._opened, self.backend)
+        self._cap = cap
+        return True
+
+    def configure(self, size=None, fps: Optional[float] = None) -> bool:
+        if self._cap is None:
+            return False
+        width, height = size or self._opened[:2]
+        fps = fps or self._opened[2]
+        self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, int(width))
+        self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, int(height))
+        if fps:
+            self._cap.set(cv2.CAP_PROP_FPS, float(fps))
+        got = (int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        logger.info("Camera %s now %dx%d @ %.1f fps", self.index, *got, self._cap.get(cv2.CAP_PROP_FPS))
+        return got == (int(width), int(height))
+
+    def read(self):
+        if self._cap is None:
+            return False, None
+        ret, img = self._cap.read()
+        if not ret or img is None:
+            return False, None
+        return True, img
+
+    def release(self) -> None:
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class VideoFileSource(FrameSource):
+    """Frames decoded from a video file; exhausted at end of file unless loop=True."""
+
+    def __init__(self, path: str, loop: bool = False):
+        super().__init__()
+        self.path = path
+        self.loop = loop
+        self.name = f"video:{os.path.basename(path)}"
+        self._cap = None
+
+    @property
+    def fps(self) -> Optional[float]:
+        if self._cap is None:
+            return None
+        return self._cap.get(cv2.CAP_PROP_FPS) or None
+
+    def open(self) -> bool:
+        cap = cv2.VideoCapture(self.path)
+        if not cap.isOpened():
+            cap.release()
+            return False
+        self._cap = cap
+        self.exhausted = False
+        return True
+
+    def read(self):
+        if self._cap is None:
+            return False, None
+        ret, img = self._cap.read()
+        if ret and img is not None:
+            return True, img
+        if self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, img = self._cap.read()
+            if ret and img is not None:
+                return True, img
+        self.exhausted = True
+        return False, None
+
+    def release(self) -> None:
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class ImageDirSource(FrameSource):
+    """Images from a directory, in sorted filename order."""
+
+    EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+    def __init__(self, path: str, fps: Optional[float] = None, loop: bool = False):
+        super().__init__()
+        self.path = path
+        self.loop = loop
+        self.name = f"images:{os.path.basename(os.path.normpath(path))}"
+        self._fps = fps
+        self._files = []
+        self._pos = 0
+
+    @property
+    def fps(self) -> Optional[float]:
+        return self._fps
+
+    def open(self) -> bool:
+        try:
+            names = sorted(os.listdir(self.path))
+        except OSError:
+            return False
+        self._files = [os.path.join(self.path, n) for n in names if n.lower().endswith(self.EXTENSIONS)]
+        self._pos = 0
+        self.exhausted = not self._files
+        return bool(self._files)
+
+    def read(self):
+        if self._pos >= len(self._files):
+            if not self.loop or not self._files:
+                self.exhausted = True
+                return False, None
+            self._pos = 0
+        fpath = self._files[self._pos]
+        self._pos += 1
+        img = cv2.imread(fpath, cv2.IMREAD_COLOR)
+        if img is None:
+            logger.info("Skipping unreadable image: %s", fpath)
+            return False, None
+        return True, img
+
+
+def open_source(spec, loop: bool = False, **camera_kwargs) -> FrameSource:
+    """
+    Build a FrameSource from a spec: an int / digit string is a camera index,
+    a directory is an image sequence, anything else is a video file.
+    loop restarts files and directories at the end; camera_kwargs are forwarded to CameraSource.
+    """
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return CameraSource(int(spec), **camera_kwargs)
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, loop=loop)
+    return VideoFileSource(spec, loop=loop)
+
+
+class CaptureThread:
+    """
+    Reads a FrameSource on a dedicated thread into a single latest-frame slot.
+    start() -> bool, read(after_seq) -> Frame or None, set_profile(fps, size), stop().
+    pace=True throttles finite sources (files, image dirs) to their nominal FPS so they behave like a camera.
+    """
+
+    def __init__(self, source: FrameSource, mirror: bool = True, pace: bool = False):
+        self.source = source
+        self.mirror = mirror
+        self.pace = pace
+
+        self._thread = None
+        self._running = False
+        self._cond = threading.Condition()
+        self._latest: Optional[Frame] = None
+        self._latest_consumed = True
+        self._seq = 0
+        self._profile = None  # requested (fps, size), applied by the capture thread
+        self._max_fps = None
+        self.profile_seq = 0  # first frame captured under the current profile (None while a change is pending)
+        self.captured = 0
+        self.dropped = 0
+        self.read_failures = 0
+
+    @property
+    def finished(self) -> bool:
+        """True once a finite source is exhausted and the last frame has been consumed."""
+        return self.source.exhausted and self._latest_consumed
+
+    def start(self) -> bool:
+        """Open the source and start the capture thread. Returns False if the source is not accessible."""
+        if self._running:
+            return True
+        if not self.source.open():
+            return False
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name=f"capture-{self.source.name}", daemon=True)
+        self._thread.start()
+        return True
+
+    def set_profile(self, fps: Optional[float] = None, size=None) -> None:
+        """
+        Low-power capture: at most fps frames per second, at size (w, h) if the source can switch.
+        set_profile() with no arguments restores the full rate and resolution. Applied by the capture thread.
+        """
+        with self._cond:
+            self._profile = (fps, size)
+            self.profile_seq = None  # until the capture thread has applied it
+            self._cond.notify_all()
+
+    def _apply_profile(self) -> None:
+        with self._cond:
+            profile, self._profile = self._profile, None
+        fps, size = profile
+        if not self.source.configure(size, fps) and size is not None:
+            logger.info("%s cannot switch resolution; only the frame rate is lowered", self.source.name)
+        self._max_fps = fps
+        with self._cond:
+            if self._profile is None:
+                self.profile_seq = self._seq + 1
+
+    def _loop(self) -> None:
+        src = self.source
+        pace = 1.0 / src.fps if (self.pace and src.fps) else 0.0
+        interval = pace
+        next_t = time.perf_counter()
+        while self._running:
+            if self._profile is not None:
+                self._apply_profile()
+                interval = max(pace, 1.0 / self._max_fps) if self._max_fps else pace
+                next_t = time.perf_counter()
+            with metrics.span("capture.read"):
+                ok, img = src.read()
+            ts = time.perf_counter()
+            if not ok:
+                if src.exhausted:
+                    break
+                self.read_failures += 1
+                time.sleep(0.05)
+                continue
+            if self.mirror:
+                with metrics.span("capture.flip"):
+                    img = cv2.flip(img, 1)
+            with self._cond:
+                self._seq += 1
+                if not self._latest_consumed:
+                    self.dropped += 1
+                self._latest = Frame(self._seq, ts, img)
+                self._latest_consumed = False
+                self.captured += 1
+                self._cond.notify_all()
+            if interval:
+                next_t += interval
+                delay = next_t - time.perf_counter()
+                if delay > 0:
+                    # a profile change (wake from idle) cuts the wait short
+                    with self._cond:
+                        if self._running and self._profile is None:
+                            self._cond.wait(delay)
+                else:
+                    next_t = time.perf_counter()
+        with self._cond:
+            self._cond.notify_all()
+
+    def read(self, after_seq: int = 0, timeout: float = 1.0) -> Optional[Frame]:
+        """
+        Return the newest frame with seq > after_seq, waiting up to timeout seconds.
+        Returns None on timeout, when the capture is stopped or when the source is exhausted.
+        """
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while (self._running and not self.source.exhausted
+                   and (self._latest is None or self._latest.seq <= after_seq)):
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            if self._latest is None or self._latest.seq <= after_seq:
+                return None
+            self._latest_consumed = True
+            return self._latest
+
+    def stats(self) -> dict:
+        return {"captured": self.captured, "dropped": self.dropped, "read_failures": self.read_failures}
+
+    def stop(self) -> None:
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.source.release()
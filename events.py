@@ -0,0 +1,303 @@
+"""
+events.py
+Typed event bus on a single asyncio loop.
+EventBus runs one event loop on its own thread. publish(event) is thread-safe and never
+blocks, so the frame loop, capture threads and listener callbacks hand events over and
+return. Handlers subscribe to an event class (a base class, or object for every event)
+and run on the loop in subscription order, so the state they touch is owned by one
+thread. Coroutine handlers are awaited on the loop; handlers subscribed with
+blocking=True run on a bounded ThreadPoolExecutor that other subsystems (the intent
+dispatcher) share, so the thread count stays fixed however many events arrive.
+At most `max_pending` events are in flight; beyond that publish() drops and counts them.
+call_later() and every() publish timer events from the loop itself.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("aura.events")
+
+
+# ----------------- event types -----------------
+class VoiceCommand:
+    __slots__ = ("text", "ts")
+
+    def __init__(self, text: str, ts: Optional[float] = None):
+        self.text = text
+        self.ts = time.time() if ts is None else ts
+
+    def __repr__(self):
+        return f"VoiceCommand({self.text!r})"
+
+
+class ReminderDue:
+    __slots__ = ("reminder", "ts")
+
+    def __init__(self, reminder, ts: Optional[float] = None):
+        self.reminder = reminder
+        self.ts = time.time() if ts is None else ts
+
+    def __repr__(self):
+        return f"ReminderDue({self.reminder!r})"
+
+
+class Speak:
+    __slots__ = ("text", "priority", "key", "ttl", "ts")
+
+    def __init__(self, text: str, priority: Optional[int] = None, key: Optional[str] = None,
+                 ttl: Optional[float] = None):
+        self.text = text
+        self.priority = priority  # None: the speech queue's NORMAL
+        self.key = key
+        self.ttl = ttl
+        self.ts = time.time()
+
+    def __repr__(self):
+        return f"Speak({self.text!r})"
+
+
+class ActionResult:
+    """Outcome of an actuator action (ok=False with error set when it failed or was unavailable)."""
+    __slots__ = ("action", "ok", "error", "ts")
+
+    def __init__(self, action: str, ok: bool, error: Optional[str] = None):
+        self.action = action
+        self.ok = ok
+        self.error = error
+        self.ts = time.time()
+
+    def __repr__(self):
+        return f"ActionResult({self.action} {'ok' if self.ok else self.error or 'failed'})"
+
+
+class Tick:
+    __slots__ = ("name", "ts")
+
+    def __init__(self, name: str, ts: Optional[float] = None):
+        self.name = name
+        self.ts = time.time() if ts is None else ts
+
+    def __repr__(self):
+        return f"Tick({self.name})"
+
+
+class Timer:
+    """Handle returned by call_later()/every(); cancel() stops further publishing."""
+    __slots__ = ("cancelled", "fired")
+
+    def __init__(self):
+        self.cancelled = False
+        self.fired = 0
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+# ----------------- bus -----------------
+class EventBus:
+    """
+    start(); subscribe(event_type, handler, blocking=False) or @on(event_type); publish(event) -> bool;
+    call_soon(fn, *args) runs fn on the loop thread; drain(timeout); stats(); stop().
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 1024):
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="event-worker")
+        self._subs: Dict[type, List[Tuple[Callable, str]]] = {}
+        self._routes: Dict[type, List[Tuple[Callable, str]]] = {}  # concrete class -> handlers, rebuilt lazily
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_ident = None
+        self._ready = threading.Event()
+        self._thread = None
+        self._tasks = set()
+        self._closed = False
+        self._pending = 0
+        self.published = 0
+        self.handled = 0
+        self.dropped = 0
+        self.errors = 0
+
+    # ----------------- subscriptions -----------------
+    def subscribe(self, event_type: type, handler: Callable, blocking: bool = False) -> Callable:
+        if asyncio.iscoroutinefunction(handler):
+            kind = "async"
+        else:
+            kind = "blocking" if blocking else "sync"
+        with self._lock:
+            self._subs.setdefault(event_type, []).append((handler, kind))
+            self._routes = {}
+        return handler
+
+    def on(self, event_type: type, blocking: bool = False):
+        """Decorator form of subscribe()."""
+        def _wrap(fn):
+            return self.subscribe(event_type, fn, blocking)
+        return _wrap
+
+    def _handlers(self, cls: type):
+        handlers = self._routes.get(cls)
+        if handlers is None:
+            with self._lock:
+                handlers = [h for base in cls.__mro__ for h in self._subs.get(base, ())]
+                self._routes[cls] = handlers
+        return handlers
+
+    # ----------------- lifecycle -----------------
+    def start(self) -> "EventBus":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="event-loop", daemon=True)
+            self._thread.start()
+            self._ready.wait()
+        return self
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.set_default_executor(self.executor)
+        self._loop = loop
+        self._loop_ident = threading.get_ident()
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+            if self._tasks:
+                loop.run_until_complete(asyncio.gather(*self._tasks, return_exceptions=True))
+            loop.close()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every published event has been handled; False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Refuse new events, let in-flight ones finish (up to timeout), then stop the loop and the executor."""
+        with self._lock:
+            self._closed = True
+        if self._thread is None:
+            self.executor.shutdown(wait=False)
+            return
+        if not self.drain(timeout):
+            logger.warning("Event bus stopped with %d events still in flight", self._pending)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # ----------------- publishing -----------------
+    def publish(self, event) -> bool:
+        """Hand an event to the loop. Never blocks; False if the bus is stopped or full (the event is dropped)."""
+        with self._lock:
+            if self._loop is None or self._closed or self._pending >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._pending += 1
+            self.published += 1
+        if threading.get_ident() == self._loop_ident:
+            self._loop.call_soon(self._deliver, event)
+        else:
+            self._loop.call_soon_threadsafe(self._deliver, event)
+        return True
+
+    def call_soon(self, fn: Callable, *args) -> None:
+        """Run fn(*args) on the loop thread, where the handlers run (for state they own)."""
+        if threading.get_ident() == self._loop_ident:
+            fn(*args)
+        elif self._loop is not None and not self._closed:
+            self._loop.call_soon_threadsafe(self._call, fn, args)
+
+    def _call(self, fn, args) -> None:
+        try:
+            fn(*args)
+        except Exception as e:
+            self.errors += 1
+            logger.exception("Event loop call %s failed: %s", getattr(fn, "__name__", fn), e)
+
+    def call_later(self, delay: float, event) -> Timer:
+        """Publish event after delay seconds (unless cancelled first)."""
+        timer = Timer()
+
+        def fire():
+            if not timer.cancelled:
+                timer.fired += 1
+                self.publish(event)
+        self.call_soon(lambda: self._loop.call_later(max(0.0, delay), fire))
+        return timer
+
+    def every(self, interval: float, make_event: Callable[[], object]) -> Timer:
+        """Publish make_event() every interval seconds on a fixed schedule (missed ticks are skipped)."""
+        timer = Timer()
+        interval = max(1e-3, float(interval))
+
+        def fire(due):
+            if timer.cancelled:
+                return
+            timer.fired += 1
+            self.publish(make_event())
+            now = self._loop.time()
+            due += interval
+            if due < now:
+                due += interval * ((now - due) // interval + 1)
+            self._loop.call_at(due, fire, due)
+
+        def begin():
+            due = self._loop.time() + interval
+            self._loop.call_at(due, fire, due)
+        self.call_soon(begin)
+        return timer
+
+    # ----------------- delivery (loop thread) -----------------
+    def _deliver(self, event) -> None:
+        waits = []
+        for handler, kind in self._handlers(type(event)):
+            try:
+                if kind == "sync":
+                    handler(event)
+                elif kind == "async":
+                    waits.append(handler(event))
+                else:
+                    waits.append(self._loop.run_in_executor(self.executor, handler, event))
+            except Exception as e:
+                self._failed(event, e)
+        if waits:
+            task = self._loop.create_task(self._finish(event, waits))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            self._done()
+
+    async def _finish(self, event, waits) -> None:
+        try:
+            for result in await asyncio.gather(*waits, return_exceptions=True):
+                if isinstance(result, Exception):
+                    self._failed(event, result)
+        finally:
+            self._done()
+
+    def _failed(self, event, e: BaseException) -> None:
+        self.errors += 1
+        logger.error("Handler for %r failed: %s", event, e, exc_info=e)
+
+    def _done(self) -> None:
+        with self._lock:
+            self._pending -= 1
+            self.handled += 1
+            if not self._pending:
+                self._idle.notify_all()
+
+    # ----------------- readers -----------------
+    def pending(self) -> int:
+        return self._pending
+
+    def stats(self) -> dict:
+        return {"published": self.published, "handled": self.handled, "dropped": self.dropped,
+                "errors": self.errors, "pending": self._pending, "workers": self.workers,
+                "subscribers": sum(len(h) for h in self._subs.values())}
@@ -0,0 +1,152 @@
+"""
+framectx.py
+Per-frame cache of derived views.
+A FrameContext wraps one BGR frame. Every derived view (RGB, grayscale, downscaled
+copies, pyramid levels, letterboxed images, normalized tensors) is computed the first
+time any consumer asks for it and then shared by all later consumers of the same frame.
+release() retires the frame: the context drops its views, and the number of views and
+bytes allocated for the frame is added to the process-wide totals (stats()).
+
+Views are derived from the image as it is at the time of the request. Drawing happens
+in place on the BGR image, so consumers request their views before a detector draws.
+Views are shared: treat them as read-only.
+"""
+
+import threading
+
+import cv2
+import numpy as np
+
+import metrics
+
+_totals_lock = threading.Lock()
+_totals = {"frames": 0, "views": 0, "bytes": 0, "reused": 0}
+_per_view = {}  # view kind -> count computed
+
+
+def letterbox(frame, size: int):
+    """Resize keeping aspect ratio and pad to size x size. Returns (image, scale, (pad_x, pad_y))."""
+    h, w = frame.shape[:2]
+    scale = min(size / w, size / h)
+    nw, nh = int(round(w * scale)), int(round(h * scale))
+    px, py = (size - nw) // 2, (size - nh) // 2
+    out = np.full((size, size, 3), 114, dtype=np.uint8)
+    cv2.resize(frame, (nw, nh), dst=out[py:py + nh, px:px + nw], interpolation=cv2.INTER_LINEAR)
+    return out, scale, (px, py)
+
+
+class FrameContext:
+    """
+    rgb(scale), gray(), scaled(scale), pyramid(level, gray), rgb_crop(box), letterboxed(size), tensor(size).
+    Safe to share between threads; each view is computed once.
+    """
+
+    __slots__ = ("image", "seq", "_views", "_lock", "allocs", "bytes", "reused", "_released")
+
+    def __init__(self, image, seq: int = 0):
+        self.image = image
+        self.seq = seq
+        self._views = {}
+        self._lock = threading.RLock()
+        self.allocs = 0
+        self.bytes = 0
+        self.reused = 0
+        self._released = False
+
+    def _get(self, key, make):
+        with self._lock:
+            view = self._views.get(key)
+            if view is not None:
+                self.reused += 1
+                return view
+            with metrics.span(f"frame.{key[0]}"):
+                view = make()
+            if not self._released:
+                self._views[key] = view
+            self._count(key[0], view)
+            return view
+
+    def _count(self, kind: str, view) -> None:
+        arr = view[0] if isinstance(view, tuple) else view
+        self.allocs += 1
+        self.bytes += arr.nbytes
+        with _totals_lock:
+            _per_view[kind] = _per_view.get(kind, 0) + 1
+
+    def has(self, kind: str) -> bool:
+        return any(k[0] == kind for k in self._views)
+
+    # ----------------- views -----------------
+    def scaled(self, scale: float = 1.0):
+        """BGR downscaled by scale (INTER_AREA); the frame itself for scale >= 1."""
+        if scale >= 1.0:
+            return self.image
+        return self._get(("scaled", scale), lambda: cv2.resize(self.image, None, fx=scale, fy=scale,
+                                                                interpolation=cv2.INTER_AREA))
+
+    def rgb(self, scale: float = 1.0):
+        if scale >= 1.0:
+            return self._get(("rgb", 1.0), lambda: cv2.cvtColor(self.image, cv2.COLOR_BGR2RGB))
+        return self._get(("rgb", scale), lambda: cv2.cvtColor(self.scaled(scale), cv2.COLOR_BGR2RGB))
+
+    def gray(self):
+        return self._get(("gray",), lambda: cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY))
+
+    def pyramid(self, level: int, gray: bool = False):
+        """Level n is half the size of level n-1 (cv2.pyrDown); level 0 is the frame (or gray())."""
+        if level <= 0:
+            return self.gray() if gray else self.image
+        return self._get(("pyramid", level, gray), lambda: cv2.pyrDown(self.pyramid(level - 1, gray)))
+
+    def rgb_crop(self, box):
+        """Contiguous RGB copy of box (x0, y0, x1, y1): sliced from rgb() when it exists, else converted alone."""
+        x0, y0, x1, y1 = box
+        with self._lock:
+            full = self._views.get(("rgb", 1.0))
+        if full is not None:
+            self.reused += 1
+            return np.ascontiguousarray(full[y0:y1, x0:x1])
+        crop = cv2.cvtColor(self.image[y0:y1, x0:x1], cv2.COLOR_BGR2RGB)
+        self._count("rgb_crop", crop)
+        return crop
+
+    def letterboxed(self, size: int):
+        """RGB letterboxed to size x size: (image, scale, (pad_x, pad_y))."""
+        return self._get(("letterbox", size), lambda: letterbox(self.rgb(), size))
+
+    def tensor(self, size: int):
+        """Normalized float32 NCHW RGB tensor (1, 3, size, size) of letterboxed(size): (blob, scale, pad)."""
+        def make():
+            img, scale, pad = self.letterboxed(size)
+            return cv2.dnn.blobFromImage(img, 1.0 / 255.0), scale, pad
+        return self._get(("tensor", size), make)
+
+    # ----------------- lifecycle -----------------
+    def release(self) -> None:
+        """Retire the frame: drop every cached view and add this frame's allocations to the totals."""
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+            self._views.clear()
+        with _totals_lock:
+            _totals["frames"] += 1
+            _totals["views"] += self.allocs
+            _totals["bytes"] += self.bytes
+            _totals["reused"] += self.reused
+        metrics.record("frame.views", float(self.allocs))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def stats() -> dict:
+    """Views allocated per retired frame, bytes per frame and how often a cached view was reused."""
+    with _totals_lock:
+        frames = _totals["frames"]
+        return {**_totals, "views_per_frame": _totals["views"] / frames if frames else 0.0,
+                "kb_per_frame": _totals["bytes"] / 1024.0 / frames if frames else 0.0,
+                "per_view": dict(_per_view)}
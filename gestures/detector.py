@@ -3,52 +3,122 @@ detector.py
 Hand gesture detector using MediaPipe (optional).
 Exports GestureDetector with process(frame) -> (frame, action, hud).
 If mediapipe is not installed, detector runs in no-op mode and only provides time HUD.
+mediapipe is imported when the first GestureDetector is created, not at module import.
+
+Landmarks for all hands are decoded into one (hands x 21 x 3) NumPy array and
+handed to the table-driven gesture engine (gestures.engine.GestureClassifier):
+static poses by finger-bitmask lookup, dynamic gestures (swipes, holds, pinch-drag)
+over a ring buffer of recent landmarks. Each hand gets an ID that is stable across
+frames and every gesture has its own per-hand cooldown, so with max_num_hands > 1
+every hand can trigger its own action; last_events lists this frame's
+(hand_id, gesture) pairs. gesture_table replaces the default rows.
+
+With roi_tracking=True, inference runs on a padded crop around the previous
+frame's hands and falls back to a full-frame (optionally downscaled) search
+when the crop finds nothing. roi_stats() reports how often the crop path hit.
+
+The RGB (and downscaled) input comes from the frame's FrameContext, so other
+models working on the same frame reuse the conversion instead of repeating it.
 """
 
 import time
 import logging
-import cv2
+import threading
+from typing import Optional
+
+import numpy as np
+
+import metrics
+import startup
+from framectx import FrameContext
+from gestures.engine import GestureClassifier
 
 logger = logging.getLogger("aura.detector")
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-# try importing mediapipe lazily
-try:
-    import mediapipe as mp  # type: ignore
-    _HAVE_MEDIAPIPE = True
-    logger.info("MediaPipe available: gesture detection enabled.")
-except Exception as e:
-    mp = None  # type: ignore
-    _HAVE_MEDIAPIPE = False
-    logger.info("MediaPipe not available: %s", e)
+_mp = None
+_mp_checked = False
+_mp_lock = threading.Lock()
+
+
+def load_mediapipe():
+    """Import mediapipe on first use (it takes seconds); returns the module or None if unavailable."""
+    global _mp, _mp_checked
+    with _mp_lock:
+        if not _mp_checked:
+            try:
+                with startup.phase("import mediapipe"):
+                    import mediapipe  # type: ignore
+                _mp = mediapipe
+                logger.info("MediaPipe available: gesture detection enabled.")
+            except Exception as e:
+                logger.info("MediaPipe not available: %s", e)
+            _mp_checked = True
+        return _mp
+
+
+def decode_landmarks(multi_hand_landmarks) -> np.ndarray:
+    """MediaPipe multi_hand_landmarks -> float32 array (hands, 21, 3) of normalized x, y, z."""
+    return np.array([[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in multi_hand_landmarks],
+                    dtype=np.float32).reshape(-1, 21, 3)
+
+
+def to_pixels(landmarks: np.ndarray, w: int, h: int) -> np.ndarray:
+    """Normalized (hands, 21, 3) landmarks -> int32 (hands, 21, 2) pixel coordinates (truncated like int())."""
+    return (landmarks[..., :2] * np.array([w, h], dtype=np.float32)).astype(np.int32)
 
 
 class GestureDetector:
     """
     Detects simple hand gestures using MediaPipe if available.
     process(frame) -> (frame, action, hud)
-    action in {"thumbs_up", "thumbs_down", "screenshot"} or None
+    action: a gesture name from the table (see gestures.engine.DEFAULT_TABLE) or None
     hud: dict with keys "time", "sys", "emotion"
     """
 
-    def __init__(self, cooldown: float = 1.0):
-        self.enabled = _HAVE_MEDIAPIPE
+    def __init__(self, cooldown: float = 1.0, max_num_hands: int = 1, roi_tracking: bool = False,
+                 roi_padding: float = 0.6, search_scale: float = 1.0, gesture_table=None):
         self.cooldown = float(cooldown)
-        self._last_action_time = 0.0
-        self._last_action = None
+        self.max_num_hands = int(max_num_hands)
+        # ROI tracking: padding is a fraction of the hand box size added on every side;
+        # search_scale < 1 downscales the full-frame search used when tracking is lost
+        self.roi_tracking = bool(roi_tracking)
+        self.roi_padding = float(roi_padding)
+        self.search_scale = min(1.0, float(search_scale))
+        self._roi = None  # (x0, y0, x1, y1) in pixels, or None when not tracking
+        self.roi_attempts = 0
+        self.roi_hits = 0
+        self.full_searches = 0
+        self._pixels_inferred = 0
+        self._pixels_total = 0
+        self.classifier = GestureClassifier(self.cooldown, table=gesture_table, max_hands=max(4, self.max_num_hands))
+        self.tracker = self.classifier.tracker
+        # optional gestures.recording.LandmarkRecorder: every processed frame's landmarks are appended
+        self.recorder = None
+        self._frames = 0
         self.hud = {"time": "", "sys": "", "emotion": ""}
-
+        # pixel landmarks (hands, 21, 2) from the most recent frame (empty when no hand was found),
+        # their stable hand IDs, and the (hand_id, gesture) actions fired on that frame
+        self.last_landmarks = np.zeros((0, 21, 2), dtype=np.int32)
+        self.last_hand_ids = np.zeros(0, dtype=np.int32)
+        self.last_events = []
+        # set False when nobody looks at the frames (headless): landmarks are then not drawn
+        self.draw = True
+
+        mp = load_mediapipe()
+        self.enabled = mp is not None
         if not self.enabled:
             return
 
         try:
             self.mp_hands = mp.solutions.hands
-            self.hands = self.mp_hands.Hands(
-                static_image_mode=False,
-                max_num_hands=1,
-                min_detection_confidence=0.6,
-                min_tracking_confidence=0.6,
-            )
+            with startup.phase("hands model init"):
+                self.hands = self.mp_hands.Hands(
+                    static_image_mode=False,
+                    max_num_hands=self.max_num_hands,
+                    min_detection_confidence=0.6,
+                    min_tracking_confidence=0.6,
+                )
             self.mp_draw = mp.solutions.drawing_utils
         except Exception as e:
             logger.exception("Failed to initialize MediaPipe Hands: %s", e)
@@ -57,12 +127,77 @@ class GestureDetector:
     def _now_str(self) -> str:
         return time.strftime("%H:%M:%S")
 
-    def _cooldown_ok(self) -> bool:
-        return (time.time() - self._last_action_time) > self.cooldown
+    def roi_stats(self) -> dict:
+        """Crop-path hit rate and the fraction of frame pixels actually sent to inference."""
+        return {
+            "roi_attempts": self.roi_attempts,
+            "roi_hits": self.roi_hits,
+            "full_searches": self.full_searches,
+            "hit_rate": self.roi_hits / self.roi_attempts if self.roi_attempts else 0.0,
+            "pixel_fraction": self._pixels_inferred / self._pixels_total if self._pixels_total else 1.0,
+        }
+
+    def _run_hands(self, rgb):
+        """Run MediaPipe on an RGB image (full frame, crop or downscaled view)."""
+        self._pixels_inferred += rgb.shape[0] * rgb.shape[1]
+        with metrics.span("detector.hands"):
+            res = self.hands.process(rgb)
+        return getattr(res, "multi_hand_landmarks", None) if res else None
 
-    def process(self, frame):
+    def _update_roi(self, pts, w: int, h: int) -> None:
+        """Padded square box around all hands in pts (hands, 21, 2), clamped to the frame."""
+        if not self.roi_tracking or pts.shape[0] == 0:
+            self._roi = None
+            return
+        flat = pts.reshape(-1, 2)
+        (bx0, by0), (bx1, by1) = flat.min(axis=0), flat.max(axis=0)
+        side = max(bx1 - bx0, by1 - by0) * (1.0 + 2.0 * self.roi_padding)
+        cx, cy = (bx0 + bx1) / 2.0, (by0 + by1) / 2.0
+        x0, y0 = max(0, int(cx - side / 2)), max(0, int(cy - side / 2))
+        x1, y1 = min(w, int(cx + side / 2)), min(h, int(cy + side / 2))
+        self._roi = (x0, y0, x1, y1) if (x1 - x0) > 16 and (y1 - y0) > 16 else None
+
+    def _detect(self, ctx: FrameContext):
+        """
+        Returns (hand protos, normalized full-frame landmarks (hands, 21, 3), image the protos are relative to).
+        Tries the ROI crop first when tracking, then the full (or downscaled) frame.
+        """
+        img = ctx.image
+        h, w = img.shape[:2]
+        self._pixels_total += h * w
+        if self._roi is not None:
+            x0, y0, x1, y1 = self._roi
+            view = img[y0:y1, x0:x1]
+            self.roi_attempts += 1
+            hands = self._run_hands(ctx.rgb_crop(self._roi))
+            if hands:
+                self.roi_hits += 1
+                lms = decode_landmarks(hands)
+                lms[..., 0] = (lms[..., 0] * (x1 - x0) + x0) / w
+                lms[..., 1] = (lms[..., 1] * (y1 - y0) + y0) / h
+                return hands, lms, view
+
+        self.full_searches += 1
+        hands = self._run_hands(ctx.rgb(self.search_scale))
+        if not hands:
+            return None, None, img
+        # normalized coordinates are resolution independent, so a downscaled search maps 1:1
+        return hands, decode_landmarks(hands), img
+
+    def _draw(self, target, hands) -> None:
+        with metrics.span("detector.draw"):
+            for hand_lms in hands:
+                # draw landmarks on the image (a crop view draws straight into the frame)
+                try:
+                    self.mp_draw.draw_landmarks(target, hand_lms, self.mp_hands.HAND_CONNECTIONS)
+                except Exception:
+                    # drawing is non-critical
+                    pass
+
+    def process(self, frame, ctx: Optional[FrameContext] = None):
         """
         Process a BGR frame. Returns (frame, action, hud).
+        ctx: the frame's FrameContext, to share its RGB views with other consumers (one is made if omitted).
         Keeps frame unchanged if detection unavailable.
         """
         self.hud["time"] = self._now_str()
@@ -70,69 +205,43 @@ class GestureDetector:
         if not self.enabled or frame is None:
             return frame, None, self.hud.copy()
 
+        self.last_events = []
         img = frame  # working on the same array (OpenCV drawing is in-place)
         h, w, _ = img.shape
         try:
-            rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        except Exception as e:
-            logger.exception("cvtColor failed: %s", e)
-            return frame, None, self.hud.copy()
-
-        try:
-            res = self.hands.process(rgb)
+            hands, lms, draw_target = self._detect(ctx if ctx is not None else FrameContext(img))
         except Exception as e:
             logger.exception("MediaPipe processing error: %s", e)
+            self._roi = None
             return frame, None, self.hud.copy()
 
         action = None
+        now = time.time()
+        self._frames += 1
+        seq = ctx.seq if ctx is not None and ctx.seq else self._frames
 
-        if res and getattr(res, "multi_hand_landmarks", None):
-            try:
-                for hand_lms in res.multi_hand_landmarks:
-                    # draw landmarks on the image
-                    try:
-                        self.mp_draw.draw_landmarks(img, hand_lms, self.mp_hands.HAND_CONNECTIONS)
-                    except Exception:
-                        # drawing is non-critical
-                        pass
-
-                    # convert landmarks to pixel coordinates
-                    landmarks = []
-                    for lm in hand_lms.landmark:
-                        landmarks.append((int(lm.x * w), int(lm.y * h)))
-
-                    # basic finger state checks (thumb + four fingers)
-                    fingers = []
-                    try:
-                        # thumb: compare x tip(4) and ip(3) relative to hand (works better with single handedness)
-                        fingers.append(1 if landmarks[4][0] > landmarks[3][0] else 0)
-                        for tip_index in (8, 12, 16, 20):
-                            fingers.append(1 if landmarks[tip_index][1] < landmarks[tip_index - 2][1] else 0)
-                    except Exception:
-                        continue  # skip if any landmark missing
-
-                    wrist_y = landmarks[0][1]
-                    thumb_tip_y = landmarks[4][1]
-                    other_fingers = fingers[1:]
-
-                    # Thumbs up
-                    if thumb_tip_y < wrist_y and other_fingers == [0, 0, 0, 0]:
-                        if self._cooldown_ok():
-                            action = "thumbs_up"
-                    # Thumbs down
-                    elif thumb_tip_y > wrist_y and other_fingers == [0, 0, 0, 0]:
-                        if self._cooldown_ok():
-                            action = "thumbs_down"
-                    # Peace (index + middle open) -> screenshot
-                    elif fingers == [0, 1, 1, 0, 0]:
-                        if self._cooldown_ok():
-                            action = "screenshot"
-
-                    if action:
-                        self._last_action = action
-                        self._last_action_time = time.time()
-                        break
-            except Exception as e:
-                logger.exception("Gesture parsing error: %s", e)
+        if not hands:
+            self._roi = None
+            self.last_landmarks = self.last_landmarks[:0]
+            self.last_hand_ids, gesture_ids, _ = self.classifier.update(self.last_landmarks, now)
+            if self.recorder is not None:
+                self.recorder.append(now, seq, self.last_landmarks, self.last_hand_ids, gesture_ids, [], (w, h))
+            return img, action, self.hud.copy()
+
+        if self.draw:
+            self._draw(draw_target, hands)
+
+        try:
+            with metrics.span("detector.classify"):
+                pts = to_pixels(lms, w, h)
+                self.last_landmarks = pts
+                self._update_roi(pts, w, h)
+                self.last_hand_ids, gesture_ids, self.last_events = self.classifier.update(pts, now)
+            if self.recorder is not None:
+                self.recorder.append(now, seq, pts, self.last_hand_ids, gesture_ids, self.last_events, (w, h))
+            if self.last_events:
+                action = self.last_events[0][1]
+        except Exception as e:
+            logger.exception("Gesture parsing error: %s", e)
 
         return img, action, self.hud.copy()
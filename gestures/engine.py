@@ -0,0 +1,312 @@
+"""
+engine.py
+Table-driven gesture engine.
+Gestures are rows of a configuration table (DEFAULT_TABLE, or a JSON file with the
+same rows), compiled once into arrays:
+
+  static   a hand pose. Each hand's finger state is packed into a 7-bit code
+           (finger_bitmask) and the gesture is a lookup in a 128-entry table built
+           from the rows' require/forbid bits, first matching row wins.
+  dynamic  a motion (swipe, hold, pinch-drag). A fixed-size NumPy ring buffer keeps
+           the recent landmarks of every tracked hand; once per frame a small
+           feature vector is computed per hand (FEATURES) and every dynamic row,
+           an interval per feature, is tested in one broadcast comparison.
+
+Either way the Python work per frame does not depend on the number of rows, and
+every row has its own cooldown (per hand). A fired dynamic gesture clears that
+hand's history so one motion fires once. benchmarks/bench_gestures.py measures
+the per-frame cost as the table grows.
+"""
+
+import json
+import time
+from typing import Optional
+
+import numpy as np
+
+from gestures.tracking import HandTracker, palm_centres
+
+# ----------------- finger bitmask -----------------
+# finger state bits (1 = extended); thumb uses x, the other fingers use y
+FINGER_THUMB, FINGER_INDEX, FINGER_MIDDLE, FINGER_RING, FINGER_PINKY = 1, 2, 4, 8, 16
+# thumb tip position relative to the wrist
+THUMB_ABOVE_WRIST, THUMB_BELOW_WRIST = 32, 64
+_OTHER_FINGERS = FINGER_INDEX | FINGER_MIDDLE | FINGER_RING | FINGER_PINKY
+
+BITS = {"thumb": FINGER_THUMB, "index": FINGER_INDEX, "middle": FINGER_MIDDLE, "ring": FINGER_RING,
+        "pinky": FINGER_PINKY, "thumb_above_wrist": THUMB_ABOVE_WRIST, "thumb_below_wrist": THUMB_BELOW_WRIST}
+
+_TIP_IDX = np.array([8, 12, 16, 20])
+_PIP_IDX = _TIP_IDX - 2
+_FINGER_BITS = np.array([FINGER_INDEX, FINGER_MIDDLE, FINGER_RING, FINGER_PINKY], dtype=np.int32)
+
+
+def finger_bitmask(pts: np.ndarray) -> np.ndarray:
+    """Pixel landmarks (hands, 21, 2) -> int32 gesture code per hand (finger bits + thumb/wrist bits)."""
+    thumb = (pts[:, 4, 0] > pts[:, 3, 0]).astype(np.int32) * FINGER_THUMB
+    others = (pts[:, _TIP_IDX, 1] < pts[:, _PIP_IDX, 1]).astype(np.int32) @ _FINGER_BITS
+    tip_y, wrist_y = pts[:, 4, 1], pts[:, 0, 1]
+    above = (tip_y < wrist_y).astype(np.int32) * THUMB_ABOVE_WRIST
+    below = (tip_y > wrist_y).astype(np.int32) * THUMB_BELOW_WRIST
+    return thumb | others | above | below
+
+
+# ----------------- configuration -----------------
+# per-hand features the dynamic rows test; distances are in palm sizes (wrist to middle MCP)
+FEATURES = (
+    "dx", "dy",  # palm-centre displacement across the window (+x right, +y down)
+    "dist",  # length of that displacement
+    "pinch_max",  # largest thumb-tip to index-tip distance in the window (small = pinched throughout)
+    "span_s",  # time covered by the window's samples
+    "hold_s",  # how long the current static pose has been held
+    "pose",  # current static gesture index (0 = none)
+)
+_F = {name: i for i, name in enumerate(FEATURES)}
+
+_FOLDED = ["index", "middle", "ring", "pinky"]
+
+DEFAULT_TABLE = [
+    {"name": "thumbs_up", "kind": "static", "require": ["thumb_above_wrist"], "forbid": _FOLDED},
+    {"name": "thumbs_down", "kind": "static", "require": ["thumb_below_wrist"], "forbid": _FOLDED},
+    {"name": "screenshot", "kind": "static", "require": ["index", "middle"], "forbid": ["thumb", "ring", "pinky"]},
+    # thumb ignored: its extension test depends on which hand it is
+    {"name": "open_palm", "kind": "static", "require": ["index", "middle", "ring", "pinky"]},
+    {"name": "pinch_drag", "kind": "dynamic", "when": {"pinch_max": [None, 0.35], "dist": [1.0, None],
+                                                       "span_s": [0.15, None]}},
+    {"name": "swipe_left", "kind": "dynamic", "when": {"dx": [None, -2.0], "dy": [-1.0, 1.0],
+                                                       "pinch_max": [0.5, None], "span_s": [0.15, None]}},
+    {"name": "swipe_right", "kind": "dynamic", "when": {"dx": [2.0, None], "dy": [-1.0, 1.0],
+                                                        "pinch_max": [0.5, None], "span_s": [0.15, None]}},
+    {"name": "swipe_up", "kind": "dynamic", "when": {"dy": [None, -2.0], "dx": [-1.0, 1.0],
+                                                     "pinch_max": [0.5, None], "span_s": [0.15, None]}},
+    {"name": "swipe_down", "kind": "dynamic", "when": {"dy": [2.0, None], "dx": [-1.0, 1.0],
+                                                       "pinch_max": [0.5, None], "span_s": [0.15, None]}},
+    {"name": "hold_palm", "kind": "dynamic", "pose": "open_palm", "when": {"hold_s": [1.5, None],
+                                                                           "dist": [None, 0.5]},
+     "cooldown": 3.0},
+]
+
+
+def load_table(path: str) -> list:
+    """A gesture table from a JSON file: a list of rows shaped like DEFAULT_TABLE's."""
+    with open(path, "r", encoding="utf-8") as f:
+        table = json.load(f)
+    if not isinstance(table, list):
+        raise ValueError(f"{path}: expected a JSON list of gesture rows")
+    return table
+
+
+def _bits(names, row_name: str) -> int:
+    try:
+        return sum(BITS[n] for n in names)
+    except KeyError as e:
+        raise ValueError(f"gesture {row_name!r}: unknown finger bit {e.args[0]!r}; use one of {', '.join(BITS)}")
+
+
+class CompiledTable:
+    """
+    names: (None, *static, *dynamic) - gesture index -> name; static: (128,) code -> index;
+    lo / hi: (dynamic rows, features) intervals; cooldowns: (gestures,) seconds.
+    """
+
+    def __init__(self, rows, default_cooldown: float = 1.0):
+        static = [r for r in rows if r.get("kind", "static") == "static"]
+        dynamic = [r for r in rows if r.get("kind") == "dynamic"]
+        unknown = [r.get("kind") for r in rows if r.get("kind", "static") not in ("static", "dynamic")]
+        if unknown:
+            raise ValueError(f"unknown gesture kind(s) {unknown}; use 'static' or 'dynamic'")
+        self.names = (None,) + tuple(r["name"] for r in static) + tuple(r["name"] for r in dynamic)
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("gesture names must be unique")
+        if len(self.names) > 255:
+            raise ValueError("at most 254 gestures fit the uint8 gesture index")
+        self.index = {n: i for i, n in enumerate(self.names)}
+        self.cooldowns = np.array([0.0] + [float(r.get("cooldown", default_cooldown)) for r in static + dynamic])
+
+        masks = [(_bits(r.get("require", ()), r["name"]), _bits(r.get("forbid", ()), r["name"])) for r in static]
+        codes = np.arange(128)
+        self.static = np.zeros(128, dtype=np.uint8)
+        # reversed: the first matching row is written last and wins
+        for i in range(len(masks) - 1, -1, -1):
+            req, forbid = masks[i]
+            self.static[((codes & req) == req) & ((codes & forbid) == 0)] = i + 1
+
+        self.first_dynamic = 1 + len(static)
+        self.lo = np.full((len(dynamic), len(FEATURES)), -np.inf)
+        self.hi = np.full((len(dynamic), len(FEATURES)), np.inf)
+        for g, r in enumerate(dynamic):
+            for feat, (lo, hi) in r.get("when", {}).items():
+                if feat not in _F:
+                    raise ValueError(f"gesture {r['name']!r}: unknown feature {feat!r}; "
+                                     f"use one of {', '.join(FEATURES)}")
+                if lo is not None:
+                    self.lo[g, _F[feat]] = lo
+                if hi is not None:
+                    self.hi[g, _F[feat]] = hi
+            if r.get("pose"):
+                if r["pose"] not in self.index or self.index[r["pose"]] >= self.first_dynamic:
+                    raise ValueError(f"gesture {r['name']!r}: pose {r['pose']!r} is not a static gesture")
+                self.lo[g, _F["pose"]] = self.hi[g, _F["pose"]] = self.index[r["pose"]]
+
+    @property
+    def has_dynamic(self) -> bool:
+        return len(self.lo) > 0
+
+    def match_dynamic(self, feats: np.ndarray) -> np.ndarray:
+        """(hands, features) -> gesture index per hand of the first matching dynamic row (0 = none)."""
+        ok = ((feats[:, None, :] >= self.lo) & (feats[:, None, :] <= self.hi)).all(axis=2)
+        first = ok.argmax(axis=1)
+        return np.where(ok.any(axis=1), first + self.first_dynamic, 0).astype(np.uint8)
+
+
+DEFAULT = CompiledTable(DEFAULT_TABLE)
+# default gesture names and code -> gesture lookup, for callers that only need static poses
+GESTURES = DEFAULT.names
+GESTURE_TABLE = DEFAULT.static
+
+
+def classify(pts: np.ndarray, table: CompiledTable = DEFAULT) -> np.ndarray:
+    """Pixel landmarks (hands, 21, 2) -> static gesture index per hand."""
+    if pts.shape[0] == 0:
+        return np.zeros(0, dtype=np.uint8)
+    return table.static[finger_bitmask(pts)]
+
+
+# ----------------- landmark history -----------------
+class LandmarkHistory:
+    """
+    Ring buffer of the last `size` frames of up to `slots` tracked hands, plus per-sample palm
+    centre, palm size and pinch distance derived on push. features() looks back window_s seconds.
+    """
+
+    def __init__(self, slots: int = 4, size: int = 32, window_s: float = 0.5):
+        self.size = int(size)
+        self.window_s = float(window_s)
+        self.pts = np.zeros((slots, self.size, 21, 2), dtype=np.float32)
+        self.ts = np.full((slots, self.size), -np.inf)
+        # cx, cy, palm size (pixels), pinch distance (palm sizes)
+        self.derived = np.zeros((slots, self.size, 4), dtype=np.float32)
+        self.head = np.zeros(slots, dtype=np.int64)
+        self.pose = np.zeros(slots, dtype=np.int64)
+        self.pose_since = np.zeros(slots)
+        self._slot = {}  # hand id -> slot
+        self._free = list(range(slots))
+
+    def _release_missing(self, keep) -> None:
+        for hid in [h for h in self._slot if h not in keep]:
+            slot = self._slot.pop(hid)
+            self.ts[slot] = -np.inf
+            self._free.append(slot)
+
+    def slots_for(self, hand_ids, keep) -> np.ndarray:
+        """Slot per hand (-1 when every slot is taken); hands no longer in keep give theirs back."""
+        self._release_missing(set(keep))
+        out = np.full(len(hand_ids), -1, dtype=np.int64)
+        for i, hid in enumerate(int(h) for h in hand_ids):
+            slot = self._slot.get(hid)
+            if slot is None and self._free:
+                slot = self._slot[hid] = self._free.pop()
+                self.head[slot] = 0
+                self.pose[slot] = -1  # the first push starts the hold timer
+            if slot is not None:
+                out[i] = slot
+        return out
+
+    def push(self, slots, pts, poses, now: float, centres=None, sizes=None) -> None:
+        """Append one sample per hand; centres/sizes may be passed in when already known (HandTracker)."""
+        if not len(slots):
+            return
+        if centres is None:
+            centres, sizes = palm_centres(pts)
+        pinch = np.linalg.norm((pts[:, 4] - pts[:, 8]).astype(np.float32), axis=1) / sizes
+        h = self.head[slots]
+        self.pts[slots, h] = pts
+        self.ts[slots, h] = now
+        self.derived[slots, h, 0:2] = centres
+        self.derived[slots, h, 2] = sizes
+        self.derived[slots, h, 3] = pinch
+        self.head[slots] = (h + 1) % self.size
+        changed = self.pose[slots] != poses
+        self.pose_since[slots[changed]] = now
+        self.pose[slots] = poses
+
+    def features(self, slots, now: float) -> np.ndarray:
+        """(hands, len(FEATURES)) for the given slots."""
+        ts = self.ts[slots]
+        recent = ts >= now - self.window_s
+        rows = np.arange(len(slots))
+        newest = (self.head[slots] - 1) % self.size
+        oldest = np.where(recent, ts, np.inf).argmin(axis=1)
+        d = self.derived[slots]
+        new, old = d[rows, newest], d[rows, oldest]
+        feats = np.empty((len(slots), len(FEATURES)))
+        feats[:, 0:2] = (new[:, 0:2] - old[:, 0:2]) / new[:, 2:3]
+        feats[:, 2] = np.hypot(feats[:, 0], feats[:, 1])
+        feats[:, 3] = np.where(recent, d[:, :, 3], -np.inf).max(axis=1)
+        feats[:, 4] = now - ts[rows, oldest]
+        feats[:, 5] = now - self.pose_since[slots]
+        feats[:, 6] = self.pose[slots]
+        return feats
+
+    def clear(self, hand_id: int) -> None:
+        slot = self._slot.get(hand_id)
+        if slot is not None:
+            self.ts[slot] = -np.inf
+            self.pose[slot] = -1
+
+
+# ----------------- engine -----------------
+class GestureClassifier:
+    """
+    Everything after inference: pixel landmarks -> gesture per hand, stable hand IDs and the
+    (hand_id, gesture) events whose per-hand, per-gesture cooldown has expired. No MediaPipe
+    needed, so recorded landmarks can be replayed through it (gestures.recording).
+    update(pts, now) -> (hand_ids, gesture_ids, events)
+    table: rows like DEFAULT_TABLE (or a CompiledTable); cooldown: default for rows without one.
+    """
+
+    def __init__(self, cooldown: float = 1.0, table=None, max_hands: int = 4, history: int = 32,
+                 window_s: float = 0.5):
+        if isinstance(table, CompiledTable):
+            self.table = table
+        else:
+            self.table = CompiledTable(DEFAULT_TABLE if table is None else table, cooldown)
+        self.gestures = self.table.names
+        self.tracker = HandTracker()
+        self.history = LandmarkHistory(max_hands, history, window_s)
+        self._last_fired = {}  # (hand id, gesture index) -> time
+
+    def reset(self) -> None:
+        self.tracker = HandTracker()
+        self.history = LandmarkHistory(len(self.history.head), self.history.size, self.history.window_s)
+        self._last_fired = {}
+
+    def _fire(self, hand_ids, gesture_ids, now: float):
+        """(hand_id, gesture) for every gesturing hand whose cooldown for that gesture has expired."""
+        events = []
+        for i in np.flatnonzero(gesture_ids):
+            hid, gid = int(hand_ids[i]), int(gesture_ids[i])
+            if now - self._last_fired.get((hid, gid), -np.inf) > self.table.cooldowns[gid]:
+                self._last_fired[(hid, gid)] = now
+                events.append((hid, self.gestures[gid]))
+                if gid >= self.table.first_dynamic:
+                    self.history.clear(hid)
+        if len(self._last_fired) > len(self.gestures) * max(1, len(self.tracker.active_ids)):
+            active = set(self.tracker.active_ids)
+            self._last_fired = {k: t for k, t in self._last_fired.items() if k[0] in active}
+        return events
+
+    def update(self, pts: np.ndarray, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        gesture_ids = classify(pts, self.table)
+        hand_ids = self.tracker.update(pts)
+        if self.table.has_dynamic:
+            slots = self.history.slots_for(hand_ids, self.tracker.active_ids)
+            tracked = slots >= 0
+            if tracked.any():
+                self.history.push(slots[tracked], pts[tracked], gesture_ids[tracked], now,
+                                  self.tracker.last_centres[tracked], self.tracker.last_sizes[tracked])
+                dynamic = self.table.match_dynamic(self.history.features(slots[tracked], now))
+                gesture_ids = gesture_ids.copy()
+                gesture_ids[tracked] = np.where(dynamic > 0, dynamic, gesture_ids[tracked])
+        return hand_ids, gesture_ids, self._fire(hand_ids, gesture_ids, now)
@@ -0,0 +1,218 @@
+"""
+recording.py
+Compact landmark recordings and detector-free replay.
+LandmarkRecorder collects, per processed frame, the timestamp, the frame sequence
+number, every hand's pixel landmarks, its stable ID, its classified gesture and the
+gesture it fired (if any), and writes them as one columnar binary file:
+
+    b"AURALMK1" | uint32 header length | JSON header | 64-byte aligned column blocks
+
+The header lists each column's dtype, shape and offset, so Recording opens every
+column as a read-only np.memmap without parsing or copying anything. Frame columns
+have one row per frame; hand columns have one row per detected hand, and
+hand_offsets[i]:hand_offsets[i + 1] selects frame i's hands.
+
+replay() feeds the recorded landmarks and timestamps through GestureClassifier,
+the post-inference half of GestureDetector, so rules, tracking and cooldowns can
+be regression- and throughput-tested without MediaPipe or a camera.
+classify_all() runs only the static-pose lookup over every hand in one array call.
+"""
+
+import json
+import struct
+import logging
+from typing import Iterator, Optional
+
+import numpy as np
+
+from gestures.engine import GESTURES, GestureClassifier, classify
+
+logger = logging.getLogger("aura.recording")
+
+MAGIC = b"AURALMK1"
+VERSION = 1
+_ALIGN = 64
+
+FRAME_COLUMNS = {"ts": np.float64, "seq": np.uint32, "action": np.uint8}
+HAND_COLUMNS = {"landmarks": np.int16, "hand_ids": np.int32, "gestures": np.uint8, "fired": np.uint8}
+
+
+class LandmarkRecorder:
+    """
+    append(ts, seq, pts, hand_ids, gesture_ids, events, size) per frame; close() writes the file.
+    Landmarks are stored as int16 pixels (84 bytes per hand), so an hour at 30 fps is a few MB.
+    """
+
+    def __init__(self, path: str, meta: Optional[dict] = None, gestures=GESTURES):
+        self.path = path
+        self.gestures = tuple(gestures)  # gesture index -> name of the classifier being recorded
+        self._index = {g: i for i, g in enumerate(self.gestures)}
+        self.meta = dict(meta or {})
+        self.size = None  # (width, height) of the recorded frames
+        self._frames = {name: [] for name in FRAME_COLUMNS}
+        self._hands = {name: [] for name in HAND_COLUMNS}
+        self._counts = []
+        self.closed = False
+
+    @property
+    def frames(self) -> int:
+        return len(self._counts)
+
+    def append(self, ts: float, seq: int, pts, hand_ids, gesture_ids, events, size=None) -> None:
+        if self.size is None and size is not None:
+            self.size = (int(size[0]), int(size[1]))
+        fired = dict(events)
+        n = len(pts)
+        self._counts.append(n)
+        self._frames["ts"].append(ts)
+        self._frames["seq"].append(seq)
+        self._frames["action"].append(self._index[events[0][1]] if events else 0)
+        if n:
+            self._hands["landmarks"].append(np.asarray(pts, dtype=np.int16).reshape(n, 21, 2))
+            self._hands["hand_ids"].append(np.asarray(hand_ids, dtype=np.int32))
+            self._hands["gestures"].append(np.asarray(gesture_ids, dtype=np.uint8))
+            self._hands["fired"].append(np.array([self._index[fired[int(h)]] if int(h) in fired else 0
+                                                  for h in hand_ids], dtype=np.uint8))
+
+    def _columns(self) -> dict:
+        cols = {name: np.asarray(values, dtype=FRAME_COLUMNS[name]) for name, values in self._frames.items()}
+        offsets = np.zeros(len(self._counts) + 1, dtype=np.uint32)
+        np.cumsum(self._counts, out=offsets[1:])
+        cols["hand_offsets"] = offsets
+        empty = {"landmarks": (0, 21, 2)}
+        for name, parts in self._hands.items():
+            dtype = HAND_COLUMNS[name]
+            cols[name] = np.concatenate(parts).astype(dtype, copy=False) if parts else \
+                np.zeros(empty.get(name, (0,)), dtype=dtype)
+        return cols
+
+    def close(self) -> str:
+        """Write the file (once) and return its path."""
+        if self.closed:
+            return self.path
+        self.closed = True
+        cols = self._columns()
+        header = {"version": VERSION, "frames": self.frames, "hands": int(cols["hand_offsets"][-1]),
+                  "size": self.size, "gestures": list(self.gestures), "meta": self.meta, "columns": {}}
+        # offsets depend on the header length; two passes settle it
+        for _ in range(2):
+            blob = json.dumps(header).encode("utf-8")
+            pos = _aligned(len(MAGIC) + 4 + len(blob))
+            for name, arr in cols.items():
+                header["columns"][name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": pos}
+                pos = _aligned(pos + arr.nbytes)
+        blob = json.dumps(header).encode("utf-8")
+        with open(self.path, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(blob)) + blob)
+            for name, arr in cols.items():
+                f.write(b"\0" * (header["columns"][name]["offset"] - f.tell()))
+                f.write(np.ascontiguousarray(arr).tobytes())
+        logger.info("Recorded %d frames (%d hands) to %s", header["frames"], header["hands"], self.path)
+        return self.path
+
+
+def _aligned(pos: int) -> int:
+    return (pos + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class Recording:
+    """A recording opened read-only; every column is an np.memmap attribute (ts, seq, landmarks...)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path}: not an AURA landmark recording")
+            (length,) = struct.unpack("<I", f.read(4))
+            self.header = json.loads(f.read(length).decode("utf-8"))
+        if self.header.get("version") != VERSION:
+            raise ValueError(f"{path}: unsupported recording version {self.header.get('version')}")
+        self.columns = {}
+        for name, spec in self.header["columns"].items():
+            shape = tuple(spec["shape"])
+            if 0 in shape:
+                arr = np.zeros(shape, dtype=np.dtype(spec["dtype"]))
+            else:
+                arr = np.memmap(path, dtype=np.dtype(spec["dtype"]), mode="r", offset=spec["offset"], shape=shape)
+            self.columns[name] = arr
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __len__(self) -> int:
+        return self.header["frames"]
+
+    @property
+    def size(self):
+        return self.header.get("size")
+
+    def hands(self, i: int) -> slice:
+        return slice(int(self.hand_offsets[i]), int(self.hand_offsets[i + 1]))
+
+    def frames(self) -> Iterator[tuple]:
+        """(ts, seq, landmarks (hands, 21, 2) int32) per frame."""
+        lms = np.asarray(self.landmarks, dtype=np.int32)
+        offsets = np.asarray(self.hand_offsets)
+        for i, (ts, seq) in enumerate(zip(self.ts.tolist(), self.seq.tolist())):
+            yield ts, seq, lms[offsets[i]:offsets[i + 1]]
+
+
+class ReplayResult:
+    __slots__ = ("actions", "fired", "gestures", "hand_ids", "events", "names")
+
+    def __init__(self, actions, fired, gestures, hand_ids, events, names=GESTURES):
+        self.names = tuple(names)  # gesture index -> name for the arrays below
+        self.actions = actions  # (frames,) uint8 gesture index of the frame's action
+        self.fired = fired  # (hands,) uint8 gesture fired by each hand row
+        self.gestures = gestures  # (hands,) uint8 classified gesture of each hand row
+        self.hand_ids = hand_ids  # (hands,) int32
+        self.events = events  # [(frame index, hand_id, gesture)]
+
+    def mismatches(self, rec: Recording) -> dict:
+        """Frames/hands where the replay disagrees with what was recorded (gestures compared by name)."""
+        index = {g: i for i, g in enumerate(self.names)}
+        # recorded index -> replayed index; 255 for a gesture the replaying table does not have
+        remap = np.array([index.get(g, 255) for g in rec.header["gestures"]], dtype=np.uint8)
+        return {"actions": int(np.count_nonzero(self.actions != remap[rec.action])),
+                "gestures": int(np.count_nonzero(self.gestures != remap[rec.gestures])),
+                "fired": int(np.count_nonzero(self.fired != remap[rec.fired])),
+                "hand_ids": int(np.count_nonzero(self.hand_ids != rec.hand_ids))}
+
+
+def classify_all(rec: Recording, classifier: Optional[GestureClassifier] = None) -> np.ndarray:
+    """Static poses only: gesture index for every recorded hand, in one vectorized call."""
+    table = (classifier or GestureClassifier()).table
+    return classify(np.asarray(rec.landmarks, dtype=np.int32), table)
+
+
+def replay(rec: Recording, classifier: Optional[GestureClassifier] = None) -> ReplayResult:
+    """
+    Run the recording through a fresh (or the given) GestureClassifier with the recorded timestamps.
+    Indices in the result refer to the classifier's gestures.
+    """
+    clf = classifier or GestureClassifier()
+    if list(clf.gestures) != rec.header["gestures"]:
+        logger.warning("%s was recorded with gestures %s", rec.path, rec.header["gestures"])
+    n_hands = rec.header["hands"]
+    actions = np.zeros(len(rec), dtype=np.uint8)
+    fired = np.zeros(n_hands, dtype=np.uint8)
+    gestures = np.zeros(n_hands, dtype=np.uint8)
+    hand_ids = np.zeros(n_hands, dtype=np.int32)
+    events = []
+    index = {g: i for i, g in enumerate(clf.gestures)}
+    offsets = np.asarray(rec.hand_offsets)
+    for i, (ts, _, pts) in enumerate(rec.frames()):
+        ids, gids, evs = clf.update(pts, ts)
+        lo = int(offsets[i])
+        hand_ids[lo:lo + len(ids)] = ids
+        gestures[lo:lo + len(gids)] = gids
+        if evs:
+            actions[i] = index[evs[0][1]]
+            rows = {int(h): lo + j for j, h in enumerate(ids)}
+            for hid, gesture in evs:
+                fired[rows[hid]] = index[gesture]
+                events.append((i, hid, gesture))
+    return ReplayResult(actions, fired, gestures, hand_ids, events, clf.gestures)
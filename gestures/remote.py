@@ -0,0 +1,290 @@
+"""
+remote.py
+Out-of-process hand detection over a shared-memory frame ring.
+Exports RemoteDetector with the same process(frame) -> (frame, action, hud) API as
+GestureDetector, but inference runs in a worker process so it never competes with
+capture, HUD rendering and cv2.imshow for the GIL.
+
+Frames are written once into a slot of a multiprocessing.shared_memory ring; only
+small (slot, seq, shape) tuples cross the job queue, never the image. Results
+(landmarks, hand IDs, per-hand events, action, hud) come back asynchronously tagged with the frame seq.
+The worker always works on the newest queued frame; older ones are released unprocessed.
+When the worker dies or the frame size changes, it is rebuilt on a background thread;
+until it is back, process() keeps returning the last result and new frames are dropped.
+"""
+
+import time
+import queue
+import logging
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from gestures.scheduler import draw_hand_points
+
+logger = logging.getLogger("aura.remote")
+
+
+def _worker_main(shm_name, n_slots, shape, jobs, results, detector_kwargs):
+    """Worker process: attach the ring, build a GestureDetector and serve jobs until None arrives."""
+    from gestures.detector import GestureDetector
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    slot_bytes = int(np.prod(shape))
+    views = [np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=i * slot_bytes) for i in range(n_slots)]
+    detector = GestureDetector(**detector_kwargs)
+    detector.draw = False  # nobody looks at the ring slots; the parent draws the returned landmarks
+    results.put(("ready", detector.enabled))
+    try:
+        while True:
+            job = jobs.get()
+            skipped = []
+            # keep only the newest frame; release the slots of anything older
+            while job is not None:
+                try:
+                    newer = jobs.get_nowait()
+                except queue.Empty:
+                    break
+                skipped.append(job[0])
+                job = newer
+            if job is None:
+                break
+            slot, seq = job
+            t0 = time.perf_counter()
+            _, action, hud = detector.process(views[slot])
+            latency = (time.perf_counter() - t0) * 1000.0
+            results.put(("result", seq, slot, skipped, detector.last_landmarks.copy(), detector.last_hand_ids.copy(),
+                         detector.last_events, action, hud, latency))
+    finally:
+        del views
+        shm.close()
+
+
+class RemoteDetector:
+    """
+    Runs GestureDetector in a worker process fed through a shared-memory ring.
+    slots: ring size; a frame is dropped (not queued) when every slot is still in flight.
+    max_restarts: worker crashes tolerated before giving up (detection then stays off).
+    """
+
+    def __init__(self, detector_kwargs=None, slots: int = 3, start_timeout: float = 30.0,
+                 max_restarts: int = 5):
+        self.detector_kwargs = dict(detector_kwargs or {})
+        self.n_slots = max(2, int(slots))
+        self.start_timeout = float(start_timeout)
+        self.max_restarts = int(max_restarts)
+        self.hud = {"time": "", "sys": "", "emotion": ""}
+        self.enabled = False
+
+        self._ctx = mp.get_context("spawn")
+        self._shape = None
+        self._shm = None
+        self._views = []
+        self._proc = None
+        self._jobs = None
+        self._results = None
+        self._free = []
+        self._seq = 0
+        self._landmarks = np.zeros((0, 21, 2), dtype=np.int32)
+        self.last_hand_ids = np.zeros(0, dtype=np.int32)
+        self.last_events = []  # (hand_id, gesture) from every result drained by the last poll()
+        self.draw = True  # False: landmarks are not drawn into the frame (headless)
+        self.last_result_seq = 0
+        self.restarts = 0
+        self.counts = {"submitted": 0, "completed": 0, "skipped": 0, "no_slot": 0, "restart_drops": 0}
+        self.last_latency_ms = 0.0
+        self._restart_thread = None
+        self._closed = False
+
+    # ----------------- lifecycle -----------------
+    def _alloc(self, shape) -> None:
+        self._release_shm()
+        slot_bytes = int(np.prod(shape))
+        self._shm = shared_memory.SharedMemory(create=True, size=slot_bytes * self.n_slots)
+        self._views = [np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf, offset=i * slot_bytes)
+                       for i in range(self.n_slots)]
+        self._shape = tuple(shape)
+
+    def _spawn(self) -> bool:
+        self._jobs = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._free = list(range(self.n_slots))
+        self._proc = self._ctx.Process(
+            target=_worker_main, name="aura-detector",
+            args=(self._shm.name, self.n_slots, self._shape, self._jobs, self._results, self.detector_kwargs),
+            daemon=True)
+        self._proc.start()
+        try:
+            msg = self._results.get(timeout=self.start_timeout)
+        except queue.Empty:
+            logger.error("Detector worker did not start within %.0fs", self.start_timeout)
+            self._kill()
+            return False
+        self.enabled = bool(msg[1])
+        logger.info("Detector worker started (pid %s, detection %s).", self._proc.pid,
+                    "enabled" if self.enabled else "disabled")
+        return True
+
+    def start(self, shape=(480, 640, 3)) -> bool:
+        """Allocate the ring for frames of `shape` and start the worker. Returns False if it fails to come up."""
+        self._closed = False
+        self._alloc(shape)
+        return self._spawn()
+
+    def _kill(self) -> None:
+        if self._proc is not None:
+            if self._proc.is_alive():
+                self._proc.terminate()
+            self._proc.join(timeout=2.0)
+            self._proc = None
+        for q in (self._jobs, self._results):
+            if q is not None:
+                q.close()
+                q.cancel_join_thread()
+        self._jobs = self._results = None
+
+    def _release_shm(self) -> None:
+        self._views = []
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def stop(self) -> None:
+        """Ask the worker to exit, wait briefly, then force it and free the ring."""
+        self._closed = True
+        restart = self._restart_thread
+        if restart is not None and restart.is_alive():
+            restart.join(timeout=2.0)
+            if restart.is_alive():
+                # still spawning: the restart thread tears the worker down itself once it is up
+                return
+        self._restart_thread = None
+        if self._proc is not None and self._proc.is_alive():
+            try:
+                self._jobs.put(None)
+                self._proc.join(timeout=2.0)
+            except Exception:
+                pass
+        self._kill()
+        self._release_shm()
+
+    def _restart(self, shape=None) -> None:
+        """Replace the worker on a background thread (around a new ring when shape is given)."""
+        def run():
+            self._kill()
+            if shape is not None:
+                self._alloc(shape)
+            self._spawn()
+            if self._closed:
+                # stop() gave up waiting for us
+                self._kill()
+                self._release_shm()
+
+        self._restart_thread = threading.Thread(target=run, name="detector-restart", daemon=True)
+        self._restart_thread.start()
+
+    def _restarting(self) -> bool:
+        """True while a restart is in flight; the worker, queues and ring belong to the restart thread until then."""
+        if self._restart_thread is None:
+            return False
+        if self._restart_thread.is_alive():
+            return True
+        self._restart_thread = None
+        return False
+
+    def _ensure_worker(self) -> bool:
+        if self._proc is not None and self._proc.is_alive():
+            return True
+        if self._shm is None or self.restarts >= self.max_restarts:
+            return False
+        self.restarts += 1
+        logger.warning("Detector worker exited (code %s); restarting (%d/%d).",
+                       self._proc.exitcode if self._proc else None, self.restarts, self.max_restarts)
+        self._restart()
+        return False
+
+    # ----------------- frame path -----------------
+    def submit(self, frame) -> int:
+        """Copy frame into a free ring slot and queue it. Returns its seq, or 0 if it was dropped."""
+        if self._restarting():
+            self.counts["restart_drops"] += 1
+            return 0
+        if tuple(frame.shape) != self._shape:
+            # resolution changed: rebuild the ring and the worker around the new shape
+            logger.info("Frame size changed %s -> %s; restarting the detector worker.", self._shape, frame.shape)
+            self._restart(tuple(frame.shape))
+            self.counts["restart_drops"] += 1
+            return 0
+        if not self._ensure_worker():
+            self.counts["restart_drops" if self._restarting() else "no_slot"] += 1
+            return 0
+        if not self._free:
+            self.counts["no_slot"] += 1
+            return 0
+        slot = self._free.pop()
+        np.copyto(self._views[slot], frame)
+        self._seq += 1
+        self._jobs.put((slot, self._seq))
+        self.counts["submitted"] += 1
+        return self._seq
+
+    def poll(self):
+        """Drain finished results without blocking. Returns the first non-None action, if any."""
+        action = None
+        self.last_events = []
+        if self._restarting():
+            return None
+        while self._results is not None:
+            try:
+                msg = self._results.get_nowait()
+            except (queue.Empty, OSError, ValueError):
+                break
+            if msg[0] != "result":
+                continue
+            _, seq, slot, skipped, landmarks, hand_ids, events, act, hud, latency = msg
+            self._free.append(slot)
+            self._free.extend(skipped)
+            self.counts["completed"] += 1
+            self.counts["skipped"] += len(skipped)
+            self.last_events.extend(events)
+            if seq > self.last_result_seq:
+                self.last_result_seq = seq
+                self._landmarks = landmarks
+                self.last_hand_ids = hand_ids
+                self.hud = hud
+                self.last_latency_ms = latency
+            if act and action is None:
+                action = act
+        return action
+
+    def process(self, frame, ctx=None):
+        """
+        Submit frame, collect whatever results are ready and draw the newest landmarks. Never blocks on inference
+        or on a worker restart; the last result is reused until the new worker answers.
+        ctx is accepted for interface parity; the worker process converts its own copy of the frame.
+        """
+        if frame is not None:
+            self.submit(frame)
+        action = self.poll()
+        if self.draw and frame is not None and len(self._landmarks):
+            try:
+                draw_hand_points(frame, self._landmarks)
+            except Exception:
+                # drawing is non-critical
+                pass
+        hud = dict(self.hud)
+        hud["time"] = time.strftime("%H:%M:%S")
+        return frame, action, hud
+
+    @property
+    def last_landmarks(self):
+        return self._landmarks
+
+    def stats(self) -> dict:
+        proc = self._proc  # a restart may swap it under us
+        return dict(self.counts, restarts=self.restarts, lag_frames=self._seq - self.last_result_seq,
+                    inference_ms=self.last_latency_ms, worker_alive=bool(proc and proc.is_alive()),
+                    restarting=self._restarting())
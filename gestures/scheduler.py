@@ -0,0 +1,164 @@
+"""
+scheduler.py
+Adaptive inference-rate scheduler around GestureDetector.
+Exports InferenceScheduler with the same process(frame) -> (frame, action, hud) API.
+
+Each frame is either inferred (full detector.process), reused (the last landmarks are
+extrapolated and drawn, no action fires) or skipped. The fraction of inferred frames
+(duty cycle) is derived from a per-frame latency budget and the measured inference cost,
+lowered while no hand is in view and raised to every frame while a hand is moving.
+"""
+
+import time
+import logging
+from collections import deque
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger("aura.scheduler")
+
+INFER, REUSE, SKIP = "infer", "reuse", "skip"
+
+# MediaPipe hand topology, used to draw extrapolated landmarks without mediapipe
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4), (0, 5), (5, 6), (6, 7), (7, 8), (5, 9), (9, 10), (10, 11),
+    (11, 12), (9, 13), (13, 14), (14, 15), (15, 16), (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+
+def draw_hand_points(img, pts) -> None:
+    """Draw (hands, 21, 2) pixel landmarks as a simple skeleton."""
+    for hand in np.asarray(pts, dtype=np.int32):
+        for a, b in HAND_CONNECTIONS:
+            cv2.line(img, (int(hand[a][0]), int(hand[a][1])), (int(hand[b][0]), int(hand[b][1])),
+                     (0, 180, 255), 1)
+        for x, y in hand:
+            cv2.circle(img, (int(x), int(y)), 3, (0, 120, 255), -1)
+
+
+class InferenceScheduler:
+    """
+    Decides per frame whether to run detector.process, reuse the previous result or skip.
+    budget_ms: target average detection cost per frame.
+    idle_duty: duty cycle cap while no hand has been seen for hand_timeout seconds.
+    motion_thresh: mean landmark displacement per frame (fraction of frame diagonal) counted as moving.
+    max_reuse: frames the last landmarks may be extrapolated before they are dropped.
+    """
+
+    def __init__(self, detector, budget_ms: float = 15.0, min_duty: float = 0.1, idle_duty: float = 0.34,
+                 motion_thresh: float = 0.004, hand_timeout: float = 1.0, max_reuse: int = 4,
+                 window: int = 60):
+        self.detector = detector
+        self.budget_ms = float(budget_ms)
+        self.min_duty = float(min_duty)
+        self.idle_duty = float(idle_duty)
+        self.motion_thresh = float(motion_thresh)
+        self.hand_timeout = float(hand_timeout)
+        self.max_reuse = int(max_reuse)
+
+        self._cost_ms = 0.0  # EMA of inference cost
+        self._credit = 1.0  # inference runs whenever credit reaches 1
+        self._duty = 1.0
+        self._last_hand_time = 0.0
+        self._pts = None  # last inferred landmarks (float, hands x 21 x 2)
+        self._vel = None  # per-frame landmark velocity
+        self._since_infer = 0
+        self._moving = False
+        self._history = deque(maxlen=window)  # (timestamp, decision)
+        self.counts = {INFER: 0, REUSE: 0, SKIP: 0}
+        self.last_events = []  # detector's (hand_id, gesture) events when this frame was inferred
+
+    @property
+    def draw(self) -> bool:
+        return getattr(self.detector, "draw", True)
+
+    @draw.setter
+    def draw(self, value: bool) -> None:
+        # one switch for inferred and extrapolated frames alike
+        self.detector.draw = bool(value)
+
+    def _target_duty(self) -> float:
+        budget_duty = 1.0 if self._cost_ms <= 0 else self.budget_ms / self._cost_ms
+        duty = min(1.0, max(self.min_duty, budget_duty))
+        if self._moving:
+            return 1.0
+        if time.time() - self._last_hand_time > self.hand_timeout:
+            return min(duty, max(self.min_duty, self.idle_duty))
+        return duty
+
+    def _decide(self) -> str:
+        self._duty = self._target_duty()
+        self._credit = min(1.0, self._credit + self._duty)
+        if self._credit >= 1.0:
+            self._credit -= 1.0
+            return INFER
+        if self._pts is not None and self._since_infer < self.max_reuse:
+            return REUSE
+        return SKIP
+
+    def _observe(self, pts, frames_between: int, diag: float) -> None:
+        """Update presence, velocity and motion state from a fresh inference."""
+        if pts is None or len(pts) == 0:
+            self._pts, self._vel, self._moving = None, None, False
+            return
+        pts = pts.astype(np.float32)
+        self._last_hand_time = time.time()
+        if self._pts is not None and self._pts.shape == pts.shape and frames_between > 0:
+            self._vel = (pts - self._pts) / frames_between
+            speed = float(np.linalg.norm(self._vel, axis=-1).mean()) / diag
+            self._moving = speed > self.motion_thresh
+        else:
+            self._vel = None
+            self._moving = False
+        self._pts = pts
+
+    def process(self, frame, ctx=None):
+        """Same contract as GestureDetector.process; the hud gains a "sched" entry."""
+        decision = self._decide() if frame is not None else SKIP
+        self.counts[decision] += 1
+        self._history.append((time.perf_counter(), decision))
+        self._since_infer += 1
+        action = None
+        self.last_events = []
+
+        if decision == INFER:
+            frames_between = self._since_infer
+            t0 = time.perf_counter()
+            frame, action, hud = self.detector.process(frame, ctx)
+            self.last_events = getattr(self.detector, "last_events", [])
+            cost = (time.perf_counter() - t0) * 1000.0
+            self._cost_ms = cost if self._cost_ms <= 0 else 0.8 * self._cost_ms + 0.2 * cost
+            h, w = frame.shape[:2]
+            self._observe(getattr(self.detector, "last_landmarks", None), frames_between, float(np.hypot(w, h)))
+            self._since_infer = 0
+        else:
+            hud = dict(self.detector.hud)
+            hud["time"] = time.strftime("%H:%M:%S")
+            if decision == REUSE and self.draw:
+                pts = self._pts
+                if self._vel is not None:
+                    pts = pts + self._vel * self._since_infer
+                try:
+                    draw_hand_points(frame, pts)
+                except Exception:
+                    # drawing is non-critical
+                    pass
+
+        stats = self.stats()
+        hud["sched"] = f"DET {stats['detection_rate']:.0f}/s duty {stats['duty_cycle']:.0%}"
+        return frame, action, hud
+
+    def stats(self) -> dict:
+        """Measured duty cycle and detection rate over the recent window, plus totals."""
+        hist = self._history
+        inferred = sum(1 for _, d in hist if d == INFER)
+        span = hist[-1][0] - hist[0][0] if len(hist) > 1 else 0.0
+        return {
+            "duty_cycle": inferred / len(hist) if hist else 0.0,
+            "target_duty": self._duty,
+            "detection_rate": inferred / span if span > 0 else 0.0,
+            "inference_ms": self._cost_ms,
+            "moving": self._moving,
+            "counts": dict(self.counts),
+        }
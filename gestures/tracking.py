@@ -0,0 +1,84 @@
+"""
+tracking.py
+Stable per-source hand IDs.
+HandTracker matches the hands of each frame to the hands of the previous frames by
+palm centre, normalised by palm size, so a hand keeps its ID while it moves and
+while it briefly disappears (up to max_missed frames). IDs are small integers that
+are never reused within one tracker.
+"""
+
+import numpy as np
+
+# wrist and the four finger MCP joints: a stable palm centre even while fingers move
+PALM = (0, 5, 9, 13, 17)
+
+
+def palm_centres(pts: np.ndarray):
+    """(hands, 21, 2) landmarks -> (hands, 2) palm centres and (hands,) palm sizes (wrist to middle MCP)."""
+    p = pts.astype(np.float32)
+    centres = p[:, PALM, :].mean(axis=1)
+    sizes = np.linalg.norm(p[:, 9, :] - p[:, 0, :], axis=1)
+    return centres, np.maximum(sizes, 1.0)
+
+
+class HandTracker:
+    """
+    update(pts) -> (hands,) int32 IDs aligned with pts.
+    max_jump: largest per-frame movement, in palm sizes, still treated as the same hand.
+    """
+
+    def __init__(self, max_jump: float = 1.5, max_missed: int = 5):
+        self.max_jump = float(max_jump)
+        self.max_missed = int(max_missed)
+        self._next_id = 1
+        # id -> [centre (2,), size, missed frames]
+        self._tracks = {}
+        # palm centres and sizes of the last update's hands, for callers that need them too
+        self.last_centres = np.zeros((0, 2), dtype=np.float32)
+        self.last_sizes = np.zeros(0, dtype=np.float32)
+
+    @property
+    def active_ids(self):
+        return list(self._tracks)
+
+    def reset(self) -> None:
+        self._tracks.clear()
+
+    def update(self, pts: np.ndarray) -> np.ndarray:
+        n = pts.shape[0]
+        ids = np.zeros(n, dtype=np.int32)
+        if n:
+            centres, sizes = palm_centres(pts)
+            self.last_centres, self.last_sizes = centres, sizes
+        else:
+            self.last_centres, self.last_sizes = self.last_centres[:0], self.last_sizes[:0]
+        track_ids = list(self._tracks)
+        if n and track_ids:
+            prev = np.array([self._tracks[t][0] for t in track_ids], dtype=np.float32)
+            prev_size = np.array([self._tracks[t][1] for t in track_ids], dtype=np.float32)
+            # (hands, tracks) distance in palm sizes; greedy assignment is exact enough for a few hands
+            dist = np.linalg.norm(centres[:, None, :] - prev[None, :, :], axis=2)
+            dist /= np.maximum(sizes[:, None], prev_size[None, :])
+            used_h, used_t = set(), set()
+            for flat in np.argsort(dist, axis=None):
+                h, t = divmod(int(flat), len(track_ids))
+                if dist[h, t] > self.max_jump:
+                    break
+                if h in used_h or t in used_t:
+                    continue
+                used_h.add(h)
+                used_t.add(t)
+                ids[h] = track_ids[t]
+        seen = set()
+        for h in range(n):
+            if not ids[h]:
+                ids[h] = self._next_id
+                self._next_id += 1
+            self._tracks[int(ids[h])] = [centres[h], float(sizes[h]), 0]
+            seen.add(int(ids[h]))
+        for t in track_ids:
+            if t not in seen:
+                self._tracks[t][2] += 1
+                if self._tracks[t][2] > self.max_missed:
+                    del self._tracks[t]
+        return ids
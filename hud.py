@@ -0,0 +1,181 @@
+"""
+hud.py
+Cached HUD compositing.
+Overlay elements (text lines, the volume bar) are pre-rendered into a persistent
+layer the size of the frame. An element is re-rendered only when its value changes,
+and the whole layer is blended onto each frame with a single masked copy.
+Elements are rendered onto both a black and a white layer, which yields their exact
+alpha; the few partially covered (anti-aliased) edge pixels are blended separately.
+"""
+
+import logging
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger("aura.hud")
+
+
+class TextElement:
+    """One line of text. y < 0 anchors the baseline to the bottom edge (y pixels above it)."""
+
+    def __init__(self, x: int, y: int, scale: float, color, thickness: int = 1,
+                 font=cv2.FONT_HERSHEY_SIMPLEX):
+        self.x, self.y = x, y
+        self.scale, self.color, self.thickness, self.font = scale, color, thickness, font
+
+    def render(self, layer, value):
+        """Draw value onto layer; returns the (x0, y0, x1, y1) rect it may have touched."""
+        if not value:
+            return None
+        h = layer.shape[0]
+        y = self.y if self.y >= 0 else h + self.y
+        text = str(value)
+        (tw, th), base = cv2.getTextSize(text, self.font, self.scale, self.thickness)
+        cv2.putText(layer, text, (self.x, y), self.font, self.scale, self.color, self.thickness)
+        pad = self.thickness + 1
+        return self.x - pad, y - th - pad, self.x + tw + pad, y + base + pad
+
+
+class VolumeBarElement:
+    """Volume level bar in the top-right corner; value is the level in percent (int)."""
+
+    def __init__(self, bar_w: int = 200, bar_h: int = 12, margin: int = 20):
+        self.bar_w, self.bar_h, self.margin = bar_w, bar_h, margin
+
+    def render(self, layer, value):
+        if value is None:
+            return None
+        w = layer.shape[1]
+        x, y = w - self.bar_w - self.margin, self.margin
+        draw_volume_bar(layer, value / 100.0, self.bar_w, self.bar_h, self.margin)
+        return x - 1, y - 1, x + self.bar_w + 2, y + self.bar_h + 26
+
+
+def draw_volume_bar(frame, volume_level, bar_w: int = 200, bar_h: int = 12, margin: int = 20):
+    """Display volume level bar on screen."""
+    h, w = frame.shape[:2]
+    x, y = w - bar_w - margin, margin
+
+    cv2.rectangle(frame, (x, y), (x + bar_w, y + bar_h), (200, 200, 200), 1)
+    fill = int(bar_w * volume_level)
+    cv2.rectangle(frame, (x, y), (x + fill, y + bar_h), (0, 200, 100), -1)
+    cv2.putText(frame, f"VOL {int(volume_level * 100)}%", (x, y + bar_h + 18),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+
+
+class HudRenderer:
+    """
+    add(name, element) registers an element, set(name, value) updates it,
+    compose(frame) re-renders changed elements and blends the layer onto frame in place.
+    """
+
+    def __init__(self):
+        self._elements = {}
+        self._values = {}
+        self._rects = {}
+        self._dirty = set()
+        self._layer = None  # element pixels over black (premultiplied colour)
+        self._white = None  # the same elements over white, used to recover alpha
+        self._alpha = None
+        self._mask = None  # fully opaque pixels, copied in one cv2.copyTo
+        self._edge = None  # (ys, xs, inverse alpha, premultiplied colour) of partially covered pixels
+        self.renders = 0
+
+    def add(self, name: str, element) -> None:
+        self._elements[name] = element
+        self._values[name] = None
+        self._rects[name] = None
+        self._dirty.add(name)
+
+    def below(self, gap: int = 24):
+        """(x, y) of a baseline just under the lowest top-anchored text line, for panels drawn under the HUD."""
+        tops = [e for e in self._elements.values() if isinstance(e, TextElement) and e.y >= 0]
+        if not tops:
+            return 20, gap
+        return min(e.x for e in tops), max(e.y for e in tops) + gap
+
+    def set(self, name: str, value) -> None:
+        if self._values.get(name) != value:
+            self._values[name] = value
+            self._dirty.add(name)
+
+    def _clip(self, rect):
+        h, w = self._layer.shape[:2]
+        x0, y0, x1, y1 = rect
+        return max(0, x0), max(0, y0), min(w, x1), min(h, y1)
+
+    @staticmethod
+    def _overlaps(a, b) -> bool:
+        return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+    def _clear(self, name: str) -> None:
+        x0, y0, x1, y1 = self._rects[name]
+        self._layer[y0:y1, x0:x1] = 0
+        self._white[y0:y1, x0:x1] = 255
+        self._alpha[y0:y1, x0:x1] = 0
+        self._mask[y0:y1, x0:x1] = 0
+        self._rects[name] = None
+
+    def _render_dirty(self) -> None:
+        cleared = []
+        for name in self._dirty:
+            if self._rects[name] is not None:
+                cleared.append(self._rects[name])
+                self._clear(name)
+        # clearing may have erased parts of overlapping neighbours; redraw those too
+        for name, rect in self._rects.items():
+            if rect is not None and any(self._overlaps(rect, c) for c in cleared):
+                self._dirty.add(name)
+                self._clear(name)
+        # render in registration order so overlapping elements stack like direct drawing would
+        for name in [n for n in self._elements if n in self._dirty]:
+            element, value = self._elements[name], self._values[name]
+            try:
+                rect = element.render(self._layer, value)
+                element.render(self._white, value)
+            except Exception as e:
+                logger.exception("HUD element %s failed: %s", name, e)
+                rect = None
+            if rect is None:
+                continue
+            x0, y0, x1, y1 = rect = self._clip(rect)
+            if x1 > x0 and y1 > y0:
+                spread = np.max(self._white[y0:y1, x0:x1].astype(np.int16) - self._layer[y0:y1, x0:x1], axis=2)
+                alpha = self._alpha[y0:y1, x0:x1]
+                alpha[:] = 255 - np.clip(spread, 0, 255).astype(np.uint8)
+                self._mask[y0:y1, x0:x1] = np.where(alpha == 255, np.uint8(255), np.uint8(0))
+                self._rects[name] = rect
+            self.renders += 1
+        self._dirty.clear()
+
+        # partially covered pixels, gathered from the live element rects only
+        w = self._alpha.shape[1]
+        parts = [np.zeros(0, dtype=np.intp)]
+        for rect in self._rects.values():
+            if rect is None:
+                continue
+            x0, y0, x1, y1 = rect
+            alpha = self._alpha[y0:y1, x0:x1]
+            ys, xs = np.nonzero((alpha > 0) & (alpha < 255))
+            parts.append((ys + y0) * w + (xs + x0))
+        ys, xs = np.divmod(np.unique(np.concatenate(parts)), w)
+        inv = (255 - self._alpha[ys, xs]).astype(np.uint16)[:, None]
+        self._edge = (ys, xs, inv, self._layer[ys, xs].astype(np.uint16))
+
+    def compose(self, frame):
+        """Blend the cached layer onto frame (in place) and return it."""
+        if self._layer is None or self._layer.shape != frame.shape:
+            self._layer = np.zeros_like(frame)
+            self._white = np.full_like(frame, 255)
+            self._alpha = np.zeros(frame.shape[:2], dtype=np.uint8)
+            self._mask = np.zeros(frame.shape[:2], dtype=np.uint8)
+            self._rects = {name: None for name in self._elements}
+            self._dirty = set(self._elements)
+        if self._dirty:
+            self._render_dirty()
+        cv2.copyTo(self._layer, self._mask, frame)
+        ys, xs, inv, color = self._edge
+        if len(ys):
+            frame[ys, xs] = ((frame[ys, xs] * inv + 127) // 255 + color).astype(np.uint8)
+        return frame
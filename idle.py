@@ -0,0 +1,145 @@
+"""
+idle.py
+Idle power saving for the single-camera loop.
+IdleController watches whether hands are in view. After `idle_after` seconds without
+a hand it goes to sleep: the caller drops the capture to a low-rate, low-resolution
+profile and stops running the hand and object detectors. While asleep, only
+MotionDetector runs. It diffs a small grayscale pyramid level of consecutive frames,
+which costs about 0.1 ms per 640x480 frame. The first frame with enough
+changed pixels wakes the controller. Full-rate detection resumes on the first frame
+captured at the full profile, and the wake latency is measured from the motion frame's
+capture to that frame being processed. Process CPU time and wall time are accumulated per state, so the
+average CPU load while awake and while idle can be compared.
+"""
+
+import time
+import logging
+from typing import Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger("aura.idle")
+
+AWAKE, IDLE = "awake", "idle"
+
+
+class MotionDetector:
+    """
+    moved(ctx) -> bool for successive FrameContexts (or BGR images).
+    level: pyramid level diffed (3 = 1/8 size); threshold: per-pixel gray difference counted as change;
+    min_fraction: fraction of changed pixels that counts as motion.
+    """
+
+    def __init__(self, level: int = 3, threshold: int = 18, min_fraction: float = 0.01):
+        self.level = int(level)
+        self.threshold = int(threshold)
+        self.min_fraction = float(min_fraction)
+        self.score = 0.0  # changed-pixel fraction of the last comparison
+        self._prev = None
+
+    def _small(self, frame):
+        if hasattr(frame, "pyramid"):
+            small = frame.pyramid(self.level, gray=True)
+        else:
+            small = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            for _ in range(self.level):
+                small = cv2.pyrDown(small)
+        return cv2.GaussianBlur(small, (3, 3), 0)
+
+    def moved(self, frame) -> bool:
+        small = self._small(frame)
+        prev, self._prev = self._prev, small
+        if prev is None or prev.shape != small.shape:
+            # first frame, or the capture resolution just changed: nothing to compare yet
+            self.score = 0.0
+            return False
+        diff = cv2.absdiff(small, prev)
+        self.score = np.count_nonzero(diff > self.threshold) / diff.size
+        return self.score >= self.min_fraction
+
+    def reset(self) -> None:
+        self._prev = None
+        self.score = 0.0
+
+
+class IdleController:
+    """
+    observe(hands_in_view, now) while awake -> True when it just went idle;
+    check(frame, captured_at) while idle -> True when motion woke it;
+    full_rate(now) once the first full-profile frame is processed after a wake; stats().
+    """
+
+    def __init__(self, idle_after: float = 10.0, motion: Optional[MotionDetector] = None):
+        self.idle_after = float(idle_after)
+        self.motion = motion or MotionDetector()
+        self.state = AWAKE
+        self.last_hand = time.perf_counter()
+        self.sleeps = 0
+        self.wakes = 0
+        self.wake_latencies = []  # seconds, motion frame captured -> first full-profile frame processed
+        self._woke_at = None  # capture time of the frame that woke us, until full rate is back
+        self._cpu = {AWAKE: 0.0, IDLE: 0.0}
+        self._wall = {AWAKE: 0.0, IDLE: 0.0}
+        self._since = (time.perf_counter(), time.process_time())
+
+    @property
+    def asleep(self) -> bool:
+        return self.state == IDLE
+
+    @property
+    def waking(self) -> bool:
+        """Woken by motion, but not yet processing frames at the full capture profile."""
+        return self._woke_at is not None
+
+    def _switch(self, state: str) -> None:
+        wall, cpu = time.perf_counter(), time.process_time()
+        self._wall[self.state] += wall - self._since[0]
+        self._cpu[self.state] += cpu - self._since[1]
+        self._since = (wall, cpu)
+        self.state = state
+
+    def observe(self, hands_in_view: bool, now: Optional[float] = None) -> bool:
+        now = time.perf_counter() if now is None else now
+        if hands_in_view:
+            self.last_hand = now
+            return False
+        if self.state == AWAKE and self.idle_after > 0 and now - self.last_hand >= self.idle_after:
+            self._switch(IDLE)
+            self.sleeps += 1
+            self._woke_at = None
+            self.motion.reset()
+            logger.info("No hand for %.0f s; idle until motion", now - self.last_hand)
+            return True
+        return False
+
+    def check(self, frame, captured_at: float) -> bool:
+        if not self.motion.moved(frame):
+            return False
+        self._switch(AWAKE)
+        self.wakes += 1
+        self.last_hand = time.perf_counter()  # a full idle_after period to find the hand
+        self._woke_at = captured_at
+        logger.info("Motion (%.1f%% of pixels); resuming full-rate detection", self.motion.score * 100)
+        return True
+
+    def full_rate(self, now: Optional[float] = None) -> None:
+        if self._woke_at is not None:
+            now = time.perf_counter() if now is None else now
+            self.wake_latencies.append(now - self._woke_at)
+            self._woke_at = None
+
+    def stats(self) -> dict:
+        wall = dict(self._wall)
+        cpu = dict(self._cpu)
+        now_wall, now_cpu = time.perf_counter(), time.process_time()
+        wall[self.state] += now_wall - self._since[0]
+        cpu[self.state] += now_cpu - self._since[1]
+        lat = self.wake_latencies
+        return {"state": self.state, "sleeps": self.sleeps, "wakes": self.wakes,
+                "awake_s": wall[AWAKE], "idle_s": wall[IDLE],
+                # process CPU time per wall second; 1.0 = one core busy
+                "awake_cpu": cpu[AWAKE] / wall[AWAKE] if wall[AWAKE] > 0 else 0.0,
+                "idle_cpu": cpu[IDLE] / wall[IDLE] if wall[IDLE] > 0 else 0.0,
+                "wake_latency_ms": 1000.0 * sum(lat) / len(lat) if lat else 0.0,
+                "wake_latency_max_ms": 1000.0 * max(lat) if lat else 0.0}
@@ -0,0 +1,286 @@
+"""
+intents.py
+Declarative voice-intent registry and bounded dispatcher.
+Each Intent lists trigger keywords (whole words or phrases) and an optional slot pattern.
+IntentRouter compiles all keywords once into an index keyed by their first word, so
+routing an utterance costs one dict lookup per word regardless of how many intents
+exist, plus one precompiled slot match for the winner. When several intents are
+triggered the one registered first wins.
+IntentDispatcher runs handlers on a fixed-size worker pool (its own, or one it is lent,
+such as the event bus executor) with per-intent concurrency limits; excess requests
+for a busy intent wait in that intent's backlog.
+"""
+
+import re
+import string
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import utils as u
+
+logger = logging.getLogger("aura.intents")
+
+# punctuation -> space, so "screenshot." and "time?" still hit their keywords
+_PUNCT = str.maketrans({c: " " for c in string.punctuation if c != "'"})
+
+
+class Intent:
+    """
+    name: unique id; keywords: words or phrases that trigger it; pattern: optional regex whose
+    named groups become slots (if it does not match, the intent's on_fail message is spoken);
+    max_concurrency: handlers of this intent allowed to run at once.
+    """
+
+    def __init__(self, name: str, keywords, handler: Callable, pattern: Optional[str] = None,
+                 max_concurrency: int = 1, on_fail: Optional[str] = None):
+        self.name = name
+        self.keywords = tuple(keywords)
+        self.handler = handler
+        self.pattern = re.compile(pattern) if pattern else None
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.on_fail = on_fail
+
+
+class IntentMatch:
+    __slots__ = ("intent", "text", "slots")
+
+    def __init__(self, intent: Optional[Intent], text: str, slots: Dict[str, str]):
+        self.intent = intent
+        self.text = text
+        self.slots = slots
+
+    @property
+    def name(self) -> str:
+        return self.intent.name if self.intent else "fallback"
+
+
+class IntentRouter:
+    """register(intent) adds intents in priority order; route(text) -> IntentMatch."""
+
+    def __init__(self, fallback: Optional[Callable] = None):
+        self._intents: List[Intent] = []
+        # first word -> [(keyword words, intent rank)], best rank first
+        self._index: Dict[str, List[Tuple[Tuple[str, ...], int]]] = {}
+        self._compiled = False
+        self.fallback = fallback
+
+    def register(self, intent: Intent) -> Intent:
+        self._intents.append(intent)
+        self._compiled = False
+        return intent
+
+    def intent(self, name: str, keywords, pattern: Optional[str] = None, **kwargs):
+        """Decorator form of register()."""
+        def _wrap(fn):
+            self.register(Intent(name, keywords, fn, pattern, **kwargs))
+            return fn
+        return _wrap
+
+    @property
+    def intents(self) -> List[Intent]:
+        return list(self._intents)
+
+    def compile(self) -> None:
+        """Build the keyword index; called lazily on first route after a change."""
+        index: Dict[str, List[Tuple[Tuple[str, ...], int]]] = {}
+        for rank, intent in enumerate(self._intents):
+            for kw in intent.keywords:
+                words = tuple(kw.lower().translate(_PUNCT).split())
+                if words:
+                    index.setdefault(words[0], []).append((words, rank))
+        for entries in index.values():
+            entries.sort(key=lambda e: e[1])
+        self._index = index
+        self._compiled = True
+
+    def route(self, text: str) -> IntentMatch:
+        txt = (text or "").lower().strip()
+        if not self._compiled:
+            self.compile()
+        index = self._index
+        words = txt.translate(_PUNCT).split()
+        best_rank = len(self._intents)
+        for i, w in enumerate(words):
+            entries = index.get(w)
+            if entries is None:
+                continue
+            for kw, rank in entries:
+                if rank >= best_rank:
+                    break
+                if len(kw) == 1 or tuple(words[i:i + len(kw)]) == kw:
+                    best_rank = rank
+                    break
+        best = self._intents[best_rank] if best_rank < len(self._intents) else None
+        if best is None:
+            return IntentMatch(None, txt, {})
+        slots = {}
+        if best.pattern is not None:
+            m = best.pattern.search(txt)
+            if m is None:
+                return IntentMatch(best, txt, None)
+            slots = {k: v for k, v in m.groupdict().items() if v is not None}
+        return IntentMatch(best, txt, slots)
+
+    def execute(self, match: IntentMatch, app_state) -> None:
+        """Run the handler for a routed match on the calling thread."""
+        if not match.text:
+            return
+        if match.intent is None:
+            if self.fallback is not None:
+                self.fallback(match, app_state)
+            return
+        if match.slots is None:
+            if match.intent.on_fail:
+                u.speak(match.intent.on_fail)
+            return
+        match.intent.handler(match, app_state)
+
+
+class IntentDispatcher:
+    """
+    Routes utterances and runs their handlers on `workers` threads, honouring per-intent limits.
+    With `executor` the handlers share that pool instead, and shutdown() leaves it running.
+    After shutdown(), or once a shared pool has been shut down, queued and new matches are dropped.
+    """
+
+    def __init__(self, router: IntentRouter, app_state, workers: int = 4, executor=None):
+        self.router = router
+        self.app_state = app_state
+        self._owns_pool = executor is None
+        self._pool = executor or ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="intent")
+        self._lock = threading.Lock()
+        self._running: Dict[str, int] = {}
+        self._backlog: Dict[str, deque] = {}
+        self._closed = False
+        self.dispatched = 0
+        self.dropped = 0
+
+    def dispatch(self, text: str) -> IntentMatch:
+        """Route text and schedule its handler. Never blocks on the handler."""
+        match = self.router.route(text)
+        key = match.name
+        limit = match.intent.max_concurrency if match.intent else 1
+        with self._lock:
+            self.dispatched += 1
+            if self._closed:
+                self.dropped += 1
+            elif self._running.get(key, 0) < limit:
+                self._running[key] = self._running.get(key, 0) + 1
+                if not self._submit(match):
+                    self._running[key] -= 1
+            else:
+                self._backlog.setdefault(key, deque()).append(match)
+        return match
+
+    def _submit(self, match: IntentMatch) -> bool:
+        """Hand match to the pool (lock held). False, dropping every queued match, once the pool is shut down."""
+        try:
+            self._pool.submit(self._run, match)
+            return True
+        except RuntimeError:
+            self._closed = True
+            self.dropped += 1 + sum(len(b) for b in self._backlog.values())
+            self._backlog.clear()
+            logger.info("Intent pool is shut down; dropped %s", match.name)
+            return False
+
+    def _run(self, match: IntentMatch) -> None:
+        try:
+            self.router.execute(match, self.app_state)
+        except Exception as e:
+            logger.exception("Intent %s failed: %s", match.name, e)
+        finally:
+            key = match.name
+            with self._lock:
+                backlog = self._backlog.get(key)
+                if not (backlog and self._submit(backlog.popleft())):
+                    self._running[key] -= 1
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(len(b) for b in self._backlog.values())
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Drop queued matches and stop accepting new ones; running handlers finish (waited for if `wait`)."""
+        with self._lock:
+            self._closed = True
+            self.dropped += sum(len(b) for b in self._backlog.values())
+            self._backlog.clear()
+        if self._owns_pool:
+            self._pool.shutdown(wait=wait)
+
+
+# ----------------- AURA intents -----------------
+_UNIT_SECONDS = {"second": 1, "minute": 60, "hour": 3600}
+
+
+def _open(match, app_state):
+    name = match.text.split("open", 1)[1].strip()
+    if name:
+        u.open_app(name)
+
+
+def _screenshot(match, app_state):
+    shoot = app_state.get("take_screenshot")
+    if shoot is not None:
+        shoot(app_state)
+
+
+def _mode(active: bool):
+    def handler(match, app_state):
+        set_mode = app_state.get("set_mode")
+        if set_mode is not None:
+            set_mode(app_state, active)
+    return handler
+
+
+def _remind(match, app_state):
+    s = match.slots
+    sec = int(s["num"]) * _UNIT_SECONDS[s["unit"]]
+    every = int(s["every_num"]) * _UNIT_SECONDS[s["every_unit"]] if s.get("every_num") else None
+    u.set_reminder(sec, s["msg"], every=every)
+
+
+def _list_reminders(match, app_state):
+    pending = u.get_reminder_scheduler().list()
+    if not pending:
+        u.speak("You have no reminders.")
+        return
+    first = ", ".join(r.text for r in pending[:3])
+    u.speak(f"You have {len(pending)} reminders. Next: {first}")
+
+
+def _cancel_reminders(match, app_state):
+    n = u.get_reminder_scheduler().clear()
+    u.speak(f"Cancelled {n} reminders.")
+
+
+def _heard(match, app_state):
+    u.speak(f"I heard {match.text}")
+
+
+def default_router() -> IntentRouter:
+    """AURA's voice intents, in priority order."""
+    r = IntentRouter(fallback=_heard)
+    r.register(Intent("cancel_reminders", ("cancel reminders", "cancel all reminders", "clear reminders"),
+                      _cancel_reminders))
+    r.register(Intent("list_reminders", ("list reminders", "my reminders", "what reminders"), _list_reminders))
+    r.register(Intent("remind", ("remind me",), _remind,
+                      pattern=r"remind me in (?P<num>\d+)\s*(?P<unit>second|minute|hour)s?"
+                              r"(?:\s*and every (?P<every_num>\d+)\s*(?P<every_unit>second|minute|hour)s?)?"
+                              r"\s*to (?P<msg>.+)",
+                      max_concurrency=2, on_fail="Sorry, I couldn't set that reminder correctly."))
+    r.register(Intent("open", ("open",), _open, max_concurrency=2))
+    r.register(Intent("active_mode", ("active mode", "activate"), _mode(True)))
+    r.register(Intent("passive_mode", ("passive mode", "deactivate"), _mode(False)))
+    r.register(Intent("screenshot", ("screenshot", "screenshots", "screen shot"), _screenshot))
+    r.register(Intent("time", ("time",), lambda m, s: u.speak(f"The time is {u.get_time_str()}", key="time", ttl=10.0)))
+    r.register(Intent("status", ("status", "system"), lambda m, s: u.speak(u.get_system_status())))
+    r.register(Intent("quote", ("quote", "motivate", "motivation", "motivational"),
+                      lambda m, s: u.speak(u.get_quote())))
+    r.register(Intent("volume_up", ("volume up",), lambda m, s: s["actuator"].volume(0.10), max_concurrency=4))
+    r.register(Intent("volume_down", ("volume down",), lambda m, s: s["actuator"].volume(-0.10), max_concurrency=4))
+    return r
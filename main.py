@@ -1,168 +1,632 @@
+import startup  # first import: its load time is the zero of the startup report
+import os
 import cv2
 import time
-import queue
+import signal
+import argparse
 import threading
 
+import metrics
+import framectx
+from framectx import FrameContext
+from actuator import Actuator
+from screenshots import FrameRing, CODECS
+from intents import IntentDispatcher, default_router
+from multisource import MODES, GestureEvent, MultiSourceRunner, tile
+from events import ActionResult, EventBus, ReminderDue, Speak, VoiceCommand
+from tts import LOW
+from capture import CaptureThread, CameraSource, BACKENDS, open_source
+from idle import IdleController
+from hud import HudRenderer, TextElement, VolumeBarElement
 from gestures.detector import GestureDetector
+from gestures.scheduler import InferenceScheduler
+from gestures.remote import RemoteDetector
+from gestures.recording import LandmarkRecorder
+from gestures.engine import load_table
+from vision.yolo_detector import ObjectDetector, ObjectDetectionWorker, ObjectEvent, draw_detections
 import utils as u
 
+# a held open palm re-fires every detector cooldown (1 s); it toggles the mode again only after a release
+PALM_REARM_S = 1.5
 
-def voice_worker(cmd_queue):
-    """Continuously listen for voice commands and enqueue them."""
-    u.start_voice_listener(cmd_queue)
 
-
-def handle_voice_command(cmd_text, app_state):
-    """Interpret and execute recognized voice commands."""
-    txt = cmd_text.lower().strip()
-    print("[Voice]", txt)
-
-    if not txt:
+def take_screenshot(app_state, frame=None) -> None:
+    """Save the given (or last displayed) frame, or a pre-roll burst from the frame ring when enabled."""
+    burst = app_state.get("burst", 0)
+    if burst > 0:
+        frames = app_state["ring"].last(burst)
+        if frames:
+            u.get_screenshot_writer().save_burst(frames)
         return
+    frame = app_state.get("last_frame") if frame is None else frame
+    if frame is not None:
+        u.save_frame_screenshot(frame)
 
-    if "open" in txt:
-        name = txt.split("open", 1)[1].strip()
-        if name:
-            u.open_app(name)
-
-    elif "screenshot" in txt:
-        frame = app_state.get("last_frame")
-        if frame is not None:
-            u.save_frame_screenshot(frame)
-
-    elif "time" in txt:
-        u.speak(f"The time is {u.get_time_str()}")
-
-    elif "status" in txt or "system" in txt:
-        u.speak(u.get_system_status())
-
-    elif "quote" in txt or "motivate" in txt:
-        u.speak(u.get_quote())
-
-    elif "volume up" in txt:
-        app_state["vol"].change(0.10)
-
-    elif "volume down" in txt:
-        app_state["vol"].change(-0.10)
 
-    elif "remind me" in txt:
-        import re
-        match = re.search(r'remind me in (\d+)\s*(second|minute|hour)s?\s*to (.+)', txt)
-        if match:
-            num, unit, msg = int(match.group(1)), match.group(2), match.group(3)
-            sec = num * (60 if "minute" in unit else (3600 if "hour" in unit else 1))
-            u.set_reminder(sec, msg)
+def handle_voice_command(cmd_text, app_state):
+    """Interpret and execute recognized voice commands (synchronously, on the calling thread)."""
+    router = app_state.get("router") or default_router()
+    match = router.route(cmd_text)
+    print("[Voice]", match.text)
+    router.execute(match, app_state)
+
+
+def build_object_worker(args, on_event=None):
+    """Object detection for active mode (started on first use), or None when no usable model is configured."""
+    if args.yolo_rate <= 0 or not args.yolo_model:
+        return None
+    if not os.path.isfile(args.yolo_model) or os.path.getsize(args.yolo_model) == 0:
+        print(f"[INFO] No object detection model at {args.yolo_model}; active mode runs gestures only.")
+        return None
+
+    def factory():
+        return ObjectDetector(args.yolo_model, runtime=args.yolo_runtime, input_size=args.yolo_size,
+                              conf=args.yolo_conf, threads=args.yolo_threads)
+    return ObjectDetectionWorker(factory, rate_hz=args.yolo_rate, on_event=on_event).start()
+
+
+def set_mode(app_state, active: bool) -> None:
+    """Passive: gestures only. Active: gestures plus object detection (built the first time it is needed)."""
+    if active and "make_objects" in app_state:
+        app_state["objects"] = app_state.pop("make_objects")()
+    objects = app_state.get("objects")
+    if objects is not None:
+        objects.set_active(active)
+    app_state["active"] = active
+    print(f"[AURA] {'Active' if active else 'Passive'} mode")
+    u.speak("Active mode" if active else "Passive mode", key="mode")
+
+
+def on_open_palm(app_state) -> bool:
+    """Toggle the mode on a fresh open palm; returns True if it toggled."""
+    now = time.time()
+    fresh = now - app_state.get("palm_time", 0.0) > PALM_REARM_S
+    app_state["palm_time"] = now
+    if fresh:
+        set_mode(app_state, not app_state["active"])
+    return fresh
+
+
+def build_event_bus(args, app_state):
+    """
+    Start the event bus and subscribe AURA's handlers; returns (bus, intent dispatcher or None).
+    Handlers run on the bus loop, the only writer of app_state apart from the frame loop's last_frame;
+    other threads publish events, and intents change the mode through bus.call_soon.
+    Voice handlers and blocking handlers share the bus executor (--intent-workers threads).
+    """
+    bus = EventBus(workers=args.intent_workers, max_pending=args.event_backlog).start()
+    actuator = app_state["actuator"]
+    dispatcher = None
+    if "router" in app_state:
+        dispatcher = IntentDispatcher(app_state["router"], app_state, executor=bus.executor)
+        app_state["set_mode"] = lambda state, active: bus.call_soon(set_mode, state, active)
+
+    def overlay(text):
+        app_state["overlay"] = (text, time.time())
+
+    def volume(delta):
+        def done(fut):
+            error = fut.exception()
+            bus.publish(ActionResult("volume", error is None and bool(fut.result()), str(error) if error else None))
+        actuator.volume(delta).add_done_callback(done)
+
+    def on_gesture(e: GestureEvent):
+        if e.source != "cam":
+            print(f"[AURA] {e.tag}: {e.gesture}")
+        if e.gesture == "thumbs_up":
+            volume(0.10)
+            overlay("Volume Up (gesture)")
+        elif e.gesture == "thumbs_down":
+            volume(-0.10)
+            overlay("Volume Down (gesture)")
+        elif e.gesture == "screenshot":
+            # the frame the gesture was seen on; the frame loop has usually moved on by now
+            if e.frame is not None:
+                take_screenshot(app_state, e.frame)
+                overlay("Screenshot saved")
+        elif e.gesture == "open_palm":
+            if on_open_palm(app_state):
+                overlay("Active mode" if app_state["active"] else "Passive mode")
         else:
-            u.speak("Sorry, I couldn't set that reminder correctly.")
+            overlay(f"Gesture: {e.gesture.replace('_', ' ')}")
+
+    def on_voice(e: VoiceCommand):
+        overlay(f"Voice: {e.text}")
+        match = dispatcher.dispatch(e.text)
+        print("[Voice]", match.text, "->", match.name)
+
+    def on_result(e: ActionResult):
+        if not e.ok:
+            overlay(f"{e.action.capitalize()} control unavailable")
+
+    def on_object(e: ObjectEvent):
+        # newest replaces older, dropped if not spoken within 5 s
+        print(f"[AURA] {e.source}: sees {e.label} ({e.score:.0%})")
+        bus.publish(Speak(f"I see a {e.label}", LOW, key="objects", ttl=5.0))
+
+    def on_reminder(e: ReminderDue):
+        print(f"[AURA] Reminder: {e.reminder.text}")
+        bus.publish(Speak(f"Reminder: {e.reminder.text}", u.URGENT))
+
+    def on_speak(e: Speak):
+        u.speak(e.text, u.NORMAL if e.priority is None else e.priority, e.key, e.ttl)
+
+    bus.subscribe(GestureEvent, on_gesture)
+    if dispatcher is not None:
+        bus.subscribe(VoiceCommand, on_voice)
+    bus.subscribe(ActionResult, on_result)
+    bus.subscribe(ObjectEvent, on_object)
+    bus.subscribe(ReminderDue, on_reminder)
+    bus.subscribe(Speak, on_speak)
+    return bus, dispatcher
+
+
+def build_hud() -> HudRenderer:
+    """HUD layout: overlay message, emotion, mode and objects, clock, system info, scheduler line, volume bar."""
+    hud = HudRenderer()
+    hud.add("overlay", TextElement(20, 40, 0.9, (0, 255, 180), 2))
+    hud.add("emotion", TextElement(20, 70, 0.8, (0, 200, 200), 2))
+    hud.add("objects", TextElement(20, 100, 0.6, (255, 160, 0), 2))
+    hud.add("sched", TextElement(20, -70, 0.5, (200, 200, 200)))
+    hud.add("time", TextElement(20, -50, 0.6, (230, 230, 230)))
+    hud.add("sys", TextElement(20, -30, 0.5, (200, 200, 200)))
+    hud.add("volume", VolumeBarElement())
+    return hud
+
+
+def install_stop_signals(stop: threading.Event) -> None:
+    """SIGINT/SIGTERM (and SIGBREAK on Windows) end the main loop so the shutdown path in finally runs."""
+    def _handler(signum, _frame):
+        print(f"\n[AURA] {signal.Signals(signum).name} received, shutting down...")
+        stop.set()
+
+    for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), _handler)
+
+
+def start_preview(args):
+    if not args.preview_port:
+        return None
+    from preview import PreviewServer
+    try:
+        return PreviewServer(args.preview_port, max_fps=args.preview_fps).start()
+    except OSError as e:
+        print(f"[WARN] Preview server could not start on port {args.preview_port}: {e}")
+        return None
+
+
+def hands_in_view(pipeline) -> bool:
+    """Whether the last detection saw a hand (the scheduler keeps its detector's landmarks)."""
+    landmarks = getattr(getattr(pipeline, "detector", pipeline), "last_landmarks", None)
+    return landmarks is not None and len(landmarks) > 0
+
+
+def parse_size(text: str):
+    """ "320x240" -> (320, 240); "" -> None."""
+    if not text:
+        return None
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def build_detector_kwargs(args) -> dict:
+    kwargs = dict(max_num_hands=args.max_hands, roi_tracking=args.roi_tracking, search_scale=args.search_scale)
+    if args.gesture_table:
+        kwargs["gesture_table"] = load_table(args.gesture_table)
+    return kwargs
+
+
+def run_multi(args) -> None:
+    """Multi-source mode: one detector per source, tiled preview, gesture events tagged with source#hand."""
+    detector_kwargs = build_detector_kwargs(args)
+    specs = [s.strip() for s in args.sources.split(",") if s.strip()]
+    app_state = {"active": False}
+
+    def on_frame(name, ctx):
+        objects = app_state.get("objects")
+        if objects is not None:
+            objects.submit(name, ctx)
+
+    def annotate(name, frame):
+        objects = app_state.get("objects")
+        if objects is not None:
+            draw_detections(frame, objects.latest(name))
+
+    actuator = Actuator(u.VolumeController()).start()
+    writer = u.configure_screenshots(codec=args.screenshot_codec, quality=args.screenshot_quality)
+    app_state.update(actuator=actuator)
+    bus, _ = build_event_bus(args, app_state)
+    app_state["make_objects"] = lambda: build_object_worker(args, on_event=bus.publish)
+    # gestures go straight from the detection threads onto the bus
+    runner = MultiSourceRunner(specs, detector_kwargs, mode=args.multi_mode, workers=args.workers,
+                               mirror=not any(os.path.exists(s) for s in specs), on_frame=on_frame,
+                               annotate=annotate, on_event=bus.publish)
+    if not runner.start():
+        print("[ERROR] None of the sources could be opened.")
+        bus.stop()
+        actuator.stop()
+        writer.close()
+        return
+    if args.active:
+        set_mode(app_state, True)
+    stop = threading.Event()
+    install_stop_signals(stop)
+    preview = start_preview(args)
+    print(f"\n[AURA MULTI] Watching {len(runner.stations)} source(s). Press 'q' or 'ESC' to quit.\n")
+    try:
+        while not runner.finished and not stop.is_set():
+            rendering = not args.headless or (preview is not None and preview.watching)
+            runner.label_hands = rendering
+            for station in runner.stations:
+                station.pipeline.draw = rendering
+            if not rendering:
+                stop.wait(0.015)
+                continue
+            grid = tile(runner.frames())
+            if grid is not None and preview is not None:
+                preview.offer(grid)
+            if args.headless:
+                stop.wait(0.015)
+                continue
+            if grid is not None:
+                cv2.imshow("AURA - Multi-source (press q to quit)", grid)
+            key = cv2.waitKey(15) & 0xFF
+            if key in (27, ord('q')):
+                break
+    finally:
+        if preview is not None:
+            preview.stop()
+        runner.stop()
+        if app_state.get("objects") is not None:
+            app_state["objects"].stop()
+            print(f"[AURA] Object detection: {app_state['objects'].stats()}")
+        stats = runner.stats()
+        print(f"[AURA] {stats['sources']} source(s), {stats['total_fps']:.1f} frames/s processed in total")
+        for name, st in stats["per_source"].items():
+            print(f"[AURA]   {name}: {st['fps']:.1f} fps, {st['events']} events, dropped {st['dropped']}, "
+                  f"failed {st['failures']}")
+        fstats = framectx.stats()
+        print(f"[AURA] Frame views: {fstats['views_per_frame']:.2f} allocated per frame, {fstats['reused']} reused")
+        bus.stop()
+        print(f"[AURA] Events: {bus.stats()}")
+        actuator.stop()
+        writer.close()
+        if not args.headless:
+            cv2.destroyAllWindows()
+        u.shutdown_speech()
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="AURA gesture + voice assistant")
+    p.add_argument("--camera", type=int, default=0, help="camera index")
+    p.add_argument("--source", default=None,
+                   help="replay a video file or image directory instead of the camera")
+    p.add_argument("--backend", default="auto", choices=["auto"] + list(BACKENDS),
+                   help="OpenCV capture backend (auto = DirectShow on Windows, default elsewhere)")
+    p.add_argument("--width", type=int, default=None, help="requested capture width")
+    p.add_argument("--height", type=int, default=None, help="requested capture height")
+    p.add_argument("--fps", type=float, default=None, help="requested capture FPS")
+    p.add_argument("--buffer-size", type=int, default=1, help="driver frame buffer size")
+    p.add_argument("--sources", default=None,
+                   help="comma-separated camera indices / files / image dirs to watch at once (multi-source mode)")
+    p.add_argument("--multi-mode", default="thread", choices=MODES,
+                   help="multi-source detection on a shared thread pool or one worker process per source")
+    p.add_argument("--workers", type=int, default=None, help="multi-source thread pool size (default: one per source)")
+    p.add_argument("--headless", action="store_true",
+                   help="no window and no drawing; landmarks and HUD are rendered only for preview clients")
+    p.add_argument("--preview-port", type=int, default=0,
+                   help="serve an MJPEG preview on 127.0.0.1:PORT (0 = off)")
+    p.add_argument("--preview-fps", type=float, default=10.0, help="maximum preview frame rate")
+    p.add_argument("--max-hands", type=int, default=1, help="maximum number of hands to track")
+    p.add_argument("--gesture-table", default=None, metavar="JSON",
+                   help="gesture table replacing the default rows (see gestures/engine.py DEFAULT_TABLE)")
+    p.add_argument("--record-landmarks", default=None, metavar="PATH",
+                   help="record hand landmarks and actions per frame for detector-free replay")
+    p.add_argument("--active", action="store_true",
+                   help="start in active mode (gestures + object detection); an open palm toggles it")
+    p.add_argument("--yolo-model", default="models/yolov8n.onnx", help="YOLOv8 ONNX export for active mode")
+    p.add_argument("--yolo-runtime", default="auto", choices=["auto", "onnxruntime", "opencv"],
+                   help="CPU runtime for the object detector")
+    p.add_argument("--yolo-rate", type=float, default=2.0,
+                   help="object detections per second per source (0 = off)")
+    p.add_argument("--yolo-size", type=int, default=640, help="detector input size (if the model does not fix it)")
+    p.add_argument("--yolo-conf", type=float, default=0.35, help="minimum object confidence")
+    p.add_argument("--yolo-threads", type=int, default=0, help="CPU threads for the object detector (0 = default)")
+    p.add_argument("--roi-tracking", action="store_true",
+                   help="run hand inference on a crop around the last detection")
+    p.add_argument("--idle-after", type=float, default=0.0,
+                   help="seconds without a hand before idling: low-rate capture, motion detection only (0 = off)")
+    p.add_argument("--idle-fps", type=float, default=5.0, help="capture frame rate while idle")
+    p.add_argument("--idle-size", default="320x240",
+                   help="camera resolution while idle, WxH (empty = keep; ignored by files and image dirs)")
+    p.add_argument("--budget-ms", type=float, default=0.0,
+                   help="per-frame detection latency budget; enables the adaptive scheduler (0 = every frame)")
+    p.add_argument("--detector-process", action="store_true",
+                   help="run hand detection in a separate worker process (shared-memory frame ring)")
+    p.add_argument("--screenshot-codec", default="png", choices=CODECS, help="screenshot file format")
+    p.add_argument("--screenshot-quality", type=int, default=95, help="JPEG quality / PNG speed (0-100)")
+    p.add_argument("--burst", type=int, default=0,
+                   help="save the last N frames (pre-roll) instead of a single screenshot")
+    p.add_argument("--voice-backend", default="google", choices=["google", "sphinx", "vosk", "off"],
+                   help="speech recognizer (sphinx and vosk run fully offline)")
+    p.add_argument("--vosk-model", default="models/vosk", help="path to an unpacked Vosk model")
+    p.add_argument("--mic", type=int, default=None, help="input device index for the microphone")
+    p.add_argument("--intent-workers", type=int, default=4,
+                   help="worker threads for voice command handlers and blocking event handlers")
+    p.add_argument("--event-backlog", type=int, default=1024,
+                   help="events in flight on the event bus before new ones are dropped")
+    p.add_argument("--sys-interval", type=float, default=1.0,
+                   help="seconds between background system samples for the HUD (0 = off)")
+    p.add_argument("--startup-report", action="store_true",
+                   help="print per-subsystem import/init timing once the first frame is shown")
+    p.add_argument("--metrics", action="store_true", help="enable per-stage timing instrumentation")
+    p.add_argument("--metrics-hud", action="store_true", help="draw the metrics panel on the HUD (implies --metrics)")
+    p.add_argument("--metrics-jsonl", default=None, help="append metric snapshots to this JSON-lines file")
+    p.add_argument("--metrics-interval", type=float, default=5.0, help="seconds between JSON-lines dumps")
+    p.add_argument("--metrics-port", type=int, default=0, help="serve Prometheus text on 127.0.0.1:PORT/metrics")
+    p.add_argument("--search-scale", type=float, default=1.0,
+                   help="downscale factor for the full-frame hand search (e.g. 0.5)")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    startup.mark("main")
+    if args.sources:
+        run_multi(args)
+        return
+    detector_kwargs = build_detector_kwargs(args)
+    # heavy subsystems warm up in the background while the camera opens
+    u.get_speech_queue()
+    remote = None
+    if args.detector_process:
+        # the worker's frame ring is sized from the first captured frame, so it starts once the camera is open
+        remote = RemoteDetector(detector_kwargs)
     else:
-        u.speak(f"I heard {txt}")
-
-
-def draw_volume_bar(frame, volume_level):
-    """Display volume level bar on screen."""
-    h, w, _ = frame.shape
-    bar_w, bar_h = 200, 12
-    x, y = w - bar_w - 20, 20
-
-    cv2.rectangle(frame, (x, y), (x + bar_w, y + bar_h), (200, 200, 200), 1)
-    fill = int(bar_w * volume_level)
-    cv2.rectangle(frame, (x, y), (x + fill, y + bar_h), (0, 200, 100), -1)
-    cv2.putText(frame, f"VOL {int(volume_level * 100)}%", (x, y + bar_h + 18),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        detector_ready = startup.background("detector", GestureDetector, **detector_kwargs)
 
-
-def main():
-    cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-    time.sleep(0.4)
-
-    if not cap.isOpened():
+    if args.source:
+        cap = CaptureThread(open_source(args.source), mirror=False, pace=True)
+    else:
+        cap = CaptureThread(CameraSource(args.camera, backend=args.backend, width=args.width, height=args.height,
+                                         fps=args.fps, buffer_size=args.buffer_size))
+    with startup.phase("camera open"):
+        opened = cap.start()
+    if not opened:
         print("[ERROR] Camera not accessible. Try closing other apps or use another index.")
         return
-
-    detector = GestureDetector()
-    vol_ctrl = u.VolumeController()
-    cmd_queue = queue.Queue()
-
-    threading.Thread(target=voice_worker, args=(cmd_queue,), daemon=True).start()
-
-    app_state = {"vol": vol_ctrl, "last_frame": None}
-    overlay_text = ""
-    overlay_time = 0
+    if remote is not None:
+        first = cap.read(0, timeout=5.0)
+        shape = first.image.shape if first is not None else (args.height or 480, args.width or 640, 3)
+        detector_ready = startup.background("detector worker", remote.start, shape)
+
+    with startup.phase("wait for detector"):
+        ready = detector_ready.result()
+    detector = None
+    if remote is not None:
+        if not ready:
+            print("[ERROR] Detector worker failed to start.")
+            cap.stop()
+            return
+        pipeline = remote
+    else:
+        detector = ready
+        pipeline = InferenceScheduler(detector, budget_ms=args.budget_ms) if args.budget_ms > 0 else detector
+    recorder = None
+    if args.record_landmarks:
+        if detector is None:
+            print("[WARN] --record-landmarks is not supported with --detector-process; not recording.")
+        else:
+            recorder = detector.recorder = LandmarkRecorder(args.record_landmarks,
+                                                            meta={"source": args.source or f"camera {args.camera}"},
+                                                            gestures=detector.classifier.gestures)
+    with startup.phase("volume control"):
+        vol_ctrl = u.VolumeController()
+    vol_ctrl.start_polling()
+    sysmon = u.get_system_sampler(args.sys_interval) if args.sys_interval > 0 else None
+    hud_layer = build_hud()
+    idle = IdleController(args.idle_after) if args.idle_after > 0 else None
+    idle_size = parse_size(args.idle_size)
+
+    actuator = Actuator(vol_ctrl).start()
+    with startup.phase("reminders"):
+        reminders = u.get_reminder_scheduler()
+    writer = u.configure_screenshots(codec=args.screenshot_codec, quality=args.screenshot_quality)
+    ring = FrameRing(max(1, args.burst))
+    app_state = {"vol": vol_ctrl, "actuator": actuator, "last_frame": None, "ring": ring, "burst": args.burst,
+                 "take_screenshot": take_screenshot, "router": default_router(), "active": False}
+    bus, dispatcher = build_event_bus(args, app_state)
+    app_state["make_objects"] = lambda: build_object_worker(args, on_event=bus.publish)
+
+    def on_reminder_fire(r):
+        # announce directly if the bus is full or already stopped
+        if not bus.publish(ReminderDue(r)):
+            u.speak(f"Reminder: {r.text}", u.URGENT)
+
+    reminders.on_fire = on_reminder_fire
+    if args.active:
+        set_mode(app_state, True)
+
+    listener = None
+    if args.voice_backend != "off":
+        rec_kwargs = {"model_path": args.vosk_model} if args.voice_backend == "vosk" else {}
+        with startup.phase("voice listener"):
+            listener = u.start_voice_listener(lambda text: bus.publish(VoiceCommand(text)), args.voice_backend,
+                                              args.mic, **rec_kwargs)
+
+    dumper = None
+    if args.metrics or args.metrics_hud or args.metrics_jsonl or args.metrics_port:
+        metrics.enable()
+        metrics.gauge("event_backlog", bus.pending)
+        metrics.gauge("speech_queue", u.speech_pending)
+        metrics.gauge("actuator_queue", actuator.pending)
+        metrics.gauge("screenshot_queue", writer.pending)
+        metrics.gauge("intent_backlog", dispatcher.pending)
+        metrics.gauge("frames_dropped", lambda: cap.dropped)
+        metrics.gauge("frame_views", lambda: framectx.stats()["views_per_frame"])
+        if isinstance(pipeline, InferenceScheduler):
+            metrics.gauge("detector_duty", lambda: pipeline.stats()["duty_cycle"])
+            metrics.gauge("detection_rate", lambda: pipeline.stats()["detection_rate"])
+        if idle is not None:
+            metrics.gauge("idle", lambda: 1.0 if idle.asleep else 0.0)
+        if sysmon is not None:
+            metrics.gauge("process_cpu", lambda: (sysmon.latest().proc_cpu or 0.0) if sysmon.latest() else 0.0)
+        if args.metrics_jsonl:
+            dumper = metrics.JsonlDumper(args.metrics_jsonl, args.metrics_interval).start()
+        if args.metrics_port:
+            metrics.serve_prometheus(args.metrics_port)
     overlay_ttl = 2.0
+    stop = threading.Event()
+    install_stop_signals(stop)
+    preview = start_preview(args)
 
-    print("\n[AURA ACTIVE] Gesture + Voice assistant running. Press 'q' or 'ESC' to quit.\n")
+    if args.headless:
+        print("\n[AURA ACTIVE] Running headless. Press Ctrl+C to quit.\n")
+    else:
+        print("\n[AURA ACTIVE] Gesture + Voice assistant running. Press 'q' or 'ESC' to quit.\n")
 
+    last_seq = 0
+    first_frame = True
     try:
-        while True:
-            ret, frame = cap.read()
-            if not ret or frame is None:
-                time.sleep(0.05)
+        while not stop.is_set():
+            # always take the newest frame; anything older was dropped by the capture thread
+            with metrics.span("frame.wait"):
+                captured = cap.read(last_seq, timeout=0.5)
+            if captured is None:
+                if cap.finished:
+                    break
                 continue
-
-            frame = cv2.flip(frame, 1)
+            last_seq = captured.seq
+            frame = captured.image
+            t_frame = time.perf_counter()
+            metrics.record("frame.age", captured.age * 1000.0)
+            # headless: draw nothing unless a preview client is watching
+            rendering = not args.headless or (preview is not None and preview.watching)
+            pipeline.draw = rendering
+
+            # derived views (RGB, scaled copies...) of this frame, shared by every model
+            ctx = FrameContext(frame, captured.seq)
+            objects = app_state.get("objects")
+            asleep = idle is not None and idle.asleep
+            if asleep and idle.check(ctx, captured.timestamp):
+                # motion: back to full rate; detection resumes on the first frame captured at the full profile
+                cap.set_profile()
+                asleep = False
+            # frames still captured at the idle size would respawn the detector worker and mislead ROI tracking
+            catching_up = (idle is not None and idle.waking
+                           and (cap.profile_seq is None or captured.seq < cap.profile_seq))
+            if asleep or catching_up:
+                # idle: the motion check was this frame's only work
+                gesture, hud = None, {}
+            else:
+                if objects is not None:
+                    # before landmarks are drawn into the frame; only taken when a detection is due
+                    objects.submit("cam", ctx)
+                with metrics.span("detect"):
+                    frame, gesture, hud = pipeline.process(frame, ctx)
+                if idle is not None:
+                    if idle.waking:
+                        idle.full_rate()
+                    if idle.observe(hands_in_view(pipeline)):
+                        cap.set_profile(args.idle_fps, idle_size)
+            ctx.release()
+
+            if rendering:
+                with metrics.span("hud"):
+                    # only elements whose value changed are re-rendered into the cached layer
+                    overlay_text, overlay_time = app_state.get("overlay", ("", 0.0))
+                    if asleep:
+                        overlay_text, overlay_time = "Idle - move to wake", time.time()
+                    overlay_live = overlay_text and (time.time() - overlay_time < overlay_ttl)
+                    hud_layer.set("overlay", overlay_text if overlay_live else "")
+                    emo = hud.get("emotion", "")
+                    hud_layer.set("emotion", f"Emotion: {emo}" if emo else "")
+                    if objects is not None and not asleep:
+                        draw_detections(frame, objects.latest("cam"))
+                    seen = objects.hud_line("cam") if objects is not None else ""
+                    hud_layer.set("objects", ("ACTIVE" + (f"  {seen}" if seen else "")) if app_state["active"] else "")
+                    for name in ("time", "sys", "sched"):
+                        hud_layer.set(name, hud.get(name, ""))
+                    if sysmon is not None:
+                        # prepared by the sampler thread; reading it is a reference load
+                        hud_layer.set("sys", sysmon.hud_line())
+                    hud_layer.set("volume", int(vol_ctrl.level * 100))
+                    hud_layer.compose(frame)
+                    if args.metrics_hud:
+                        metrics.draw_panel(frame, origin=hud_layer.below())
+
+            # the frame is final from here on: share it without copying
             app_state["last_frame"] = frame
-
-            frame, gesture, hud = detector.process(frame)
-
-            # Gesture responses
+            ring.push(frame, captured.timestamp)
             if gesture:
-                if gesture == "thumbs_up":
-                    vol_ctrl.change(0.10)
-                    overlay_text = "Volume Up (gesture)"
-                elif gesture == "thumbs_down":
-                    vol_ctrl.change(-0.10)
-                    overlay_text = "Volume Down (gesture)"
-                elif gesture == "screenshot":
-                    u.save_frame_screenshot(frame)
-                    overlay_text = "Screenshot saved"
-                overlay_time = time.time()
-
-            # Process voice command if available
-            try:
-                cmd = cmd_queue.get_nowait()
-                if cmd:
-                    overlay_text = f"Voice: {cmd}"
-                    overlay_time = time.time()
-                    threading.Thread(target=handle_voice_command, args=(cmd, app_state), daemon=True).start()
-            except queue.Empty:
-                pass
-
-            # Display overlay
-            if overlay_text and (time.time() - overlay_time < overlay_ttl):
-                cv2.putText(frame, overlay_text, (20, 40),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 180), 2)
-
-            # Display HUD info
-            t = hud.get("time", "")
-            sys_info = hud.get("sys", "")
-            emo = hud.get("emotion", "")
-            cv2.putText(frame, t, (20, frame.shape[0] - 50), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (230, 230, 230), 1)
-            cv2.putText(frame, sys_info, (20, frame.shape[0] - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-            if emo:
-                cv2.putText(frame, f"Emotion: {emo}", (20, 70),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 200, 200), 2)
-
-            # Volume visualization
-            try:
-                vol_scalar = vol_ctrl._vol.GetMasterVolumeLevelScalar() if vol_ctrl._use_pycaw else 0.5
-            except Exception:
-                vol_scalar = 0.5
-            draw_volume_bar(frame, vol_scalar)
-
-            cv2.imshow("AURA - Live (press q to quit)", frame)
-            key = cv2.waitKey(1) & 0xFF
+                # handled later on the bus loop, so the event carries its frame (for a screenshot)
+                hand_id = next((h for h, g in getattr(pipeline, "last_events", ()) if g == gesture), -1)
+                bus.publish(GestureEvent("cam", hand_id, gesture, time.time(), captured.seq, frame))
+
+            key = -1
+            if preview is not None:
+                preview.offer(frame)
+            if not args.headless:
+                with metrics.span("display"):
+                    cv2.imshow("AURA - Live (press q to quit)", frame)
+                    key = cv2.waitKey(1) & 0xFF
+            metrics.record("frame.total", (time.perf_counter() - t_frame) * 1000.0)
+            if first_frame:
+                first_frame = False
+                startup.mark("first frame processed" if args.headless else "first frame shown")
+                if args.startup_report:
+                    print("[AURA] Startup timing:\n" + startup.report())
             if key in (27, ord('q')):
                 break
 
     finally:
-        cap.release()
-        cv2.destroyAllWindows()
-        q = getattr(u, "_speech_q", None)
-        if q:
-            try:
-                q.put(None)
-            except Exception:
-                pass
+        if preview is not None:
+            preview.stop()
+        cap.stop()
+        stats = cap.stats()
+        print(f"[AURA] Frames captured: {stats['captured']}, dropped as stale: {stats['dropped']}")
+        if remote is not None:
+            pipeline.stop()
+            print(f"[AURA] Detector worker: {pipeline.stats()}")
+        elif isinstance(pipeline, InferenceScheduler):
+            sched = pipeline.stats()
+            print(f"[AURA] Scheduler duty cycle {sched['duty_cycle']:.0%}, decisions {sched['counts']}")
+        if recorder is not None:
+            print(f"[AURA] Landmarks of {recorder.frames} frames written to {recorder.close()}")
+        if detector is not None and detector.roi_tracking:
+            roi = detector.roi_stats()
+            print(f"[AURA] ROI hit rate {roi['hit_rate']:.0%}, pixels inferred {roi['pixel_fraction']:.0%} of full frame")
+        fstats = framectx.stats()
+        print(f"[AURA] Frame views: {fstats['views_per_frame']:.2f} allocated per frame "
+              f"({fstats['kb_per_frame']:.0f} KB), {fstats['reused']} reused, by kind {fstats['per_view']}")
+        if idle is not None:
+            ist = idle.stats()
+            print(f"[AURA] Idle: {ist['sleeps']} sleeps, {ist['idle_s']:.0f} s idle / {ist['awake_s']:.0f} s awake; "
+                  f"CPU {ist['idle_cpu']:.0%} idle vs {ist['awake_cpu']:.0%} awake (of one core); "
+                  f"wake latency {ist['wake_latency_ms']:.0f} ms avg, {ist['wake_latency_max_ms']:.0f} ms max")
+        if listener is not None:
+            listener.stop()
+            print(f"[AURA] Voice: {listener.stats()}")
+        if app_state.get("objects") is not None:
+            app_state["objects"].stop()
+            print(f"[AURA] Object detection: {app_state['objects'].stats()}")
+        reminders.stop()
+        # queued intents are dropped before the bus shuts the executor they run on
+        dispatcher.shutdown()
+        # in-flight events may still queue actions and screenshots, so the bus drains first
+        bus.stop()
+        print(f"[AURA] Events: {bus.stats()}")
+        actuator.stop()
+        writer.close()
+        vol_ctrl.stop_polling()
+        if sysmon is not None:
+            sysmon.stop()
+        if dumper is not None:
+            dumper.stop()
+        if not args.headless:
+            cv2.destroyAllWindows()
+        print(f"[AURA] Speech: {u.shutdown_speech()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,236 @@
+"""
+metrics.py
+Lightweight pipeline instrumentation.
+Named spans feed rolling latency windows and cumulative histograms; gauges are callables
+sampled on export (queue depths, live threads). Everything can be shown as a HUD panel,
+dumped periodically as JSON lines, or served as Prometheus text on a localhost port.
+
+Disabled by default: span() then returns a shared no-op context manager, so
+instrumented code pays one function call per span.
+"""
+
+import json
+import time
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger("aura.metrics")
+
+# cumulative histogram bucket bounds in milliseconds (Prometheus "le" labels)
+BUCKETS_MS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+
+_enabled = False
+_lock = threading.Lock()
+_series: Dict[str, "_Series"] = {}
+_gauges: Dict[str, Callable[[], float]] = {}
+
+
+class _Series:
+    """Rolling window of recent samples plus cumulative bucket counts for one span name."""
+
+    __slots__ = ("window", "pos", "filled", "buckets", "count", "total")
+
+    def __init__(self, size: int = 256):
+        self.window = np.zeros(size, dtype=np.float64)
+        self.pos = 0
+        self.filled = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, ms: float) -> None:
+        self.window[self.pos] = ms
+        self.pos = (self.pos + 1) % len(self.window)
+        self.filled = min(self.filled + 1, len(self.window))
+        i = 0
+        while i < len(BUCKETS_MS) and ms > BUCKETS_MS[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += ms
+
+    def summary(self) -> dict:
+        if not self.filled:
+            return {"count": self.count, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        recent = self.window[:self.filled]
+        p50, p95 = np.percentile(recent, [50, 95])
+        return {"count": self.count, "p50": float(p50), "p95": float(p95), "max": float(recent.max())}
+
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, (time.perf_counter() - self.t0) * 1000.0)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def enable(on: bool = True) -> None:
+    global _enabled
+    _enabled = bool(on)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def span(name: str):
+    """Context manager timing a named pipeline stage (no-op when metrics are disabled)."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name)
+
+
+def record(name: str, ms: float) -> None:
+    """Record one latency sample in milliseconds."""
+    if not _enabled:
+        return
+    with _lock:
+        series = _series.get(name)
+        if series is None:
+            series = _series[name] = _Series()
+        series.add(ms)
+
+
+def gauge(name: str, fn: Callable[[], float]) -> None:
+    """Register a callable sampled on every export (e.g. a queue's qsize)."""
+    _gauges[name] = fn
+
+
+def _sample_gauges() -> dict:
+    values = {"threads": threading.active_count()}
+    for name, fn in list(_gauges.items()):
+        try:
+            values[name] = float(fn())
+        except Exception:
+            values[name] = float("nan")
+    return values
+
+
+def snapshot() -> dict:
+    """Span summaries and gauge values at this instant."""
+    with _lock:
+        spans = {name: s.summary() for name, s in _series.items()}
+    return {"ts": time.time(), "spans": spans, "gauges": _sample_gauges()}
+
+
+# ----------------- HUD panel -----------------
+def draw_panel(frame, origin=(20, 100), max_rows: int = 12) -> None:
+    """Render p50/p95 per span and gauge values onto a BGR frame; origin is the first row's baseline."""
+    import cv2
+    snap = snapshot()
+    x, y = origin
+    rows = sorted(snap["spans"].items(), key=lambda kv: -kv[1]["p95"])[:max_rows]
+    for name, s in rows:
+        cv2.putText(frame, f"{name:<18} {s['p50']:6.2f} {s['p95']:6.2f} ms", (x, y),
+                    cv2.FONT_HERSHEY_PLAIN, 0.9, (180, 255, 180), 1)
+        y += 14
+    gauges = "  ".join(f"{k}={v:g}" for k, v in snap["gauges"].items())
+    cv2.putText(frame, gauges, (x, y), cv2.FONT_HERSHEY_PLAIN, 0.9, (180, 220, 255), 1)
+
+
+# ----------------- Prometheus text format -----------------
+def _metric_name(name: str) -> str:
+    return "aura_" + "".join(c if c.isalnum() else "_" for c in name)
+
+
+def prometheus_text() -> str:
+    """All spans as histograms (seconds) and all gauges, in Prometheus exposition format."""
+    lines = ["# TYPE aura_span_seconds histogram"]
+    with _lock:
+        items = [(name, list(s.buckets), s.count, s.total) for name, s in _series.items()]
+    for name, buckets, count, total in items:
+        cumulative = 0
+        for bound, n in zip(BUCKETS_MS, buckets):
+            cumulative += n
+            lines.append(f'aura_span_seconds_bucket{{span="{name}",le="{bound / 1000.0:g}"}} {cumulative}')
+        lines.append(f'aura_span_seconds_bucket{{span="{name}",le="+Inf"}} {count}')
+        lines.append(f'aura_span_seconds_sum{{span="{name}"}} {total / 1000.0:.6f}')
+        lines.append(f'aura_span_seconds_count{{span="{name}"}} {count}')
+    for name, value in _sample_gauges().items():
+        metric = _metric_name(name)
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def serve_prometheus(port: int = 9464, host: str = "127.0.0.1"):
+    """Serve prometheus_text() at http://host:port/metrics on a daemon thread. Returns the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") not in ("", "/metrics"):
+                self.send_error(404)
+                return
+            body = prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info("Metrics endpoint on http://%s:%d/metrics", host, port)
+    return server
+
+
+# ----------------- JSON-lines dumps -----------------
+class JsonlDumper:
+    """Appends a snapshot() line to path every interval seconds on a daemon thread."""
+
+    def __init__(self, path: str, interval: float = 5.0):
+        self.path = path
+        self.interval = float(interval)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "JsonlDumper":
+        self._thread = threading.Thread(target=self._loop, name="metrics-jsonl", daemon=True)
+        self._thread.start()
+        return self
+
+    def dump(self) -> None:
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(snapshot()) + "\n")
+        except Exception as e:
+            logger.exception("metrics dump error: %s", e)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.dump()
@@ -0,0 +1,265 @@
+"""
+multisource.py
+Watch several frame sources from one host.
+Every source (camera index, video file or image directory) gets its own capture
+thread and its own detector. In "thread" mode detection for all sources is scheduled
+on a shared pool of `workers` threads, with at most one frame per source in flight
+and always the newest frame; in "process" mode each source gets a RemoteDetector
+worker process. Gestures from all sources are aggregated into one event queue,
+tagged with the source name and the stable per-source hand ID.
+"""
+
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+import cv2
+import numpy as np
+
+import metrics
+from capture import CaptureThread, open_source
+from framectx import FrameContext
+
+logger = logging.getLogger("aura.multisource")
+
+MODES = ("thread", "process")
+
+
+class GestureEvent:
+    """A gesture seen on one source; frame is the (annotated) frame it was seen on, for handlers that save it."""
+    __slots__ = ("source", "hand_id", "gesture", "ts", "seq", "frame")
+
+    def __init__(self, source: str, hand_id: int, gesture: str, ts: float, seq: int, frame=None):
+        self.source = source
+        self.hand_id = hand_id
+        self.gesture = gesture
+        self.ts = ts
+        self.seq = seq
+        self.frame = frame
+
+    @property
+    def tag(self) -> str:
+        return f"{self.source}#{self.hand_id}"
+
+    def __repr__(self):
+        return f"GestureEvent({self.tag} {self.gesture} seq={self.seq})"
+
+
+class Station:
+    """One source: its capture thread, its detector and its latest annotated frame."""
+
+    def __init__(self, name: str, capture: CaptureThread):
+        self.name = name
+        self.capture = capture
+        self.pipeline = None
+        self.latest = None  # last processed frame (annotated), shared read-only with the UI
+        self.last_seq = 0
+        self.processed = 0
+        self.events = 0
+        self.failures = 0  # frames whose detection or drawing raised
+        self.busy_s = 0.0
+        self.started = 0.0
+        self.thread = None
+
+    def stats(self) -> dict:
+        elapsed = max(1e-9, time.perf_counter() - self.started) if self.started else 0.0
+        return {"processed": self.processed, "fps": self.processed / elapsed if elapsed else 0.0,
+                "events": self.events, "failures": self.failures,
+                "busy_ms_per_frame": self.busy_s * 1000.0 / max(1, self.processed),
+                **self.capture.stats()}
+
+
+def draw_hand_ids(frame, landmarks, hand_ids, source: str) -> None:
+    """Label each hand at its wrist with source#id."""
+    for pts, hid in zip(landmarks, hand_ids):
+        x, y = int(pts[0][0]), int(pts[0][1])
+        cv2.putText(frame, f"{source}#{int(hid)}", (x + 8, y + 18), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
+                    (0, 255, 255), 1, cv2.LINE_AA)
+
+
+def tile(frames, cols: Optional[int] = None, size=None):
+    """Arrange frames in a grid (missing frames are black). size=(w, h) of each cell; default: first frame."""
+    frames = list(frames)
+    present = [f for f in frames if f is not None]
+    if not present:
+        return None
+    w, h = size or (present[0].shape[1], present[0].shape[0])
+    cols = cols or int(np.ceil(np.sqrt(len(frames))))
+    rows = int(np.ceil(len(frames) / cols))
+    grid = np.zeros((rows * h, cols * w, 3), dtype=np.uint8)
+    for i, f in enumerate(frames):
+        if f is None:
+            continue
+        r, c = divmod(i, cols)
+        cell = grid[r * h:(r + 1) * h, c * w:(c + 1) * w]
+        if f.shape[1] == w and f.shape[0] == h:
+            cell[:] = f
+        else:
+            cv2.resize(f, (w, h), dst=cell, interpolation=cv2.INTER_AREA)
+    return grid
+
+
+class MultiSourceRunner:
+    """
+    start() -> number of sources opened; events: queue of GestureEvent, or on_event(event) called from
+    the detection thread instead; frames() -> latest annotated frame per source; stats(); stop().
+    detector_factory(name) builds a detector for a source in thread mode (default GestureDetector).
+    on_frame(name, ctx) sees every raw frame's FrameContext before detection; annotate(name, frame) may draw
+    on the processed frame while label_hands is set.
+    """
+
+    def __init__(self, specs, detector_kwargs=None, mode: str = "thread", workers: Optional[int] = None,
+                 mirror: bool = False, pace: bool = True, loop: bool = False,
+                 detector_factory: Optional[Callable] = None,
+                 on_event: Optional[Callable[[GestureEvent], None]] = None, label_hands: bool = True,
+                 on_frame: Optional[Callable] = None, annotate: Optional[Callable] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}; choose from {', '.join(MODES)}")
+        self.specs = list(specs)
+        self.detector_kwargs = dict(detector_kwargs or {})
+        self.mode = mode
+        self.workers = workers
+        self.mirror = mirror
+        self.pace = pace
+        self.loop = loop
+        self.detector_factory = detector_factory
+        self.on_event = on_event
+        self.label_hands = label_hands
+        self.on_frame = on_frame
+        self.annotate = annotate
+        self.events: "queue.Queue[GestureEvent]" = queue.Queue()
+        self.stations: List[Station] = []
+        self._pool = None
+        self._running = False
+        self._started = 0.0
+
+    # ----------------- lifecycle -----------------
+    def _build_detector(self, station: Station):
+        if self.mode == "process":
+            from gestures.remote import RemoteDetector
+            remote = RemoteDetector(self.detector_kwargs)
+            first = station.capture.read(0, timeout=5.0)
+            shape = first.image.shape if first is not None else (480, 640, 3)
+            return remote if remote.start(shape) else None
+        if self.detector_factory is not None:
+            return self.detector_factory(station.name)
+        from gestures.detector import GestureDetector
+        return GestureDetector(**self.detector_kwargs)
+
+    def start(self) -> int:
+        """Open every source and build its detector (in parallel). Sources that fail are skipped."""
+        for i, spec in enumerate(self.specs):
+            try:
+                cap = CaptureThread(open_source(spec, loop=self.loop), mirror=self.mirror, pace=self.pace)
+            except Exception as e:
+                logger.error("Source %r: %s", spec, e)
+                continue
+            if not cap.start():
+                logger.error("Source %r is not accessible; skipping it.", spec)
+                continue
+            self.stations.append(Station(f"src{i}", cap))
+        if not self.stations:
+            return 0
+        n = len(self.stations)
+        self._pool = ThreadPoolExecutor(max_workers=max(1, self.workers or n), thread_name_prefix="multi")
+        # detector construction is slow (model load); build all of them concurrently
+        for station, detector in zip(self.stations, self._pool.map(self._build_detector, self.stations)):
+            station.pipeline = detector
+        for station in self.stations:
+            if station.pipeline is None:
+                logger.error("Detector for %s failed to start; skipping it.", station.name)
+                station.capture.stop()
+        self.stations = [s for s in self.stations if s.pipeline is not None]
+        self._running = True
+        self._started = time.perf_counter()
+        for station in self.stations:
+            station.started = self._started
+            station.thread = threading.Thread(target=self._drive, args=(station,), name=f"multi-{station.name}",
+                                              daemon=True)
+            station.thread.start()
+        logger.info("Watching %d source(s) in %s mode.", len(self.stations), self.mode)
+        return len(self.stations)
+
+    def stop(self) -> None:
+        self._running = False
+        for station in self.stations:
+            if station.thread is not None:
+                station.thread.join(timeout=2.0)
+            station.capture.stop()
+            if self.mode == "process" and station.pipeline is not None:
+                station.pipeline.stop()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    @property
+    def finished(self) -> bool:
+        """True when every (finite) source is exhausted and its driver has exited."""
+        return all(s.thread is None or not s.thread.is_alive() for s in self.stations)
+
+    # ----------------- per-source driver -----------------
+    def _drive(self, station: Station) -> None:
+        """Feed the newest frame of one source to its detector; in thread mode the work runs on the shared pool."""
+        cap = station.capture
+        while self._running:
+            captured = cap.read(station.last_seq, timeout=0.5)
+            if captured is None:
+                if cap.finished:
+                    return
+                continue
+            station.last_seq = captured.seq
+            try:
+                if self.mode == "thread":
+                    # one job per source in flight: the pool bounds how many sources infer at once
+                    self._pool.submit(self._process, station, captured).result()
+                else:
+                    self._process(station, captured)
+            except Exception as e:
+                # one bad frame must not silently end this source while the others keep running
+                station.failures += 1
+                logger.exception("%s: frame %d failed (%d so far): %s", station.name, captured.seq,
+                                  station.failures, e)
+
+    def _process(self, station: Station, captured) -> None:
+        t0 = time.perf_counter()
+        pipeline = station.pipeline
+        ctx = FrameContext(captured.image, captured.seq)
+        try:
+            if self.on_frame is not None:
+                self.on_frame(station.name, ctx)
+            with metrics.span("multi.detect"):
+                frame, _, _ = pipeline.process(captured.image, ctx)
+        finally:
+            ctx.release()
+        station.busy_s += time.perf_counter() - t0
+        station.processed += 1
+        hand_ids = getattr(pipeline, "last_hand_ids", None)
+        if self.label_hands and hand_ids is not None and len(hand_ids):
+            draw_hand_ids(frame, pipeline.last_landmarks, hand_ids, station.name)
+        if self.label_hands and self.annotate is not None:
+            self.annotate(station.name, frame)
+        station.latest = frame
+        for hand_id, gesture in getattr(pipeline, "last_events", ()):
+            station.events += 1
+            event = GestureEvent(station.name, hand_id, gesture, time.time(), captured.seq, frame)
+            if self.on_event is None:
+                self.events.put(event)
+                continue
+            try:
+                self.on_event(event)
+            except Exception as e:
+                logger.exception("event callback error: %s", e)
+
+    # ----------------- readers -----------------
+    def frames(self):
+        return [s.latest for s in self.stations]
+
+    def stats(self) -> dict:
+        per = {s.name: s.stats() for s in self.stations}
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        total = sum(s.processed for s in self.stations)
+        return {"mode": self.mode, "sources": len(self.stations), "workers": self.workers or len(self.stations),
+                "elapsed_s": elapsed, "total_fps": total / elapsed if elapsed > 0 else 0.0, "per_source": per}
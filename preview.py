@@ -0,0 +1,186 @@
+"""
+preview.py
+Local MJPEG preview over HTTP for headless runs.
+PreviewServer listens on 127.0.0.1 by default. The main loop hands it every finished
+frame with offer(), which is a no-op unless a client is connected. One encoder thread
+turns the newest offered frame into JPEG at most max_fps times per second, independent
+of the detection rate, and every connected client streams the latest encoded image.
+
+    /         minimal HTML page
+    /stream   multipart/x-mixed-replace MJPEG stream
+    /snapshot single JPEG
+"""
+
+import time
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+import metrics
+
+logger = logging.getLogger("aura.preview")
+
+_PAGE = b"""<!doctype html><html><head><title>AURA preview</title></head>
+<body style="margin:0;background:#111"><img src="/stream" style="max-width:100%"></body></html>"""
+
+
+class PreviewServer:
+    """start() / stop(); watching -> bool; offer(frame). Frames are not copied: do not modify them after offer()."""
+
+    def __init__(self, port: int = 8080, host: str = "127.0.0.1", max_fps: float = 10.0, quality: int = 70):
+        self.host = host
+        self.port = int(port)
+        self.interval = 1.0 / max(0.1, float(max_fps))
+        self.quality = int(quality)
+        self._cond = threading.Condition()
+        self._pending = None  # newest offered frame not yet encoded
+        self._jpeg = None
+        self._jpeg_seq = 0
+        self._clients = 0
+        self._running = False
+        self._last_encode = 0.0
+        self._server = None
+        self._threads = []
+        self.encoded = 0
+
+    @property
+    def watching(self) -> bool:
+        return self._clients > 0
+
+    def offer(self, frame) -> None:
+        """Hand over a finished frame; ignored when nobody watches or an encode is not due yet."""
+        if not self._clients or time.perf_counter() - self._last_encode < self.interval:
+            return
+        with self._cond:
+            self._pending = frame
+            self._cond.notify_all()
+
+    # ----------------- encoder -----------------
+    def _encode_loop(self) -> None:
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        while True:
+            with self._cond:
+                while self._running and self._pending is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                frame, self._pending = self._pending, None
+            self._last_encode = time.perf_counter()
+            with metrics.span("preview.encode"):
+                ok, data = cv2.imencode(".jpg", frame, params)
+            if not ok:
+                continue
+            with self._cond:
+                self._jpeg = data.tobytes()
+                self._jpeg_seq += 1
+                self.encoded += 1
+                self._cond.notify_all()
+
+    def _next_jpeg(self, after_seq: int, timeout: float = 1.0):
+        """Wait for an encoded image newer than after_seq. Returns (seq, bytes) or None."""
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while self._running and self._jpeg_seq <= after_seq:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            if self._jpeg_seq <= after_seq:
+                return None
+            return self._jpeg_seq, self._jpeg
+
+    # ----------------- HTTP -----------------
+    def _handler(self):
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0].rstrip("/")
+                if path == "":
+                    self._send(200, "text/html; charset=utf-8", _PAGE)
+                elif path == "/stream":
+                    self._stream()
+                elif path == "/snapshot":
+                    self._snapshot()
+                else:
+                    self.send_error(404)
+
+            def _send(self, code, ctype, body):
+                self.send_response(code)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _snapshot(self):
+                with server._cond:
+                    server._clients += 1
+                try:
+                    # a fresh frame, not whatever was encoded when someone last watched
+                    got = server._next_jpeg(server._jpeg_seq, timeout=3.0)
+                finally:
+                    with server._cond:
+                        server._clients -= 1
+                if got is None:
+                    self.send_error(503, "no frame yet")
+                else:
+                    self._send(200, "image/jpeg", got[1])
+
+            def _stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                with server._cond:
+                    server._clients += 1
+                logger.info("Preview client connected: %s", self.client_address[0])
+                seq = 0
+                try:
+                    while server._running:
+                        got = server._next_jpeg(seq)
+                        if got is None:
+                            continue
+                        seq, jpeg = got
+                        self.wfile.write(b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: "
+                                         + str(len(jpeg)).encode() + b"\r\n\r\n" + jpeg + b"\r\n")
+                except (BrokenPipeError, ConnectionResetError, OSError):
+                    pass
+                finally:
+                    with server._cond:
+                        server._clients -= 1
+                    logger.info("Preview client disconnected: %s", self.client_address[0])
+
+            def log_message(self, *args):
+                pass
+
+        return _Handler
+
+    def start(self) -> "PreviewServer":
+        self._running = True
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._threads = [threading.Thread(target=self._server.serve_forever, name="preview-http", daemon=True),
+                         threading.Thread(target=self._encode_loop, name="preview-encode", daemon=True)]
+        for t in self._threads:
+            t.start()
+        logger.info("Preview on http://%s:%d/", self.host, self.port)
+        return self
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for t in self._threads:
+            t.join(timeout=2.0)
+        self._threads = []
+
+    def stats(self) -> dict:
+        return {"clients": self._clients, "encoded": self.encoded}
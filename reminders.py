@@ -0,0 +1,220 @@
+"""
+reminders.py
+Single-thread reminder scheduler backed by a min-heap.
+Thousands of pending reminders cost one parked thread; reminders can be listed,
+cancelled and made recurring, and are persisted to a compact JSON file (written
+atomically, at most once per flush interval) that is reloaded at startup.
+Reminders that fell due while AURA was not running fire right after reload.
+"""
+
+import os
+import json
+import math
+import time
+import heapq
+import logging
+import itertools
+import threading
+from typing import Callable, List, Optional
+
+logger = logging.getLogger("aura.reminders")
+
+
+def format_delay(seconds: float) -> str:
+    """Human wording for a delay: '45 seconds', '1 minute', '2 hours 30 minutes'."""
+    seconds = int(round(seconds))
+    parts = []
+    for size, unit in ((3600, "hour"), (60, "minute"), (1, "second")):
+        n, seconds = divmod(seconds, size)
+        if n:
+            parts.append(f"{n} {unit}" + ("s" if n != 1 else ""))
+    return " ".join(parts[:2]) if parts else "0 seconds"
+
+
+class Reminder:
+    __slots__ = ("id", "due", "text", "every")
+
+    def __init__(self, rid: int, due: float, text: str, every: Optional[float] = None):
+        self.id = rid
+        self.due = due  # wall-clock epoch seconds, so it survives restarts
+        self.text = text
+        self.every = every  # repeat interval in seconds, or None
+
+    def to_row(self):
+        return [self.id, round(self.due, 3), self.every, self.text]
+
+    def __repr__(self):
+        return f"Reminder(id={self.id}, due={time.strftime('%H:%M:%S', time.localtime(self.due))}, text={self.text!r})"
+
+
+class ReminderScheduler:
+    """
+    add(delay, text, every=None) -> id, cancel(id) -> bool, list() -> [Reminder].
+    on_fire(reminder) is called on the scheduler thread when a reminder is due.
+    """
+
+    def __init__(self, path: Optional[str] = "reminders.json", on_fire: Optional[Callable] = None,
+                 flush_interval: float = 1.0):
+        self.path = path
+        self.on_fire = on_fire
+        self.flush_interval = float(flush_interval)
+        self._heap = []  # (due, id); stale entries are skipped lazily
+        self._items = {}
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._running = False
+        self._dirty = False
+        self._last_flush = 0.0
+        self._thread = None
+        self.fired = 0
+
+    # ----------------- persistence -----------------
+    def load(self) -> int:
+        """Load reminders from path. Returns how many were restored."""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                rows = json.load(f)
+        except Exception as e:
+            logger.exception("Failed to load reminders from %s: %s", self.path, e)
+            return 0
+        if not isinstance(rows, list):
+            logger.error("Ignoring %s: expected a list of reminders, got %s", self.path, type(rows).__name__)
+            return 0
+        restored = []
+        for row in rows:
+            try:
+                rid, due, every, text = row
+                if isinstance(rid, bool) or not isinstance(rid, int):
+                    raise ValueError(f"bad id {rid!r}")
+                if isinstance(due, bool) or not isinstance(due, (int, float)) or not math.isfinite(due):
+                    raise ValueError(f"bad due time {due!r}")
+                every = float(every) if every else None
+                restored.append(Reminder(rid, due, str(text), every))
+            except (TypeError, ValueError) as e:
+                logger.warning("Skipping bad reminder row %r in %s: %s", row, self.path, e)
+        with self._cond:
+            for r in restored:
+                self._items[r.id] = r
+                self._heap.append((r.due, r.id))
+            heapq.heapify(self._heap)
+            self._ids = itertools.count(max(self._items, default=0) + 1)
+            self._cond.notify()
+        logger.info("Restored %d reminder(s) from %s", len(restored), self.path)
+        return len(restored)
+
+    def flush(self) -> None:
+        """Write all pending reminders to path atomically."""
+        if not self.path:
+            return
+        with self._cond:
+            rows = [r.to_row() for r in self._items.values()]
+            self._dirty = False
+            self._last_flush = time.monotonic()
+        tmp = self.path + ".tmp"
+        try:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(rows, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except Exception as e:
+            logger.exception("Failed to save reminders: %s", e)
+
+    # ----------------- API -----------------
+    def add(self, delay_seconds: float, text: str, every: Optional[float] = None) -> int:
+        with self._cond:
+            rid = next(self._ids)
+            due = time.time() + max(0.0, float(delay_seconds))
+            self._items[rid] = Reminder(rid, due, text, float(every) if every else None)
+            heapq.heappush(self._heap, (due, rid))
+            self._dirty = True
+            self._cond.notify()
+        return rid
+
+    def cancel(self, rid: int) -> bool:
+        with self._cond:
+            removed = self._items.pop(rid, None) is not None
+            if removed:
+                self._dirty = True
+                self._cond.notify()
+        return removed
+
+    def clear(self) -> int:
+        with self._cond:
+            n = len(self._items)
+            self._items.clear()
+            self._heap.clear()
+            self._dirty = True
+            self._cond.notify()
+        return n
+
+    def list(self) -> List[Reminder]:
+        with self._cond:
+            return sorted(self._items.values(), key=lambda r: r.due)
+
+    def __len__(self):
+        return len(self._items)
+
+    # ----------------- thread -----------------
+    def start(self) -> "ReminderScheduler":
+        if not self._running:
+            self._running = True
+            self._thread = threading.Thread(target=self._loop, name="reminders", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._dirty:
+            self.flush()
+
+    def _pop_due(self, now: float):
+        """Pop every due reminder, rescheduling recurring ones. Caller holds the lock."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, rid = heapq.heappop(self._heap)
+            r = self._items.get(rid)
+            if r is None or r.due != when:
+                continue  # cancelled or rescheduled
+            due.append(r)
+            if r.every:
+                # skip missed repetitions instead of firing them all at once
+                r.due = when + r.every * max(1, int((now - when) // r.every) + 1)
+                heapq.heappush(self._heap, (r.due, rid))
+            else:
+                del self._items[rid]
+            self._dirty = True
+        return due
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                now = time.time()
+                due = self._pop_due(now)
+                if not due:
+                    timeout = self._heap[0][0] - now if self._heap else None
+                    if self._dirty:
+                        flush_in = self.flush_interval - (time.monotonic() - self._last_flush)
+                        timeout = flush_in if timeout is None else min(timeout, flush_in)
+                    if timeout is None or timeout > 0:
+                        self._cond.wait(timeout)
+                flush_now = self._dirty and time.monotonic() - self._last_flush >= self.flush_interval
+            for r in due:
+                self.fired += 1
+                try:
+                    if self.on_fire is not None:
+                        self.on_fire(r)
+                except Exception as e:
+                    logger.exception("Reminder callback error: %s", e)
+            if flush_now:
+                self.flush()
@@ -0,0 +1,184 @@
+"""
+screenshots.py
+Bounded screenshot writer pool and pre-roll frame ring.
+ScreenshotWriter encodes and writes frames on a fixed set of worker threads fed by a
+bounded queue (a full queue rejects new jobs instead of piling up threads), with a
+selectable codec (png, jpg, npy) and collision-free file names.
+FrameRing keeps references to the last N displayed frames so a trigger can save a
+burst that includes the moments before it, without copying frames on the hot path.
+"""
+
+import os
+import time
+import queue
+import logging
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Optional
+
+import cv2
+import numpy as np
+
+import metrics
+
+logger = logging.getLogger("aura.screenshots")
+
+CODECS = ("png", "jpg", "npy")
+
+_counter = itertools.count(1)
+
+
+def unique_stem(prefix: str = "screenshot") -> str:
+    """prefix_YYYYmmdd_HHMMSS_mmm_pid_counter: unique per process and across processes."""
+    now = time.time()
+    ms = int((now % 1) * 1000)
+    return f"{prefix}_{time.strftime('%Y%m%d_%H%M%S', time.localtime(now))}_{ms:03d}_{os.getpid()}_{next(_counter):04d}"
+
+
+def encode(img, codec: str = "png", quality: int = 95) -> bytes:
+    """Encode a BGR frame to file bytes. quality is JPEG quality, or mapped to PNG compression."""
+    if codec == "npy":
+        import io
+        buf = io.BytesIO()
+        np.save(buf, img, allow_pickle=False)
+        return buf.getvalue()
+    if codec == "jpg":
+        params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+    elif codec == "png":
+        # higher quality -> faster, larger files; 100 maps to compression 0
+        params = [cv2.IMWRITE_PNG_COMPRESSION, max(0, min(9, (100 - int(quality)) // 10))]
+    else:
+        raise ValueError(f"Unknown screenshot codec {codec!r}; choose from {', '.join(CODECS)}")
+    ok, data = cv2.imencode("." + codec, img, params)
+    if not ok:
+        raise IOError(f"{codec} encoding failed")
+    return data.tobytes()
+
+
+def write_exclusive(folder: str, stem: str, ext: str, data: bytes) -> str:
+    """Write data to folder/stem.ext without ever overwriting an existing file. Returns the path."""
+    os.makedirs(folder, exist_ok=True)
+    for attempt in itertools.count():
+        name = f"{stem}.{ext}" if attempt == 0 else f"{stem}-{attempt}.{ext}"
+        path = os.path.join(folder, name)
+        try:
+            with open(path, "xb") as f:
+                f.write(data)
+            return path
+        except FileExistsError:
+            continue
+
+
+class FrameRing:
+    """Keeps (timestamp, frame) references for the last `capacity` frames. Frames must not be mutated after push."""
+
+    def __init__(self, capacity: int = 30):
+        self._frames = deque(maxlen=max(1, int(capacity)))
+        self._lock = threading.Lock()
+
+    def push(self, frame, timestamp: Optional[float] = None) -> None:
+        with self._lock:
+            self._frames.append((time.time() if timestamp is None else timestamp, frame))
+
+    def last(self, n: Optional[int] = None):
+        """The newest n (timestamp, frame) pairs, oldest first."""
+        with self._lock:
+            items = list(self._frames)
+        return items if n is None else items[-n:]
+
+    def __len__(self):
+        return len(self._frames)
+
+
+class ScreenshotWriter:
+    """
+    save(frame) / save_burst(frames) queue encode+write jobs on `workers` threads.
+    At most max_pending jobs wait; beyond that the job is rejected (its Future fails)
+    unless block=True. Callers hand over the frame and must not modify it afterwards.
+    """
+
+    def __init__(self, folder: str = "screenshots", codec: str = "png", quality: int = 95,
+                 workers: int = 2, max_pending: int = 8, announce: bool = True):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown screenshot codec {codec!r}; choose from {', '.join(CODECS)}")
+        self.folder = folder
+        self.codec = codec
+        self.quality = int(quality)
+        self.announce = announce
+        self._jobs: "queue.Queue" = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._threads = [threading.Thread(target=self._worker, name=f"screenshot-{i}", daemon=True)
+                         for i in range(max(1, int(workers)))]
+        for t in self._threads:
+            t.start()
+        self.written = 0
+        self.rejected = 0
+
+    def _enqueue(self, job, block: bool) -> Future:
+        fut = Future()
+        try:
+            self._jobs.put((job, fut), block=block)
+        except queue.Full:
+            self.rejected += 1
+            logger.info("Screenshot queue full; dropping capture.")
+            fut.set_exception(RuntimeError("screenshot queue full"))
+        return fut
+
+    def save(self, frame, block: bool = False) -> Future:
+        """Queue one frame. The Future resolves to the written path."""
+        stem = unique_stem()
+        return self._enqueue(lambda: self._write_one(frame, stem), block)
+
+    def save_burst(self, frames, block: bool = False) -> Future:
+        """Queue a burst (list of frames or (timestamp, frame) pairs) as one job. Resolves to the burst folder."""
+        frames = [f[1] if isinstance(f, tuple) else f for f in frames]
+        stem = unique_stem("burst")
+        return self._enqueue(lambda: self._write_burst(frames, stem), block)
+
+    def _write_one(self, frame, stem: str) -> str:
+        with metrics.span("screenshot.write"):
+            path = write_exclusive(self.folder, stem, self.codec, encode(frame, self.codec, self.quality))
+        logger.info("Saved screenshot: %s", path)
+        return path
+
+    def _write_burst(self, frames, stem: str) -> str:
+        folder = os.path.join(self.folder, stem)
+        with metrics.span("screenshot.burst"):
+            for i, frame in enumerate(frames):
+                write_exclusive(folder, f"frame_{i:03d}", self.codec, encode(frame, self.codec, self.quality))
+        logger.info("Saved %d-frame burst: %s", len(frames), folder)
+        return folder
+
+    def _worker(self) -> None:
+        # imported lazily: utils imports this module
+        from utils import speak
+        from tts import LOW
+        while True:
+            item = self._jobs.get()
+            if item is None:
+                self._jobs.task_done()
+                break
+            job, fut = item
+            try:
+                fut.set_result(job())
+                self.written += 1
+                if self.announce:
+                    speak("Screenshot saved", LOW, key="screenshot", ttl=5.0)
+            except Exception as e:
+                logger.exception("screenshot save error: %s", e)
+                fut.set_exception(e)
+                if self.announce:
+                    speak("Failed to save screenshot", key="screenshot", ttl=5.0)
+            finally:
+                self._jobs.task_done()
+
+    def pending(self) -> int:
+        return self._jobs.qsize()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Finish queued writes, then stop the workers."""
+        for _ in self._threads:
+            self._jobs.put(None)
+        for t in self._threads:
+            t.join(timeout=timeout)
@@ -0,0 +1,73 @@
+"""
+startup.py
+Startup timing for lazily initialized subsystems.
+phase(name) times one import or initialization step on whichever thread runs it;
+background(name, fn) runs a warm-up step on its own thread so it overlaps with the
+rest of startup; mark(name) records an instant such as the first displayed frame.
+report() lists every step relative to when this module was imported.
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import List, Tuple
+
+logger = logging.getLogger("aura.startup")
+
+_T0 = time.perf_counter()
+_lock = threading.Lock()
+_phases: List[Tuple[str, float, float, str]] = []  # (name, start_s, duration_s, thread)
+
+
+def _add(name: str, start: float, duration: float) -> None:
+    with _lock:
+        _phases.append((name, start - _T0, duration, threading.current_thread().name))
+
+
+@contextmanager
+def phase(name: str):
+    """Time a block as one startup phase."""
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        _add(name, t, time.perf_counter() - t)
+
+
+def mark(name: str) -> None:
+    """Record an instant (zero-length phase)."""
+    _add(name, time.perf_counter(), 0.0)
+
+
+def background(name: str, fn, *args, **kwargs) -> Future:
+    """Run fn(*args, **kwargs) as a timed phase on a daemon thread; the Future holds its result."""
+    fut = Future()
+
+    def _run():
+        if not fut.set_running_or_notify_cancel():
+            return
+        try:
+            with phase(name):
+                result = fn(*args, **kwargs)
+            fut.set_result(result)
+        except BaseException as e:
+            logger.exception("Startup step %s failed: %s", name, e)
+            fut.set_exception(e)
+
+    threading.Thread(target=_run, name=f"warmup-{name}", daemon=True).start()
+    return fut
+
+
+def phases() -> List[Tuple[str, float, float, str]]:
+    with _lock:
+        return sorted(_phases, key=lambda p: p[1])
+
+
+def report() -> str:
+    """Human-readable table of startup phases, in start order."""
+    lines = [f"{'phase':<24} {'start ms':>9} {'took ms':>9}  thread"]
+    for name, start, duration, thread in phases():
+        lines.append(f"{name:<24} {start * 1000:9.1f} {duration * 1000:9.1f}  {thread}")
+    return "\n".join(lines)
@@ -0,0 +1,176 @@
+"""
+sysmon.py
+Background system-metrics sampler.
+One daemon thread samples system CPU, RAM and battery plus AURA's own CPU, RSS and
+thread count every `interval` seconds into a fixed-size ring. Readers never block:
+latest() returns the newest immutable Sample and hud_line() a string prepared when
+it was taken. trend() summarizes a short window (mean and per-minute slope).
+Without psutil only the process figures (from time.process_time) are available.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger("aura.sysmon")
+
+FIELDS = ("cpu", "ram", "battery", "proc_cpu", "proc_rss_mb", "proc_threads")
+
+
+class Sample:
+    """One reading; None for figures this platform cannot provide."""
+    __slots__ = ("ts",) + FIELDS + ("plugged",)
+
+    def __init__(self, ts: float, cpu=None, ram=None, battery=None, plugged=None, proc_cpu=None,
+                 proc_rss_mb=None, proc_threads=None):
+        self.ts = ts
+        self.cpu = cpu
+        self.ram = ram
+        self.battery = battery
+        self.plugged = plugged
+        self.proc_cpu = proc_cpu
+        self.proc_rss_mb = proc_rss_mb
+        self.proc_threads = proc_threads
+
+    def as_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+def _fmt(value, unit="%") -> str:
+    return "N/A" if value is None else f"{value:.0f}{unit}"
+
+
+class SystemSampler:
+    """
+    start() / stop(); latest() -> Sample or None; hud_line() -> str;
+    trend(field, window_s) -> {"mean", "min", "max", "per_min"}; status_text() for speech.
+    """
+
+    def __init__(self, interval: float = 1.0, history: int = 120):
+        self.interval = max(0.1, float(interval))
+        self._ring = deque(maxlen=max(2, int(history)))
+        self._latest: Optional[Sample] = None
+        self._hud = "SYS ..."
+        self._stop = threading.Event()
+        self._thread = None
+        try:
+            import psutil  # type: ignore
+            self._psutil = psutil
+            self._proc = psutil.Process()
+        except Exception as e:
+            logger.info("psutil not available; system info limited to AURA's own CPU. %s", e)
+            self._psutil = None
+            self._proc = None
+        self._last_cpu_time = None
+
+    # ----------------- sampling -----------------
+    def _process_cpu(self, now: float):
+        """AURA's CPU use in percent of one core since the previous sample."""
+        cpu_time = time.process_time()
+        prev = self._last_cpu_time
+        self._last_cpu_time = (now, cpu_time)
+        if prev is None or now <= prev[0]:
+            return None
+        return 100.0 * (cpu_time - prev[1]) / (now - prev[0])
+
+    def sample(self) -> Sample:
+        """Take one reading now (never blocks on an interval) and publish it."""
+        now = time.monotonic()
+        s = Sample(time.time(), proc_cpu=self._process_cpu(now), proc_threads=threading.active_count())
+        psutil = self._psutil
+        if psutil is not None:
+            try:
+                s.cpu = psutil.cpu_percent(interval=None)
+                s.ram = psutil.virtual_memory().percent
+                s.proc_rss_mb = self._proc.memory_info().rss / 2 ** 20
+                s.proc_threads = self._proc.num_threads()
+                try:
+                    bat = psutil.sensors_battery()
+                    if bat is not None:
+                        s.battery, s.plugged = bat.percent, bat.power_plugged
+                except Exception:
+                    pass
+            except Exception as e:
+                logger.debug("psutil sample failed: %s", e)
+        self._ring.append(s)
+        self._hud = (f"CPU {_fmt(s.cpu)} RAM {_fmt(s.ram)} BAT {_fmt(s.battery)} | "
+                     f"AURA {_fmt(s.proc_cpu)} {s.proc_threads}thr")
+        self._latest = s
+        return s
+
+    def start(self) -> "SystemSampler":
+        if self._thread is None:
+            if self._psutil is not None:
+                self._psutil.cpu_percent(interval=None)  # prime: the first call always returns 0.0
+            self._process_cpu(time.monotonic())
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="sysmon", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.exception("system sample error: %s", e)
+
+    # ----------------- readers -----------------
+    def latest(self) -> Optional[Sample]:
+        return self._latest
+
+    def hud_line(self) -> str:
+        return self._hud
+
+    def history(self, window_s: Optional[float] = None):
+        items = list(self._ring)
+        if window_s is None or not items:
+            return items
+        cutoff = items[-1].ts - window_s
+        return [s for s in items if s.ts >= cutoff]
+
+    def trend(self, field: str, window_s: float = 30.0) -> Optional[dict]:
+        """Mean/min/max and least-squares slope (units per minute) of field over the window."""
+        pts = [(s.ts, getattr(s, field)) for s in self.history(window_s) if getattr(s, field) is not None]
+        if not pts:
+            return None
+        values = [v for _, v in pts]
+        mean = sum(values) / len(values)
+        slope = 0.0
+        if len(pts) > 1:
+            t_mean = sum(t for t, _ in pts) / len(pts)
+            var = sum((t - t_mean) ** 2 for t, _ in pts)
+            if var > 0:
+                slope = sum((t - t_mean) * (v - mean) for t, v in pts) / var * 60.0
+        return {"mean": mean, "min": min(values), "max": max(values), "per_min": slope}
+
+    def status_text(self, window_s: float = 30.0) -> str:
+        """Sentence for the voice "status" command."""
+        s = self._latest
+        if s is None:
+            return "System info not ready yet"
+        parts = [f"{label} {_fmt(value)}" for label, value in (("CPU", s.cpu), ("RAM", s.ram), ("BAT", s.battery))
+                 if value is not None]
+        parts.append(f"AURA uses {_fmt(s.proc_cpu)} CPU with {s.proc_threads} threads")
+        field, label = ("cpu", "CPU") if s.cpu is not None else ("proc_cpu", "AURA CPU")
+        cpu = self.trend(field, window_s)
+        if cpu is not None and abs(cpu["per_min"]) >= 10.0:
+            parts.append(f"{label} {'rising' if cpu['per_min'] > 0 else 'falling'}, "
+                         f"{cpu['mean']:.0f}% average over {int(window_s)} seconds")
+        if s.battery is not None and s.plugged is False:
+            bat = self.trend("battery", 300.0)
+            if bat is not None and bat["per_min"] < 0:
+                parts.append(f"battery draining {-bat['per_min']:.1f}% per minute")
+        return " | ".join(parts)
+
+    def stats(self) -> dict:
+        s = self._latest
+        return {"samples": len(self._ring), "latest": s.as_dict() if s else None}
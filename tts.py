@@ -0,0 +1,287 @@
+"""
+tts.py
+Priority text-to-speech queue with superseding, TTL dropping and a phrase cache.
+Messages are spoken highest priority first (URGENT before NORMAL before LOW, FIFO
+within a level). A message queued with a key replaces any not-yet-spoken message
+with the same key, so a burst of "Volume 40/50/60 percent" announces only the
+latest. Messages whose TTL ran out while waiting are dropped.
+PhraseCache renders a fixed set of phrases to WAV files once (on the speech
+thread, when it is otherwise idle) and plays them back directly afterwards.
+"""
+
+import os
+import time
+import wave
+import heapq
+import shutil
+import hashlib
+import logging
+import platform
+import tempfile
+import itertools
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger("aura.tts")
+
+URGENT = 0
+NORMAL = 1
+LOW = 2
+
+_SYNTH = 99  # internal priority for background cache rendering: only when nothing else waits
+
+
+class Message:
+    __slots__ = ("text", "priority", "key", "expires", "stale")
+
+    def __init__(self, text: str, priority: int = NORMAL, key: Optional[str] = None, expires: Optional[float] = None):
+        self.text = text
+        self.priority = priority
+        self.key = key
+        self.expires = expires
+        self.stale = False
+
+
+# ----------------- Engines -----------------
+class ConsoleEngine:
+    """Fallback when no TTS engine is installed: log instead of speaking."""
+    name = "console"
+
+    def say(self, text: str) -> None:
+        logger.info("[TTS disabled] %s", text)
+
+    def save(self, text: str, path: str) -> bool:
+        return False
+
+
+class Pyttsx3Engine:
+    """pyttsx3 wrapper. Must be created and used on a single thread."""
+    name = "pyttsx3"
+
+    def __init__(self, rate: int = 170):
+        import pyttsx3  # type: ignore
+        self._engine = pyttsx3.init()
+        self._engine.setProperty("rate", rate)
+        self.rate = rate
+
+    def say(self, text: str) -> None:
+        self._engine.say(text)
+        self._engine.runAndWait()
+
+    def save(self, text: str, path: str) -> bool:
+        self._engine.save_to_file(text, path)
+        self._engine.runAndWait()
+        return os.path.exists(path) and os.path.getsize(path) > 44
+
+
+def default_engine():
+    try:
+        engine = Pyttsx3Engine()
+        logger.info("TTS engine initialized (pyttsx3).")
+        return engine
+    except Exception as e:
+        logger.info("pyttsx3 not available; falling back to console prints. %s", e)
+        return ConsoleEngine()
+
+
+def play_wav(path: str) -> None:
+    """Play a WAV file synchronously (winsound on Windows, PyAudio elsewhere)."""
+    if platform.system() == "Windows":
+        import winsound
+        winsound.PlaySound(path, winsound.SND_FILENAME)
+        return
+    import pyaudio  # type: ignore
+    pa = pyaudio.PyAudio()
+    try:
+        with wave.open(path, "rb") as w:
+            stream = pa.open(format=pa.get_format_from_width(w.getsampwidth()), channels=w.getnchannels(),
+                             rate=w.getframerate(), output=True)
+            try:
+                chunk = w.readframes(4096)
+                while chunk:
+                    stream.write(chunk)
+                    chunk = w.readframes(4096)
+            finally:
+                stream.stop_stream()
+                stream.close()
+    finally:
+        pa.terminate()
+
+
+# ----------------- Phrase cache -----------------
+class PhraseCache:
+    """
+    On-disk cache of rendered phrases, keyed by text and engine settings.
+    Phrases listed in `phrases` are rendered up front. With min_uses > 0 any other phrase
+    is rendered after it has been spoken min_uses times; that is off by default because
+    changing messages ("Volume 60 percent") would fill the folder. Phrases that fail to
+    render or play are not retried.
+    """
+
+    def __init__(self, folder: str = "tts_cache", phrases=(), min_uses: int = 0, player=play_wav):
+        self.folder = folder
+        self.phrases = tuple(phrases)
+        self.min_uses = int(min_uses)
+        self.player = player
+        self._uses: Dict[str, int] = {}
+        self._failed = set()
+        self.hits = 0
+
+    def path(self, text: str, engine) -> str:
+        tag = f"{getattr(engine, 'name', '')}:{getattr(engine, 'rate', '')}:{text}"
+        return os.path.join(self.folder, hashlib.sha1(tag.encode("utf-8")).hexdigest()[:16] + ".wav")
+
+    def lookup(self, text: str, engine) -> Optional[str]:
+        if text in self._failed:
+            return None
+        path = self.path(text, engine)
+        return path if os.path.exists(path) else None
+
+    def wants(self, text: str) -> bool:
+        """Count a use of text; True once it should be rendered."""
+        if text in self._failed:
+            return False
+        if self.min_uses <= 0:
+            return text in self.phrases
+        n = self._uses.get(text, 0) + 1
+        self._uses[text] = n
+        return text in self.phrases or n == self.min_uses
+
+    def render(self, text: str, engine) -> bool:
+        path = self.path(text, engine)
+        if os.path.exists(path):
+            return True
+        # render outside the cache folder, which is only created once there is a phrase to put in it
+        fd, tmp = tempfile.mkstemp(suffix=".wav", prefix="aura-tts-")
+        os.close(fd)
+        try:
+            ok = engine.save(text, tmp)
+            if ok:
+                with wave.open(tmp, "rb"):
+                    pass  # engines that write another container (e.g. AIFF on macOS) are not cached
+                os.makedirs(self.folder, exist_ok=True)
+                shutil.move(tmp, path)
+                return True
+        except Exception as e:
+            logger.debug("TTS cache render failed for %r: %s", text, e)
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        self._failed.add(text)
+        return False
+
+    def play(self, text: str, path: str) -> bool:
+        try:
+            self.player(path)
+            self.hits += 1
+            return True
+        except Exception as e:
+            logger.debug("TTS cache playback failed for %r: %s", text, e)
+            self._failed.add(text)
+            return False
+
+
+# ----------------- Queue -----------------
+class SpeechQueue:
+    """
+    say(text, priority=NORMAL, key=None, ttl=None) queues a message (non-blocking).
+    One worker thread owns the engine, which is created lazily on that thread.
+    """
+
+    def __init__(self, engine_factory=default_engine, cache: Optional[PhraseCache] = None):
+        self._engine_factory = engine_factory
+        self.engine = None
+        self.cache = cache
+        self._heap = []
+        self._keyed: Dict[str, Message] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = True
+        self._queued = 0  # live (not superseded) messages in the heap
+        self.spoken = 0
+        self.superseded = 0
+        self.expired = 0
+        if cache is not None:
+            for text in cache.phrases:
+                self._push(_SYNTH, text)
+        self._thread = threading.Thread(target=self._loop, name="tts", daemon=True)
+        self._thread.start()
+
+    def _push(self, priority: int, item) -> None:
+        heapq.heappush(self._heap, (priority, next(self._seq), item))
+
+    def say(self, text: str, priority: int = NORMAL, key: Optional[str] = None, ttl: Optional[float] = None) -> None:
+        if not text:
+            return
+        msg = Message(text, priority, key, time.monotonic() + ttl if ttl else None)
+        with self._cond:
+            if key is not None:
+                old = self._keyed.get(key)
+                if old is not None and not old.stale:
+                    old.stale = True
+                    self._queued -= 1
+                    self.superseded += 1
+                self._keyed[key] = msg
+            self._push(priority, msg)
+            self._queued += 1
+            self._cond.notify()
+
+    def pending(self) -> int:
+        return self._queued
+
+    def stop(self, timeout: float = 2.0) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=timeout)
+
+    def _next(self):
+        """Pop the next live item, or None when stopping. Caller holds the lock."""
+        while True:
+            while self._running and not self._heap:
+                self._cond.wait()
+            if not self._running:
+                return None
+            priority, _, item = heapq.heappop(self._heap)
+            if priority == _SYNTH:
+                return item
+            if item.stale:
+                continue
+            self._queued -= 1
+            if item.key is not None and self._keyed.get(item.key) is item:
+                del self._keyed[item.key]
+            if item.expires is not None and time.monotonic() > item.expires:
+                self.expired += 1
+                continue
+            return item
+
+    def _loop(self) -> None:
+        self.engine = self._engine_factory()
+        while True:
+            with self._cond:
+                item = self._next()
+            if item is None:
+                return
+            try:
+                if isinstance(item, str):
+                    self.cache.render(item, self.engine)
+                else:
+                    self._speak(item.text)
+            except Exception as e:
+                logger.exception("TTS error: %s", e)
+
+    def _speak(self, text: str) -> None:
+        cache = self.cache
+        if cache is not None:
+            path = cache.lookup(text, self.engine)
+            if path is not None and cache.play(text, path):
+                self.spoken += 1
+                return
+        self.engine.say(text)
+        self.spoken += 1
+        if cache is not None and cache.wants(text):
+            with self._cond:
+                self._push(_SYNTH, text)
+
+    def stats(self) -> dict:
+        return {"pending": self._queued, "spoken": self.spoken, "superseded": self.superseded,
+                "expired": self.expired, "cache_hits": self.cache.hits if self.cache else 0}
@@ -1,115 +1,143 @@
 
 
-from typing import Optional
+from typing import Callable, Optional
 import threading
-import queue
 import time
 import os
-import webbrowser
 import platform
 import logging
 import random
 
+import metrics
+import startup
+from tts import URGENT, NORMAL, PhraseCache, SpeechQueue, default_engine
+
 logger = logging.getLogger("aura.utils")
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-# ----------------- TTS (threaded queue) -----------------
-_speech_q: "queue.Queue[Optional[str]]" = queue.Queue()
-_have_tts = False
-_tts_engine = None
-
-try:
-    import pyttsx3
-    _tts_engine = pyttsx3.init()
-    _tts_engine.setProperty("rate", 170)
-    _have_tts = True
-    logger.info("TTS engine initialized (pyttsx3).")
-except Exception as e:
-    logger.info("pyttsx3 not available; falling back to console prints. %s", e)
-    _have_tts = False
-    _tts_engine = None
-
-
-def _speech_worker():
-    if not _have_tts:
-        # still consume queue so callers don't block on put() (not blocking here, but keep symmetry)
-        while True:
-            text = _speech_q.get()
-            if text is None:
-                break
-            logger.info("[TTS disabled] %s", text)
-            _speech_q.task_done()
-        return
+# ----------------- TTS (priority queue) -----------------
+# fixed phrases rendered once to tts_cache/ and played back directly
+CACHED_PHRASES = (
+    "Screenshot saved", "Failed to save screenshot", "Volume adjusted",
+    "Network error in speech recognition.", "You have no reminders.",
+)
+
+_speech = None
+_speech_lock = threading.Lock()
 
-    while True:
-        text = _speech_q.get()
-        if text is None:
-            break
-        try:
-            _tts_engine.say(text)
-            _tts_engine.runAndWait()
-        except Exception as e:
-            logger.exception("TTS error: %s", e)
-        _speech_q.task_done()
 
+def _tts_engine():
+    with startup.phase("tts engine init"):
+        return default_engine()
 
-# start speech worker thread
-threading.Thread(target=_speech_worker, daemon=True).start()
 
+def get_speech_queue() -> SpeechQueue:
+    """Shared speech queue. Its thread starts on first use and loads the TTS engine in the background."""
+    global _speech
+    with _speech_lock:
+        if _speech is None:
+            _speech = SpeechQueue(_tts_engine, PhraseCache("tts_cache", CACHED_PHRASES))
+        return _speech
 
-def speak(text: str) -> None:
-    """Queue text for speaking (non-blocking)."""
+
+def speak(text: str, priority: int = NORMAL, key: Optional[str] = None, ttl: Optional[float] = None) -> None:
+    """
+    Queue text for speaking (non-blocking).
+    priority: URGENT / NORMAL / LOW; key: a newer message with the same key replaces
+    an unspoken older one; ttl: seconds after which the message is dropped unspoken.
+    """
     if not text:
         return
     try:
-        _speech_q.put(text)
+        get_speech_queue().say(text, priority, key, ttl)
     except Exception:
         logger.exception("Failed to enqueue TTS; fallback print.")
         print("[TTS]", text)
 
 
+def speech_pending() -> int:
+    return _speech.pending() if _speech is not None else 0
+
+
+def shutdown_speech() -> dict:
+    """Stop the speech thread (if it was ever started) and return its counters."""
+    if _speech is None:
+        return {}
+    _speech.stop()
+    return _speech.stats()
+
+
 # ----------------- Screenshot saver -----------------
+_screenshot_writer = None
+_screenshot_lock = threading.Lock()
+
+
+def configure_screenshots(folder: str = "screenshots", codec: str = "png", quality: int = 95,
+                          workers: int = 2, max_pending: int = 8):
+    """(Re)create the shared bounded screenshot writer pool and return it."""
+    global _screenshot_writer
+    from screenshots import ScreenshotWriter
+    with _screenshot_lock:
+        old = _screenshot_writer
+        _screenshot_writer = ScreenshotWriter(folder, codec, quality, workers, max_pending)
+    if old is not None:
+        old.close()
+    return _screenshot_writer
+
+
+def get_screenshot_writer():
+    with _screenshot_lock:
+        writer = _screenshot_writer
+    return writer if writer is not None else configure_screenshots()
+
+
 def save_frame_screenshot(frame, folder: str = "screenshots") -> None:
     """
-    Save an OpenCV BGR frame asynchronously to disk.
-    frame: numpy array (BGR)
+    Save an OpenCV BGR frame asynchronously to disk through the bounded writer pool.
+    frame: numpy array (BGR); it is not copied, so the caller must not modify it afterwards.
     """
-    def _save(img, fpath):
-        try:
-            import cv2
-            os.makedirs(fpath, exist_ok=True)
-            name = time.strftime("screenshot_%Y%m%d_%H%M%S.png")
-            path = os.path.join(fpath, name)
-            cv2.imwrite(path, img)
-            speak("Screenshot saved")
-            logger.info("Saved screenshot: %s", path)
-        except Exception as e:
-            logger.exception("screenshot save error: %s", e)
-            speak("Failed to save screenshot")
-
     try:
-        threading.Thread(target=_save, args=(frame.copy(), folder), daemon=True).start()
+        writer = get_screenshot_writer()
+        if writer.folder != folder:
+            writer = configure_screenshots(folder, writer.codec, writer.quality)
+        writer.save(frame)
     except Exception:
-        logger.exception("Failed to start screenshot thread")
+        logger.exception("Failed to queue screenshot")
 
 
 # ----------------- Volume control -----------------
+def _open_endpoint_volume():
+    """Activate the default speaker IAudioEndpointVolume via pycaw (Windows only)."""
+    from ctypes import cast, POINTER
+    from comtypes import CLSCTX_ALL
+    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+    devices = AudioUtilities.GetSpeakers()
+    interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+    return cast(interface, POINTER(IAudioEndpointVolume))
+
+
 class VolumeController:
+    """
+    System volume via pycaw (Windows) or media keys via pyautogui.
+    level is a cached scalar (0..1) updated on every change and by an optional slow
+    background poll, so readers such as the HUD never make a system call.
+    A thread that calls change() other than the creating one (the actuator) brackets its
+    work with attach_thread()/detach_thread() so it uses an endpoint opened in its own COM apartment.
+    """
 
     def __init__(self):
         self._use_pycaw = False
         self._vol = None
         self._pyautogui = None
         self._platform = platform.system()
+        self._level = 0.5  # unknown levels (pyautogui path) display as 50%
+        self._poll_stop = threading.Event()
+        self._local = threading.local()  # per-thread endpoint opened by attach_thread()
         # Try pycaw on Windows
         if self._platform == "Windows":
             try:
-                from ctypes import cast, POINTER
-                from comtypes import CLSCTX_ALL
-                from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-                devices = AudioUtilities.GetSpeakers()
-                interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-                self._vol = cast(interface, POINTER(IAudioEndpointVolume))
+                self._vol = _open_endpoint_volume()
+                self._level = float(self._vol.GetMasterVolumeLevelScalar())
                 self._use_pycaw = True
                 logger.info("VolumeController: using pycaw.")
             except Exception as e:
@@ -123,24 +151,88 @@ class VolumeController:
             except Exception as e:
                 logger.info("pyautogui unavailable: %s", e)
 
+    @property
+    def level(self) -> float:
+        """Last known master volume scalar; never touches the audio API."""
+        return self._level
+
+    def start_polling(self, interval: float = 2.0) -> None:
+        """Refresh the cached level every interval seconds to catch changes made outside AURA."""
+        if not self._use_pycaw:
+            return
+
+        def _poll():
+            try:
+                import comtypes
+                comtypes.CoInitialize()
+                vol = _open_endpoint_volume()  # COM pointers are per-apartment; open our own
+            except Exception as e:
+                logger.info("Volume poll unavailable: %s", e)
+                return
+            while not self._poll_stop.wait(interval):
+                try:
+                    self._level = float(vol.GetMasterVolumeLevelScalar())
+                except Exception as e:
+                    logger.debug("Volume poll error: %s", e)
+
+        threading.Thread(target=_poll, name="volume-poll", daemon=True).start()
+
+    def stop_polling(self) -> None:
+        self._poll_stop.set()
+
+    def attach_thread(self) -> None:
+        """Enter a COM apartment on the calling thread and open its own endpoint for change()."""
+        if not self._use_pycaw:
+            return
+        self._local.vol = None  # never fall back to another apartment's pointer
+        try:
+            import comtypes
+            comtypes.CoInitialize()
+        except Exception as e:
+            logger.info("COM init failed on %s: %s", threading.current_thread().name, e)
+            return
+        self._local.com = True
+        try:
+            self._local.vol = _open_endpoint_volume()  # COM pointers are per-apartment; open our own
+        except Exception as e:
+            logger.info("Volume endpoint unavailable on %s: %s", threading.current_thread().name, e)
+
+    def detach_thread(self) -> None:
+        """Release the calling thread's endpoint and leave its COM apartment."""
+        self._local.vol = None  # released before the apartment is left
+        if getattr(self._local, "com", False):
+            self._local.com = False
+            try:
+                import comtypes
+                comtypes.CoUninitialize()
+            except Exception as e:
+                logger.debug("COM uninit: %s", e)
+
     def change(self, delta: float) -> bool:
         """
         delta positive raises volume, negative lowers.
         Returns True on (attempted) success, False otherwise.
         """
+        with metrics.span("volume.change"):
+            return self._change(delta)
+
+    def _change(self, delta: float) -> bool:
         try:
-            if self._use_pycaw and self._vol:
-                cur = self._vol.GetMasterVolumeLevelScalar()
+            # an attached thread uses its own endpoint; the creating thread uses the one from __init__
+            vol = self._local.vol if hasattr(self._local, "vol") else self._vol
+            if self._use_pycaw and vol:
+                cur = vol.GetMasterVolumeLevelScalar()
                 new = min(max(cur + delta, 0.0), 1.0)
-                self._vol.SetMasterVolumeLevelScalar(new, None)
-                speak(f"Volume {int(new * 100)} percent")
+                vol.SetMasterVolumeLevelScalar(new, None)
+                self._level = new
+                speak(f"Volume {int(new * 100)} percent", key="volume", ttl=3.0)
                 return True
             elif self._pyautogui:
                 steps = max(1, int(abs(delta) * 10))
                 key = "volumeup" if delta > 0 else "volumedown"
                 for _ in range(steps):
                     self._pyautogui.press(key)
-                speak("Volume adjusted")
+                speak("Volume adjusted", key="volume", ttl=3.0)
                 return True
             else:
                 logger.info("No volume control available on this system.")
@@ -165,6 +257,7 @@ def _open_cmd(cmd: str) -> None:
 
 def open_app(name: str) -> None:
     """Open a known app or search the web if unknown."""
+    import webbrowser  # pulls in subprocess etc.; only needed when a command arrives
     n = (name or "").lower()
     mapping = {
         "youtube": lambda: webbrowser.open("https://www.youtube.com"),
@@ -191,12 +284,18 @@ def open_app(name: str) -> None:
 
 
 # ----------------- System info / clock / quotes / reminders -----------------
-_have_psutil = True
-try:
-    import psutil  # type: ignore
-except Exception:
-    _have_psutil = False
-    logger.info("psutil not available; system info limited.")
+_sys_sampler = None
+_sys_lock = threading.Lock()
+
+
+def get_system_sampler(interval: float = 1.0):
+    """Shared background system sampler, started on first use."""
+    global _sys_sampler
+    with _sys_lock:
+        if _sys_sampler is None:
+            from sysmon import SystemSampler
+            _sys_sampler = SystemSampler(interval).start()
+        return _sys_sampler
 
 
 def get_time_str() -> str:
@@ -204,18 +303,12 @@ def get_time_str() -> str:
 
 
 def get_system_status() -> str:
+    """Latest background sample plus short-term trends; never blocks on a measurement."""
     try:
-        if _have_psutil:
-            cpu = psutil.cpu_percent(interval=0.3)
-            ram = psutil.virtual_memory().percent
-            try:
-                battery = psutil.sensors_battery()
-                bat = f"{battery.percent}%" if battery else "N/A"
-            except Exception:
-                bat = "N/A"
-            return f"CPU {cpu}% | RAM {ram}% | BAT {bat}"
-        else:
-            return "System info N/A"
+        sampler = get_system_sampler()
+        if sampler.latest() is None:
+            sampler.sample()
+        return sampler.status_text()
     except Exception as e:
         logger.exception("get_system_status error: %s", e)
         return "Sysinfo error"
@@ -234,64 +327,63 @@ def get_quote() -> str:
     return random.choice(_QUOTES)
 
 
-def set_reminder(delay_seconds: int, text: str) -> None:
-    def _job():
-        time.sleep(delay_seconds)
-        speak(f"Reminder: {text}")
+_reminders = None
+_reminders_lock = threading.Lock()
+
 
+def get_reminder_scheduler(path: str = "reminders.json"):
+    """Shared single-thread reminder scheduler; persisted reminders are reloaded on first use."""
+    global _reminders
+    with _reminders_lock:
+        if _reminders is None:
+            from reminders import ReminderScheduler
+            _reminders = ReminderScheduler(path, on_fire=lambda r: speak(f"Reminder: {r.text}", URGENT))
+            _reminders.load()
+            _reminders.start()
+        return _reminders
+
+
+def set_reminder(delay_seconds: int, text: str, every: Optional[float] = None) -> Optional[int]:
+    """Schedule a spoken reminder after delay_seconds (repeating every `every` seconds if given)."""
+    from reminders import format_delay
     try:
-        threading.Thread(target=_job, daemon=True).start()
-        speak(f"Reminder set for {max(1, delay_seconds//60)} minutes")
+        rid = get_reminder_scheduler().add(delay_seconds, text, every=every)
+        msg = f"Reminder set for {format_delay(delay_seconds)}"
+        if every:
+            msg += f", repeating every {format_delay(every)}"
+        speak(msg)
+        return rid
     except Exception:
         logger.exception("Failed to set reminder")
+        return None
 
 
 # ----------------- Voice listener starter -----------------
-_have_sr = True
-try:
-    import speech_recognition as sr  # type: ignore
-except Exception:
-    _have_sr = False
-    logger.info("SpeechRecognition not available; voice disabled.")
-
-
-def start_voice_listener(cmd_queue: "queue.Queue[str]") -> Optional[threading.Thread]:
+def start_voice_listener(on_text: Callable[[str], None], backend: str = "google", device: Optional[int] = None,
+                         **recognizer_kwargs):
     """
-    Start background thread to listen and put recognized text into cmd_queue.
-    Returns the Thread object or None if voice not available.
+    Start the streaming voice listener; on_text(text) is called (on its thread) per recognized command.
+    backend: "google" (online), "sphinx" or "vosk" (offline). The microphone stream is
+    opened once and the noise floor is calibrated from its first half second.
+    Returns the VoiceListener or None if voice is not available.
     """
-    if not _have_sr:
-        logger.info("SpeechRecognition not installed; voice disabled.")
+    from voice import MicrophoneSource, VoiceListener, make_recognizer
+    try:
+        recognizer = make_recognizer(backend, **recognizer_kwargs)
+    except Exception as e:
+        logger.info("Speech recognizer %r not available; voice disabled. %s", backend, e)
+        return None
+    try:
+        source = MicrophoneSource(device=device)
+    except Exception as e:
+        logger.info("Microphone not accessible; voice disabled. %s", e)
         return None
 
-    def _worker():
-        r = sr.Recognizer()
-        try:
-            mic = sr.Microphone()
-        except Exception as e:
-            logger.exception("Microphone not accessible: %s", e)
-            return
-        logger.info("Voice listener started.")
-        while True:
-            try:
-                with mic as source:
-                    r.adjust_for_ambient_noise(source, duration=0.6)
-                    audio = r.listen(source, timeout=6, phrase_time_limit=6)
-                try:
-                    txt = r.recognize_google(audio)
-                except sr.UnknownValueError:
-                    continue
-                except sr.RequestError:
-                    speak("Network error in speech recognition.")
-                    continue
-                if txt:
-                    cmd_queue.put(txt)
-            except Exception as e:
-                # take a small pause to avoid busy-looping on repeated errors
-                logger.debug("Voice listener exception: %s", e)
-                time.sleep(0.2)
-                continue
-
-    t = threading.Thread(target=_worker, daemon=True)
-    t.start()
-    return t
+    def _on_error(e):
+        logger.debug("Speech recognition backend error: %s", e)
+        speak("Network error in speech recognition." if not recognizer.offline else "Speech recognition error.",
+              key="voice_error", ttl=5.0)
+
+    listener = VoiceListener(source, recognizer, on_text, on_error=_on_error).start()
+    logger.info("Voice listener started (%s).", recognizer.name)
+    return listener
@@ -0,0 +1,370 @@
+"""
+yolo_detector.py
+CPU object detection for AURA's active mode.
+ObjectDetector runs a YOLOv8 model exported to ONNX (`yolo export model=yolov8n.pt
+format=onnx`, optionally int8-quantized with onnxruntime.quantization) on
+onnxruntime's CPU provider, or on OpenCV's DNN module when onnxruntime is missing.
+Both are imported when the first detector is built, not at module import.
+
+ObjectDetectionWorker runs it on its own thread at a fixed, low rate (a few Hz,
+independent of hand tracking). Every source hands it frames with submit(), which
+is a no-op unless the worker is active and a new detection is due; frames that
+arrive together from several sources are letterboxed into one batch. Results are
+kept per source for the HUD, and a label that appears in a source is reported
+once as an ObjectEvent.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+import metrics
+from framectx import FrameContext, letterbox
+
+logger = logging.getLogger("aura.vision")
+
+COCO_CLASSES = (
+    "person", "bicycle", "car", "motorcycle", "airplane", "bus", "train", "truck", "boat", "traffic light",
+    "fire hydrant", "stop sign", "parking meter", "bench", "bird", "cat", "dog", "horse", "sheep", "cow",
+    "elephant", "bear", "zebra", "giraffe", "backpack", "umbrella", "handbag", "tie", "suitcase", "frisbee",
+    "skis", "snowboard", "sports ball", "kite", "baseball bat", "baseball glove", "skateboard", "surfboard",
+    "tennis racket", "bottle", "wine glass", "cup", "fork", "knife", "spoon", "bowl", "banana", "apple",
+    "sandwich", "orange", "broccoli", "carrot", "hot dog", "pizza", "donut", "cake", "chair", "couch",
+    "potted plant", "bed", "dining table", "toilet", "tv", "laptop", "mouse", "remote", "keyboard", "cell phone",
+    "microwave", "oven", "toaster", "sink", "refrigerator", "book", "clock", "vase", "scissors", "teddy bear",
+    "hair drier", "toothbrush",
+)
+
+
+class Detection:
+    __slots__ = ("label", "class_id", "score", "box")
+
+    def __init__(self, label: str, class_id: int, score: float, box):
+        self.label = label
+        self.class_id = class_id
+        self.score = score
+        self.box = box  # (x0, y0, x1, y1) in source-frame pixels
+
+    def __repr__(self):
+        return f"Detection({self.label} {self.score:.2f} {self.box})"
+
+
+class ObjectEvent:
+    __slots__ = ("source", "label", "score", "ts")
+
+    def __init__(self, source: str, label: str, score: float, ts: float):
+        self.source = source
+        self.label = label
+        self.score = score
+        self.ts = ts
+
+    def __repr__(self):
+        return f"ObjectEvent({self.source} {self.label} {self.score:.2f})"
+
+
+# ----------------- post-processing -----------------
+def decode_yolov8(output: np.ndarray, scale: float, pad, frame_shape, conf: float = 0.35, iou: float = 0.45,
+                  names=COCO_CLASSES, max_det: int = 20) -> List[Detection]:
+    """
+    One image's raw YOLOv8 output, (4 + classes, anchors) or (anchors, 4 + classes), with
+    boxes as centre x/y, width, height in letterboxed input pixels -> detections after
+    per-class NMS, in source-frame pixels.
+    """
+    out = np.asarray(output, dtype=np.float32)
+    if out.shape[0] > out.shape[1]:
+        out = out.T
+    scores = out[4:]
+    class_ids = scores.argmax(axis=0)
+    best = scores[class_ids, np.arange(scores.shape[1])]
+    keep = np.flatnonzero(best >= conf)
+    if not keep.size:
+        return []
+    cx, cy, bw, bh = out[:4, keep]
+    x0 = (cx - bw / 2 - pad[0]) / scale
+    y0 = (cy - bh / 2 - pad[1]) / scale
+    boxes = np.stack([x0, y0, bw / scale, bh / scale], axis=1)
+    kept_scores, kept_ids = best[keep], class_ids[keep]
+    if hasattr(cv2.dnn, "NMSBoxesBatched"):
+        idx = cv2.dnn.NMSBoxesBatched(boxes.tolist(), kept_scores.tolist(), kept_ids.tolist(), conf, iou)
+    else:
+        # class-agnostic fallback for older OpenCV builds
+        idx = cv2.dnn.NMSBoxes(boxes.tolist(), kept_scores.tolist(), conf, iou)
+    h, w = frame_shape[:2]
+    dets = []
+    for i in np.asarray(idx, dtype=np.int64).reshape(-1)[:max_det]:
+        x, y, bw_, bh_ = boxes[i]
+        box = (max(0, int(x)), max(0, int(y)), min(w - 1, int(x + bw_)), min(h - 1, int(y + bh_)))
+        cid = int(kept_ids[i])
+        dets.append(Detection(names[cid] if cid < len(names) else str(cid), cid, float(kept_scores[i]), box))
+    return dets
+
+
+def draw_detections(frame, dets) -> None:
+    for d in dets:
+        x0, y0, x1, y1 = d.box
+        cv2.rectangle(frame, (x0, y0), (x1, y1), (255, 160, 0), 2)
+        cv2.putText(frame, f"{d.label} {d.score:.0%}", (x0 + 3, max(12, y0 - 5)), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
+                    (255, 160, 0), 1, cv2.LINE_AA)
+
+
+def summarize(dets) -> str:
+    """'person, cup x2' ordered by first appearance."""
+    counts = {}
+    for d in dets:
+        counts[d.label] = counts.get(d.label, 0) + 1
+    return ", ".join(label if n == 1 else f"{label} x{n}" for label, n in counts.items())
+
+
+# ----------------- runtimes -----------------
+class _OnnxRuntime:
+    name = "onnxruntime"
+
+    def __init__(self, path: str, threads: int):
+        import onnxruntime as ort  # type: ignore
+        opts = ort.SessionOptions()
+        if threads > 0:
+            opts.intra_op_num_threads = threads
+        self._session = ort.InferenceSession(path, opts, providers=["CPUExecutionProvider"])
+        inp = self._session.get_inputs()[0]
+        self._input = inp.name
+        # a symbolic batch dimension means the export accepts any batch size
+        self.max_batch = inp.shape[0] if isinstance(inp.shape[0], int) else None
+        self.input_size = inp.shape[2] if isinstance(inp.shape[2], int) else None
+
+    def run(self, blob: np.ndarray) -> np.ndarray:
+        return self._session.run(None, {self._input: blob})[0]
+
+
+class _OpenCvRuntime:
+    name = "opencv"
+
+    def __init__(self, path: str, threads: int):
+        if threads > 0:
+            cv2.setNumThreads(threads)
+        self._net = cv2.dnn.readNetFromONNX(path)
+        self._net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self._net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        self.max_batch = None  # unknown until a batch fails
+        self.input_size = None
+
+    def run(self, blob: np.ndarray) -> np.ndarray:
+        self._net.setInput(blob)
+        return self._net.forward()
+
+
+def _load_runtime(path: str, runtime: str, threads: int):
+    if runtime in ("auto", "onnxruntime"):
+        try:
+            return _OnnxRuntime(path, threads)
+        except ImportError:
+            if runtime == "onnxruntime":
+                raise
+            logger.info("onnxruntime not installed; using OpenCV DNN for object detection.")
+    return _OpenCvRuntime(path, threads)
+
+
+RUNTIMES = ("auto", "onnxruntime", "opencv")
+
+
+class ObjectDetector:
+    """
+    detect(frames) -> one list of Detection per frame.
+    threads: intra-op CPU threads for the runtime (0 = runtime default).
+    """
+
+    def __init__(self, model_path: str, runtime: str = "auto", input_size: int = 640, conf: float = 0.35,
+                 iou: float = 0.45, names=COCO_CLASSES, threads: int = 0):
+        if runtime not in RUNTIMES:
+            raise ValueError(f"Unknown runtime {runtime!r}; choose from {', '.join(RUNTIMES)}")
+        if not model_path.lower().endswith(".onnx"):
+            raise ValueError(f"{model_path}: expected an ONNX export "
+                             "(e.g. `yolo export model=yolov8n.pt format=onnx imgsz=640`)")
+        if not os.path.isfile(model_path) or os.path.getsize(model_path) == 0:
+            raise FileNotFoundError(f"Object detection model not found or empty: {model_path}")
+        self.runtime = _load_runtime(model_path, runtime, threads)
+        self.input_size = int(self.runtime.input_size or input_size)
+        self.conf = float(conf)
+        self.iou = float(iou)
+        self.names = tuple(names)
+        logger.info("Object detection: %s on %s (%dpx)", os.path.basename(model_path), self.runtime.name,
+                    self.input_size)
+
+    def _infer(self, boxed, rgb: bool) -> np.ndarray:
+        blob = cv2.dnn.blobFromImages(boxed, 1.0 / 255.0, swapRB=not rgb)
+        return self.runtime.run(blob)
+
+    def detect(self, frames, rgb: bool = False) -> List[List[Detection]]:
+        """frames: BGR images (or RGB with rgb=True)."""
+        if not frames:
+            return []
+        boxed, geometry = [], []
+        for f in frames:
+            img, scale, pad = letterbox(f, self.input_size)
+            boxed.append(img)
+            geometry.append((scale, pad, f.shape))
+        if len(boxed) == 1 or self.runtime.max_batch == 1:
+            outputs = [self._infer([b], rgb)[0] for b in boxed]
+        else:
+            try:
+                outputs = list(self._infer(boxed, rgb))
+            except Exception as e:
+                # a model exported with a static batch of 1: run frame by frame from now on
+                logger.info("Batched inference unavailable (%s); running one frame at a time.", e)
+                self.runtime.max_batch = 1
+                outputs = [self._infer([b], rgb)[0] for b in boxed]
+        return [decode_yolov8(out, scale, pad, shape, self.conf, self.iou, self.names)
+                for out, (scale, pad, shape) in zip(outputs, geometry)]
+
+
+# ----------------- worker -----------------
+class ObjectDetectionWorker:
+    """
+    start() / stop(); set_active(bool); submit(source, ctx) -> bool (True if the frame was taken);
+    latest(source) -> [Detection]; events: queue of ObjectEvent (or on_event(event) instead); stats().
+    detector_factory() builds the detector on the worker thread (model load stays off the caller).
+    rate_hz: detections per second per source; gather_s: how long a batch waits for the other sources.
+    """
+
+    def __init__(self, detector_factory: Callable[[], ObjectDetector], rate_hz: float = 2.0,
+                 gather_s: float = 0.05, on_event: Optional[Callable[[ObjectEvent], None]] = None):
+        self.detector_factory = detector_factory
+        self.interval = 1.0 / max(0.05, float(rate_hz))
+        self.gather_s = float(gather_s)
+        self.on_event = on_event
+        self.events: "queue.Queue[ObjectEvent]" = queue.Queue()
+        self.active = False
+        self.failed = False
+        self._cond = threading.Condition()
+        self._pending: Dict[str, np.ndarray] = {}
+        self._sources = set()
+        self._next_due = 0.0
+        self._results: Dict[str, List[Detection]] = {}
+        self._running = False
+        self._thread = None
+        self.batches = 0
+        self.frames = 0
+        self._busy_s = 0.0
+
+    def start(self) -> "ObjectDetectionWorker":
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="objects", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def set_active(self, active: bool) -> None:
+        with self._cond:
+            self.active = bool(active) and not self.failed
+            if not self.active:
+                self._pending.clear()
+                self._results.clear()
+            self._next_due = 0.0
+
+    def submit(self, source: str, ctx: FrameContext) -> bool:
+        """
+        Offer a frame before anything is drawn on it. When a detection is due the worker keeps a
+        reference to the frame's shared RGB view (never drawn on), so taking it costs no copy and
+        the hand detector reuses the same conversion.
+        """
+        if not self.active or ctx is None or time.perf_counter() < self._next_due:
+            return False
+        with self._cond:
+            self._sources.add(source)
+            if not self.active or source in self._pending:
+                return False
+            self._pending[source] = ctx.rgb()
+            self._cond.notify_all()
+        return True
+
+    def forget(self, source: str) -> None:
+        """Drop a source that stopped (so batches no longer wait for it)."""
+        with self._cond:
+            self._sources.discard(source)
+            self._pending.pop(source, None)
+            self._results.pop(source, None)
+
+    def latest(self, source: str) -> List[Detection]:
+        return self._results.get(source, [])
+
+    def hud_line(self, source: str) -> str:
+        return summarize(self.latest(source))
+
+    def _take_batch(self):
+        """Wait for a first frame, then up to gather_s for the other sources; returns {source: frame} or None."""
+        with self._cond:
+            while self._running and not self._pending:
+                self._cond.wait(0.5)
+            deadline = time.perf_counter() + self.gather_s
+            while self._running and len(self._pending) < len(self._sources):
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            if not self._running:
+                return None
+            batch, self._pending = self._pending, {}
+            self._next_due = time.perf_counter() + self.interval
+            return batch
+
+    def _loop(self) -> None:
+        try:
+            detector = self.detector_factory()
+        except Exception as e:
+            logger.error("Object detection disabled: %s", e)
+            self.failed = True
+            self.set_active(False)
+            return
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            names = list(batch)
+            t0 = time.perf_counter()
+            try:
+                with metrics.span("objects.detect"):
+                    results = detector.detect([batch[n] for n in names], rgb=True)
+            except Exception as e:
+                logger.exception("Object detection error: %s", e)
+                continue
+            self._busy_s += time.perf_counter() - t0
+            self.batches += 1
+            self.frames += len(names)
+            metrics.record("objects.batch", float(len(names)))
+            now = time.time()
+            for name, dets in zip(names, results):
+                if not self.active:
+                    break
+                seen = {d.label for d in self._results.get(name, ())}
+                self._results[name] = dets
+                for d in dets:
+                    if d.label in seen:
+                        continue
+                    seen.add(d.label)
+                    self._emit(ObjectEvent(name, d.label, d.score, now))
+
+    def _emit(self, event: ObjectEvent) -> None:
+        if self.on_event is None:
+            self.events.put(event)
+        else:
+            try:
+                self.on_event(event)
+            except Exception as e:
+                logger.exception("object event callback error: %s", e)
+
+    def stats(self) -> dict:
+        return {"batches": self.batches, "frames": self.frames,
+                "avg_batch": self.frames / self.batches if self.batches else 0.0,
+                "ms_per_batch": self._busy_s * 1000.0 / self.batches if self.batches else 0.0}
@@ -0,0 +1,464 @@
+"""
+voice.py
+Streaming voice capture, energy-based VAD segmentation and pluggable recognizers.
+The microphone stream is opened once and read in fixed frames (30 ms by default).
+VadSegmenter calibrates a noise floor from the first frames, tracks it slowly while
+nobody speaks, and cuts utterances with a short hangover instead of waiting for a
+full phrase timeout. Recognition runs on its own thread so capture never stalls.
+Any frame source works: WavSource replays WAV files so segmentation can be checked
+without a microphone (see segment_wav()).
+"""
+
+import json
+import math
+import time
+import wave
+import queue
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+import metrics
+
+logger = logging.getLogger("aura.voice")
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+
+
+def frame_db(pcm: bytes) -> float:
+    """RMS level of 16-bit mono PCM in dBFS (about -100 for digital silence)."""
+    x = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+    if x.size == 0:
+        return -100.0
+    rms = float(np.sqrt(np.mean(x * x)))
+    return 20.0 * math.log10(rms / 32768.0 + 1e-5)
+
+
+class Utterance:
+    """
+    One speech segment. start/end are when the first voiced frame began and the last one
+    ended (on the clock passed to feed(), which stamps a frame at its end); closed is when
+    the segmenter emitted it.
+    """
+    __slots__ = ("pcm", "sample_rate", "start", "end", "closed")
+
+    def __init__(self, pcm: bytes, sample_rate: int, start: float, end: float, closed: float):
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.start = start
+        self.end = end
+        self.closed = closed
+
+    @property
+    def duration(self) -> float:
+        return len(self.pcm) / (2.0 * self.sample_rate)
+
+    def __repr__(self):
+        return f"Utterance(start={self.start:.2f}, end={self.end:.2f}, duration={self.duration:.2f}s)"
+
+
+# ----------------- Segmentation -----------------
+class VadSegmenter:
+    """
+    Energy VAD with hysteresis.
+    Speech starts after start_frames frames louder than floor + start_db and ends after
+    hangover_ms below floor + end_db. Segments shorter than min_speech_ms are dropped,
+    longer than max_phrase_s are cut. pre_roll_ms of audio before the onset is kept.
+    The noise floor is the median of the first calibrate_ms, then follows quiet frames
+    with time constant adapt_s (it may fall quickly but rises slowly).
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS, start_db: float = 10.0,
+                 end_db: float = 6.0, start_frames: int = 2, hangover_ms: int = 300, min_speech_ms: int = 150,
+                 max_phrase_s: float = 8.0, pre_roll_ms: int = 150, calibrate_ms: int = 500,
+                 adapt_s: float = 5.0, min_floor_db: float = -70.0):
+        self.sample_rate = sample_rate
+        self.frame_s = frame_ms / 1000.0
+        self.start_db = start_db
+        self.end_db = end_db
+        self.start_frames = max(1, int(start_frames))
+        self.hangover = max(1, int(round(hangover_ms / frame_ms)))
+        self.min_speech = max(1, int(round(min_speech_ms / frame_ms)))
+        self.max_phrase = max(1, int(round(max_phrase_s * 1000 / frame_ms)))
+        self.calibrate_frames = max(1, int(round(calibrate_ms / frame_ms)))
+        self.alpha = min(1.0, self.frame_s / max(adapt_s, 1e-3))
+        self.min_floor_db = min_floor_db
+        self.floor: Optional[float] = None
+        self._calib: List[float] = []
+        self._pre = deque(maxlen=max(0, int(round(pre_roll_ms / frame_ms))) + self.start_frames)
+        self._frames: List[bytes] = []
+        self._loud = 0
+        self._quiet = 0
+        self._voiced = 0
+        self._start_t = 0.0
+        self._last_voiced_t = 0.0
+        self._t = 0.0
+        self.in_speech = False
+        self.dropped = 0
+
+    def calibrate(self, frames) -> float:
+        """Set the noise floor from an iterable of quiet frames. Returns it in dBFS."""
+        levels = [frame_db(f) for f in frames]
+        if levels:
+            self.floor = max(self.min_floor_db, float(np.median(levels)))
+        return self.floor
+
+    def _adapt(self, level: float) -> None:
+        if level < self.floor:
+            self.floor = max(self.min_floor_db, level)
+        else:
+            self.floor += self.alpha * (level - self.floor)
+
+    def feed(self, pcm: bytes, now: Optional[float] = None) -> Optional[Utterance]:
+        """Consume one frame; returns an Utterance when a segment closes."""
+        if now is None:
+            self._t += self.frame_s
+            now = self._t
+        level = frame_db(pcm)
+        if self.floor is None:
+            self._calib.append(level)
+            if len(self._calib) >= self.calibrate_frames:
+                self.floor = max(self.min_floor_db, float(np.median(self._calib)))
+                self._calib = []
+            return None
+
+        if not self.in_speech:
+            self._pre.append(pcm)
+            if level > self.floor + self.start_db:
+                self._loud += 1
+                if self._loud >= self.start_frames:
+                    self.in_speech = True
+                    self._frames = list(self._pre)
+                    self._pre.clear()
+                    self._voiced = self._loud
+                    self._quiet = 0
+                    self._start_t = now - self._loud * self.frame_s
+                    self._last_voiced_t = now
+            else:
+                self._loud = 0
+                self._adapt(level)
+            return None
+
+        self._frames.append(pcm)
+        if level > self.floor + self.end_db:
+            self._quiet = 0
+            self._voiced += 1
+            self._last_voiced_t = now
+        else:
+            self._quiet += 1
+        if self._quiet >= self.hangover or len(self._frames) >= self.max_phrase:
+            return self._close(now)
+        return None
+
+    def _close(self, now: float) -> Optional[Utterance]:
+        frames, voiced = self._frames, self._voiced
+        self.in_speech = False
+        self._frames = []
+        self._loud = self._quiet = self._voiced = 0
+        if voiced < self.min_speech:
+            self.dropped += 1
+            return None
+        # trim the trailing hangover silence, keep one frame of tail
+        keep = len(frames) - max(0, self._tail_quiet(frames) - 1)
+        return Utterance(b"".join(frames[:keep]), self.sample_rate, self._start_t, self._last_voiced_t, now)
+
+    def _tail_quiet(self, frames) -> int:
+        n = 0
+        for f in reversed(frames):
+            if frame_db(f) > self.floor + self.end_db:
+                break
+            n += 1
+        return n
+
+    def flush(self, now: Optional[float] = None) -> Optional[Utterance]:
+        """Close an open segment at end of stream."""
+        if not self.in_speech:
+            return None
+        return self._close(self._t if now is None else now)
+
+
+# ----------------- Frame sources -----------------
+class WavSource:
+    """Yields fixed-size 16-bit mono frames from a WAV file (first channel if stereo)."""
+
+    def __init__(self, path: str, frame_ms: int = FRAME_MS, realtime: bool = False):
+        self.path = path
+        self.frame_ms = frame_ms
+        self.realtime = realtime
+        with wave.open(path, "rb") as w:
+            if w.getsampwidth() != 2:
+                raise ValueError(f"{path}: only 16-bit PCM WAV is supported")
+            self.sample_rate = w.getframerate()
+            channels = w.getnchannels()
+            data = w.readframes(w.getnframes())
+        samples = np.frombuffer(data, dtype=np.int16)
+        if channels > 1:
+            samples = samples[::channels]
+        self._samples = np.ascontiguousarray(samples)
+        self.frame_len = int(self.sample_rate * frame_ms / 1000)
+
+    def frames(self) -> Iterator[bytes]:
+        t0 = time.monotonic()
+        n = len(self._samples) // self.frame_len
+        for i in range(n):
+            if self.realtime:
+                delay = t0 + (i + 1) * self.frame_ms / 1000.0 - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            yield self._samples[i * self.frame_len:(i + 1) * self.frame_len].tobytes()
+
+    def close(self) -> None:
+        pass
+
+
+class MicrophoneSource:
+    """Persistent PyAudio input stream read in fixed frames; opened once for the whole session."""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS, device: Optional[int] = None):
+        import pyaudio  # type: ignore
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self._pa = pyaudio.PyAudio()
+        self._stream = self._pa.open(format=pyaudio.paInt16, channels=1, rate=sample_rate, input=True,
+                                     input_device_index=device, frames_per_buffer=self.frame_len)
+        self._closed = False
+
+    def frames(self) -> Iterator[bytes]:
+        while not self._closed:
+            # exception_on_overflow=False: a late read loses audio instead of killing the stream
+            yield self._stream.read(self.frame_len, exception_on_overflow=False)
+
+    def close(self) -> None:
+        self._closed = True
+        try:
+            self._stream.stop_stream()
+            self._stream.close()
+        finally:
+            self._pa.terminate()
+
+
+def segment_wav(path: str, frame_ms: int = FRAME_MS, **segmenter_kwargs) -> List[Utterance]:
+    """Run the segmenter over a WAV file; times are seconds from the start of the file."""
+    src = WavSource(path, frame_ms)
+    seg = VadSegmenter(src.sample_rate, frame_ms, **segmenter_kwargs)
+    out = []
+    for frame in src.frames():
+        utt = seg.feed(frame)
+        if utt is not None:
+            out.append(utt)
+    utt = seg.flush()
+    if utt is not None:
+        out.append(utt)
+    return out
+
+
+# ----------------- Recognizers -----------------
+class RecognizerError(Exception):
+    """The backend failed (network, missing model), as opposed to not understanding the audio."""
+
+
+class Recognizer:
+    """transcribe(pcm, sample_rate) -> text ('' when nothing was understood)."""
+    name = "none"
+    offline = True
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        raise NotImplementedError
+
+
+class GoogleRecognizer(Recognizer):
+    """Google Web Speech API through SpeechRecognition (needs network)."""
+    name = "google"
+    offline = False
+
+    def __init__(self, language: str = "en-US"):
+        import speech_recognition as sr  # type: ignore
+        self._sr = sr
+        self._r = sr.Recognizer()
+        self.language = language
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        audio = self._sr.AudioData(pcm, sample_rate, 2)
+        try:
+            return self._r.recognize_google(audio, language=self.language)
+        except self._sr.UnknownValueError:
+            return ""
+        except self._sr.RequestError as e:
+            raise RecognizerError(str(e)) from e
+
+
+class SphinxRecognizer(Recognizer):
+    """CMU PocketSphinx through SpeechRecognition (offline)."""
+    name = "sphinx"
+
+    def __init__(self, language: str = "en-US"):
+        import speech_recognition as sr  # type: ignore
+        self._sr = sr
+        self._r = sr.Recognizer()
+        self.language = language
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        audio = self._sr.AudioData(pcm, sample_rate, 2)
+        try:
+            return self._r.recognize_sphinx(audio, language=self.language)
+        except self._sr.UnknownValueError:
+            return ""
+        except self._sr.RequestError as e:
+            raise RecognizerError(str(e)) from e
+
+
+class VoskRecognizer(Recognizer):
+    """Vosk/Kaldi local model (offline). model_path points to an unpacked Vosk model directory."""
+    name = "vosk"
+
+    def __init__(self, model_path: str = "models/vosk"):
+        import vosk  # type: ignore
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self._model = vosk.Model(model_path)
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        rec = self._vosk.KaldiRecognizer(self._model, sample_rate)
+        rec.AcceptWaveform(pcm)
+        return json.loads(rec.FinalResult()).get("text", "")
+
+
+RECOGNIZERS: Dict[str, Callable[..., Recognizer]] = {
+    "google": GoogleRecognizer,
+    "sphinx": SphinxRecognizer,
+    "vosk": VoskRecognizer,
+}
+
+
+def make_recognizer(name: str = "google", **kwargs) -> Recognizer:
+    try:
+        factory = RECOGNIZERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown recognizer {name!r}; choose from {', '.join(RECOGNIZERS)}") from None
+    return factory(**kwargs)
+
+
+# ----------------- Listener -----------------
+class VoiceListener:
+    """
+    Capture thread: source frames -> VadSegmenter. Recognition thread: utterances ->
+    recognizer -> on_text(text). Time-to-command (end of speech to recognized text)
+    is recorded in metrics as voice.time_to_command along with voice.recognize.
+    """
+
+    def __init__(self, source, recognizer: Recognizer, on_text: Callable[[str], None],
+                 segmenter: Optional[VadSegmenter] = None, on_error: Optional[Callable[[Exception], None]] = None,
+                 max_pending: int = 4):
+        self.source = source
+        self.recognizer = recognizer
+        self.on_text = on_text
+        self.on_error = on_error
+        self.segmenter = segmenter or VadSegmenter(source.sample_rate, source.frame_ms)
+        self._utts: "queue.Queue[Optional[Utterance]]" = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._running = False
+        self._threads: List[threading.Thread] = []
+        self.utterances = 0
+        self.recognized = 0
+        self.skipped = 0
+        self._ttc: deque = deque(maxlen=100)
+
+    def start(self) -> "VoiceListener":
+        if not self._running:
+            self._running = True
+            self._threads = [threading.Thread(target=self._capture_loop, name="voice-capture", daemon=True),
+                             threading.Thread(target=self._recognize_loop, name="voice-recognize", daemon=True)]
+            for t in self._threads:
+                t.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop capturing, then close the source once no read is in progress, then stop the recognizer."""
+        self._running = False
+        capture = self._threads[0] if self._threads else None
+        if capture is not None:
+            # each read returns within one frame, so the capture loop sees the flag promptly
+            capture.join(timeout=timeout)
+        if capture is not None and capture.is_alive():
+            # closing the stream under a blocked read can crash the audio backend; leave it to process exit
+            logger.warning("Voice capture did not stop within %.1fs; leaving the microphone open", timeout)
+        else:
+            try:
+                self.source.close()
+            except Exception as e:
+                logger.debug("voice source close: %s", e)
+        try:
+            self._utts.put_nowait(None)
+        except queue.Full:
+            pass
+        for t in self._threads[1:]:
+            t.join(timeout=timeout)
+        self._threads = []
+
+    def _capture_loop(self) -> None:
+        try:
+            for frame in self.source.frames():
+                if not self._running:
+                    break
+                utt = self.segmenter.feed(frame, time.monotonic())
+                if utt is not None:
+                    self._submit(utt)
+            utt = self.segmenter.flush(time.monotonic())
+            if utt is not None:
+                self._submit(utt)
+        except Exception as e:
+            logger.exception("Voice capture stopped: %s", e)
+        finally:
+            try:
+                self._utts.put(None, timeout=1.0)
+            except queue.Full:
+                pass
+
+    def _submit(self, utt: Utterance) -> None:
+        self.utterances += 1
+        metrics.record("voice.endpoint", (utt.closed - utt.end) * 1000.0)
+        try:
+            self._utts.put_nowait(utt)
+        except queue.Full:
+            # recognizer is behind: drop rather than let commands go stale
+            self.skipped += 1
+            logger.info("Voice recognizer busy; dropped an utterance.")
+
+    def _recognize_loop(self) -> None:
+        while True:
+            utt = self._utts.get()
+            if utt is None:
+                return
+            try:
+                with metrics.span("voice.recognize"):
+                    text = self.recognizer.transcribe(utt.pcm, utt.sample_rate)
+            except RecognizerError as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+                continue
+            except Exception as e:
+                logger.exception("Recognizer error: %s", e)
+                continue
+            text = (text or "").strip()
+            if not text:
+                continue
+            ttc = time.monotonic() - utt.end
+            self._ttc.append(ttc)
+            metrics.record("voice.time_to_command", ttc * 1000.0)
+            self.recognized += 1
+            self.on_text(text)
+
+    def stats(self) -> dict:
+        ttc = sorted(self._ttc)
+        return {
+            "utterances": self.utterances,
+            "recognized": self.recognized,
+            "skipped": self.skipped,
+            "dropped_short": self.segmenter.dropped,
+            "noise_floor_db": self.segmenter.floor,
+            "time_to_command_p50_ms": ttc[len(ttc) // 2] * 1000.0 if ttc else None,
+        }